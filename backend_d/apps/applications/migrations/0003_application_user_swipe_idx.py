@@ -0,0 +1,21 @@
+# Generated by Django 4.2.10 on 2026-10-18 20:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("applications", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                fields=["user", "scholarship"],
+                include=("swipe_status",),
+                name="application_user_swipe_idx",
+            ),
+        ),
+    ]
@@ -49,6 +49,15 @@ class Application(models.Model):
     class Meta:
         unique_together = ['user', 'scholarship']
         ordering = ['-updated_at']
+        indexes = [
+            # Covers the feed's swiped-scholarship anti-join with an index-only
+            # scan on Postgres; the include is ignored elsewhere
+            models.Index(
+                fields=['user', 'scholarship'],
+                include=['swipe_status'],
+                name='application_user_swipe_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username}'s application for {self.scholarship.title}"
@@ -1,10 +1,11 @@
 from rest_framework import serializers
 from .models import Application
+from apps.scholarships.fieldsets import SparseFieldsMixin
 from apps.scholarships.serializers import ScholarshipListSerializer
 from apps.scholarships.models import Scholarship
 from django.core.exceptions import ValidationError
 
-class ApplicationListSerializer(serializers.ModelSerializer):
+class ApplicationListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     scholarship = ScholarshipListSerializer(read_only=True)
 
     class Meta:
@@ -16,11 +17,15 @@ class ApplicationListSerializer(serializers.ModelSerializer):
             'swipe_status',
             'created_at',
             'updated_at',
-            'submitted_at'
+            'submitted_at',
+            'answers',
+            'documents'
         ]
         read_only_fields = ['status', 'submitted_at']
+        # Sent only when named in ?expand=
+        expandable_fields = ['answers', 'documents']
 
-class ApplicationDetailSerializer(serializers.ModelSerializer):
+class ApplicationDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     scholarship = ScholarshipListSerializer(read_only=True)
 
     class Meta:
@@ -36,6 +36,14 @@ class TestApplicationViewSet:
         assert len(response.data) == 1
         assert response.data[0]['id'] == application.id
 
+    def test_list_sparse_fields(self, auth_client, application):
+        response = auth_client.get(f'{self.url}?fields=id,scholarship.title&expand=answers')
+        assert response.data == [{
+            'id': application.id,
+            'scholarship': {'title': 'Test Scholarship'},
+            'answers': application.answers
+        }]
+
     def test_retrieve_application(self, auth_client, application):
         url = reverse('applications:application-detail', kwargs={'pk': application.id})
         response = auth_client.get(url)
@@ -264,4 +272,44 @@ class TestApplicationViewSet:
         response = auth_client.get(url)
         assert response.status_code == status.HTTP_200_OK
         assert response.data['count'] == 1
-        assert len(response.data['results']) == 1 
\ No newline at end of file
+        assert len(response.data['results']) == 1 
+
+
+@pytest.mark.django_db
+class TestApplicationQueryCounts:
+    @pytest.fixture(autouse=True)
+    def setup(self, auth_client, test_user, scholarship_tag):
+        self.client = auth_client
+        self.user = test_user
+        self.tag = scholarship_tag
+        self.grow()
+
+    def grow(self, status='pending', swipe_status='saved'):
+        for i in range(3):
+            scholarship = Scholarship.objects.create(
+                title=f'Scholarship {Scholarship.objects.count()}',
+                description='Test Description',
+                amount=1000,
+                deadline=timezone.now().date() + timedelta(days=30),
+                eligibility_criteria='Test Criteria',
+                is_active=True
+            )
+            scholarship.tags.add(self.tag)
+            Application.objects.create(
+                user=self.user, scholarship=scholarship, status=status, swipe_status=swipe_status
+            )
+
+    def fetch(self, name):
+        response = self.client.get(reverse(f'applications:application-{name}'))
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.parametrize('name', ['list', 'pending', 'saved'])
+    def test_constant_queries(self, name, assert_constant_queries):
+        # Applications with their scholarships joined in, tags prefetched
+        assert_constant_queries(lambda: self.fetch(name), self.grow, expected=2)
+
+    def test_applied(self, assert_constant_queries):
+        self.grow(status='submitted')
+        assert_constant_queries(
+            lambda: self.fetch('applied'), lambda: self.grow(status='submitted'), expected=2
+        )
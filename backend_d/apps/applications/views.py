@@ -4,6 +4,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Count
+from apps.scholarships.optimization import QuerysetOptimizationMixin
 from .models import Application
 from .serializers import (
     ApplicationListSerializer,
@@ -13,7 +14,7 @@ from .serializers import (
 
 # Create your views here.
 
-class ApplicationViewSet(viewsets.ModelViewSet):
+class ApplicationViewSet(QuerysetOptimizationMixin, viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = {
         'status': ['exact'],
@@ -24,12 +25,14 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     search_fields = ['scholarship__title']
     ordering_fields = ['created_at', 'updated_at', 'scholarship__deadline']
     ordering = ['-updated_at']
+    # Actions rendering a list of applications
+    list_actions = ['list', 'applied', 'pending', 'accepted', 'rejected', 'interested', 'saved']
 
     def get_queryset(self):
-        return Application.objects.filter(user=self.request.user)
+        return self.optimize_queryset(Application.objects.filter(user=self.request.user))
 
     def get_serializer_class(self):
-        if self.action == 'list':
+        if self.action in self.list_actions:
             return ApplicationListSerializer
         return ApplicationDetailSerializer
 
@@ -59,44 +62,41 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         queryset = self.get_queryset().filter(
             status__in=['submitted', 'under_review', 'accepted']
         )
-        count = queryset.count()
-        serializer = ApplicationListSerializer(queryset, many=True)
+        data = self.get_serializer(queryset, many=True).data
+        # Every row is loaded anyway, so count them instead of a COUNT query
         return Response({
-            'count': count,
-            'results': serializer.data
+            'count': len(data),
+            'results': data
         })
 
     @action(detail=False)
     def pending(self, request):
         """Get scholarships that are in draft/pending state"""
         queryset = self.get_queryset().filter(status='pending')
-        count = queryset.count()
-        serializer = ApplicationListSerializer(queryset, many=True)
+        data = self.get_serializer(queryset, many=True).data
         return Response({
-            'count': count,
-            'results': serializer.data
+            'count': len(data),
+            'results': data
         })
 
     @action(detail=False)
     def accepted(self, request):
         """Get accepted scholarships"""
         queryset = self.get_queryset().filter(status='accepted')
-        count = queryset.count()
-        serializer = ApplicationListSerializer(queryset, many=True)
+        data = self.get_serializer(queryset, many=True).data
         return Response({
-            'count': count,
-            'results': serializer.data
+            'count': len(data),
+            'results': data
         })
 
     @action(detail=False)
     def rejected(self, request):
         """Get rejected scholarships"""
         queryset = self.get_queryset().filter(status='rejected')
-        count = queryset.count()
-        serializer = ApplicationListSerializer(queryset, many=True)
+        data = self.get_serializer(queryset, many=True).data
         return Response({
-            'count': count,
-            'results': serializer.data
+            'count': len(data),
+            'results': data
         })
 
     @action(detail=False, methods=['post'])
@@ -117,20 +117,18 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     def interested(self, request):
         """Get scholarships user swiped right on"""
         queryset = self.get_queryset().filter(swipe_status='right')
-        count = queryset.count()
-        serializer = ApplicationListSerializer(queryset, many=True)
+        data = self.get_serializer(queryset, many=True).data
         return Response({
-            'count': count,
-            'results': serializer.data
+            'count': len(data),
+            'results': data
         })
 
     @action(detail=False)
     def saved(self, request):
         """Get scholarships saved for later"""
         queryset = self.get_queryset().filter(swipe_status='saved')
-        count = queryset.count()
-        serializer = ApplicationListSerializer(queryset, many=True)
+        data = self.get_serializer(queryset, many=True).data
         return Response({
-            'count': count,
-            'results': serializer.data
+            'count': len(data),
+            'results': data
         })
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ScholarshipsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.scholarships"
+
+    def ready(self):
+        import apps.scholarships.signals  # Import signals
@@ -0,0 +1,118 @@
+import logging
+from django.conf import settings
+from django.core.cache import cache
+from redis.exceptions import RedisError
+from apps.users.models import UserProfile
+from . import swipes
+from .matching import ScholarshipMatcher, get_matcher
+
+logger = logging.getLogger(__name__)
+
+CARDS_KEY = 'scholarships:cards:{user_id}'
+SERVED_KEY = 'scholarships:cards:served:{user_id}'
+REFILL_LOCK_KEY = 'scholarships:cards:refilling:{user_id}'
+
+# Cards handed out but not swiped yet stay out of refills for this long
+SERVED_TTL = 60 * 60
+REFILL_LOCK_TTL = 60
+
+
+def card_queue_enabled() -> bool:
+    return getattr(settings, 'SCHOLARSHIP_CARD_QUEUE', False)
+
+
+def queue_size() -> int:
+    return getattr(settings, 'SCHOLARSHIP_CARD_QUEUE_SIZE', 50)
+
+
+def low_water_mark() -> int:
+    return getattr(settings, 'SCHOLARSHIP_CARD_QUEUE_LOW_WATER', 10)
+
+
+def pop_cards(user_id: int, count: int) -> list:
+    """
+    Take the next count scholarship ids off the user's queue.
+
+    Schedules a refill when the queue drops below the low-water mark.
+
+    Returns:
+        Scholarship ids in ranked order; empty when the queue is empty,
+        disabled or unreachable
+    """
+    if not card_queue_enabled():
+        return []
+    key = CARDS_KEY.format(user_id=user_id)
+    served_key = SERVED_KEY.format(user_id=user_id)
+    try:
+        client = swipes.get_redis()
+        pipeline = client.pipeline()
+        pipeline.lpop(key, count)
+        pipeline.llen(key)
+        popped, remaining = pipeline.execute()
+        card_ids = [int(card_id) for card_id in popped or []]
+        if card_ids:
+            pipeline = client.pipeline()
+            pipeline.sadd(served_key, *card_ids)
+            pipeline.expire(served_key, SERVED_TTL)
+            pipeline.execute()
+    except RedisError:
+        logger.warning("Card queue unavailable for user %s", user_id, exc_info=True)
+        return []
+
+    if remaining < low_water_mark():
+        schedule_refill(user_id)
+    return card_ids
+
+
+def schedule_refill(user_id: int):
+    """
+    Queue one refill task per user at a time
+    """
+    if cache.add(REFILL_LOCK_KEY.format(user_id=user_id), True, timeout=REFILL_LOCK_TTL):
+        from .tasks import refill_card_queue
+        refill_card_queue.delay(user_id)
+
+
+def fill_card_queue(user_id: int) -> int:
+    """
+    Replace the user's queue with their next queue_size() ranked scholarships,
+    leaving out swiped and recently served ones.
+
+    Returns:
+        Number of cards queued
+    """
+    profile = UserProfile.objects.filter(user_id=user_id).first()
+    if profile is None:
+        return 0
+
+    key = CARDS_KEY.format(user_id=user_id)
+    client = swipes.get_redis()
+    served = {int(card_id) for card_id in client.smembers(SERVED_KEY.format(user_id=user_id))}
+
+    candidates = swipes.exclude_swiped(
+        ScholarshipMatcher.get_candidate_queryset().exclude(id__in=served),
+        user_id
+    )
+    card_ids = list(
+        get_matcher(profile).get_stored_matches(candidates).values_list('id', flat=True)[:queue_size()]
+    )
+
+    pipeline = client.pipeline()
+    pipeline.delete(key)
+    if card_ids:
+        pipeline.rpush(key, *card_ids)
+    pipeline.execute()
+    cache.delete(REFILL_LOCK_KEY.format(user_id=user_id))
+    return len(card_ids)
+
+
+def reset_card_queue(user_id: int):
+    """
+    Drop the user's queue after their ranking changed
+    """
+    if not card_queue_enabled():
+        return
+    try:
+        swipes.get_redis().delete(CARDS_KEY.format(user_id=user_id))
+    except RedisError:
+        logger.warning("Could not reset card queue for user %s", user_id, exc_info=True)
@@ -0,0 +1,38 @@
+from datetime import datetime, timezone
+from django.core.cache import cache
+
+CATALOG_VERSION_KEY = 'scholarships:catalog_version'
+CATALOG_MODIFIED_KEY = 'scholarships:catalog_modified'
+
+
+def get_catalog_version() -> int:
+    """
+    Current version of the scholarship catalog.
+
+    Bumped whenever a scholarship or its tags change so per-worker copies of
+    the catalog know when to reload.
+    """
+    cache.add(CATALOG_VERSION_KEY, 1, timeout=None)
+    return cache.get(CATALOG_VERSION_KEY) or 1
+
+
+def get_catalog_modified():
+    """
+    When the catalog version was last bumped, or None if not known
+    """
+    timestamp = cache.get(CATALOG_MODIFIED_KEY)
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc) if timestamp else None
+
+
+def bump_catalog_version() -> int:
+    """
+    Invalidate every in-memory copy of the catalog
+    """
+    cache.set(CATALOG_MODIFIED_KEY, datetime.now(tz=timezone.utc).timestamp(), timeout=None)
+    cache.add(CATALOG_VERSION_KEY, 1, timeout=None)
+    try:
+        return cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        # Key evicted between add() and incr()
+        cache.set(CATALOG_VERSION_KEY, 2, timeout=None)
+        return 2
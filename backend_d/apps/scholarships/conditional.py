@@ -0,0 +1,67 @@
+import hashlib
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from .catalog import get_catalog_modified, get_catalog_version
+
+
+class ConditionalGetMixin:
+    """
+    Viewset mixin answering conditional GETs of list and retrieve with 304
+    before the queryset is evaluated or anything is serialized.
+
+    By default the validators come from the catalog version, which changes
+    whenever a scholarship, tag or tag link changes. Views override
+    get_resource_version() for finer-grained validators.
+    """
+    conditional_actions = ('list', 'retrieve')
+
+    def get_resource_version(self, request):
+        """
+        Version of the resource being read.
+
+        Returns:
+            (version, last_modified); a None version turns conditional
+            handling off for the request
+        """
+        return get_catalog_version(), get_catalog_modified()
+
+    def get_etag(self, request, version):
+        # The same resource renders differently per query string and format,
+        # and expired scholarships drop out of reads when the day changes
+        variant = '|'.join([
+            request.get_full_path(),
+            request.accepted_renderer.format,
+            timezone.now().date().isoformat(),
+        ])
+        digest = hashlib.blake2b(variant.encode(), digest_size=8).hexdigest()
+        return quote_etag(f'{version}-{digest}')
+
+    def conditional(self, request, handler, *args, **kwargs):
+        version, last_modified = self.get_resource_version(request)
+        if version is None:
+            return handler(request, *args, **kwargs)
+
+        etag = self.get_etag(request, version)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        not_modified = get_conditional_response(request._request, etag=etag, last_modified=timestamp)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        if 'list' not in self.conditional_actions:
+            return super().list(request, *args, **kwargs)
+        return self.conditional(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        if 'retrieve' not in self.conditional_actions:
+            return super().retrieve(request, *args, **kwargs)
+        return self.conditional(request, super().retrieve, *args, **kwargs)
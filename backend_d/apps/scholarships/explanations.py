@@ -0,0 +1,93 @@
+from django.core.cache import cache
+from .catalog import get_catalog_version
+from .matching import SCORE_COMPONENTS, daily_tiebreak_seed, tiebreak_value
+from .models import Scholarship
+from .text import get_text_index_version
+
+EXPLANATION_KEY = (
+    'scholarships:explain:{user_id}:{profile_version}:{scholarship_id}:{scholarship_version}'
+    ':{catalog_version}:{text_index_version}'
+)
+
+# Tag changes move the catalog version and the nightly rebuild the text
+# index stamp, so superseded keys are never read again
+EXPLANATION_TTL = 60 * 60 * 24
+
+
+def explanation_key(profile, scholarship) -> str:
+    return EXPLANATION_KEY.format(
+        user_id=profile.user_id,
+        profile_version=profile.match_version or profile.compute_match_version(),
+        scholarship_id=scholarship.pk,
+        scholarship_version=scholarship.updated_at.timestamp(),
+        catalog_version=get_catalog_version(),
+        text_index_version=get_text_index_version()
+    )
+
+
+def component_scores(matcher, scholarship) -> dict:
+    """
+    Unweighted component scores of one scholarship, computed in a single row
+    query on a cache miss.
+
+    The random factor changes daily and is cheap to compute, so it is left
+    out of the cached scores.
+
+    Returns:
+        Dict with 'eligible' and 'scores', a mapping of component name to score
+    """
+    key = explanation_key(matcher.user_profile, scholarship)
+    cached = cache.get(key)
+    if cached is not None:
+        return {**cached, 'cached': True}
+
+    components = [
+        component for component in {*matcher.stored_components(), *matcher.active_components()}
+        if component.name != 'random'
+    ]
+    annotations = {f'{component.name}_score': component.expression(matcher) for component in components}
+    row = Scholarship.objects.filter(pk=scholarship.pk).annotate(**annotations).values(
+        *annotations
+    ).first() or {}
+    result = {
+        'eligible': Scholarship.objects.filter(pk=scholarship.pk).filter(matcher.eligibility_filter()).exists(),
+        'scores': {
+            component.name: float(row.get(f'{component.name}_score') or 0)
+            for component in components
+        },
+    }
+    cache.set(key, result, timeout=EXPLANATION_TTL)
+    return {**result, 'cached': False}
+
+
+def explain_match(matcher, scholarship) -> dict:
+    """
+    Per-component breakdown of a scholarship's match score for the matcher's user.
+
+    Returns:
+        Dict with the total 'score' and a 'components' list of each
+        component's weight, score and weighted contribution, largest first
+    """
+    result = component_scores(matcher, scholarship)
+    scores = dict(result['scores'])
+    multiplier, offset = daily_tiebreak_seed(matcher.user_profile.user_id)
+    scores['random'] = tiebreak_value(scholarship.pk, multiplier, offset)
+
+    components = []
+    for name, score in scores.items():
+        weight = matcher.weights.get(SCORE_COMPONENTS[name].weight, 0.0)
+        components.append({
+            'name': name,
+            'weight': weight,
+            'score': score,
+            'contribution': score * weight,
+        })
+    components.sort(key=lambda component: (-component['contribution'], SCORE_COMPONENTS[component['name']].cost))
+
+    return {
+        'scholarship_id': scholarship.pk,
+        'eligible': result['eligible'],
+        'score': sum(component['contribution'] for component in components),
+        'components': components,
+        'cached': result['cached'],
+    }
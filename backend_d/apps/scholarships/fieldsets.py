@@ -0,0 +1,108 @@
+import hashlib
+from copy import deepcopy
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+COMPACT_PARAM = 'compact'
+
+
+def representation_params(request) -> dict:
+    """
+    The query parameters shaping a read of request, or {} for writes
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return {}
+    params = request.query_params
+    return {
+        name: params[name]
+        for name in (FIELDS_PARAM, EXPAND_PARAM, COMPACT_PARAM)
+        if params.get(name)
+    }
+
+
+def representation_variant(request) -> str:
+    """
+    Short stable name for the shape of a read, '' for the default shape
+    """
+    params = representation_params(request)
+    if not params:
+        return ''
+    canonical = '&'.join(f'{name}={params[name]}' for name in sorted(params))
+    return hashlib.blake2b(canonical.encode(), digest_size=6).hexdigest()
+
+
+def _parse_paths(value: str) -> dict:
+    """
+    'id,scholarship.title' -> {'id': {}, 'scholarship': {'title': {}}}
+    """
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for name in path.strip().split('.'):
+            if name:
+                node = node.setdefault(name, {})
+    return tree
+
+
+def _subtree(tree: dict, path: list):
+    for name in path:
+        if name not in tree:
+            return None
+        tree = tree[name]
+    return tree
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin shaping reads from the request's query parameters:
+
+        ?fields=id,title          keep only these fields; dotted names such as
+                                  scholarship.amount select inside nested
+                                  serializers
+        ?expand=description       add fields named in Meta.expandable_fields,
+                                  which are left out by default
+        ?compact=true             swap in the lighter fields of
+                                  Meta.compact_fields, e.g. tags as names
+
+    Writes are not affected. Views using QuerysetOptimizationMixin load only
+    the columns of the selected fields.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        params = representation_params(self.context.get('request'))
+        if not params:
+            for name in getattr(self.Meta, 'expandable_fields', ()):
+                fields.pop(name, None)
+            return fields
+
+        path = self._field_path()
+        expanded = _subtree(_parse_paths(params.get(EXPAND_PARAM, '')), path) or {}
+        for name in getattr(self.Meta, 'expandable_fields', ()):
+            if name not in expanded:
+                fields.pop(name, None)
+
+        if params.get(COMPACT_PARAM, '').lower() == 'true':
+            for name, field in getattr(self.Meta, 'compact_fields', {}).items():
+                if name in fields:
+                    fields[name] = deepcopy(field)
+
+        selected = _subtree(_parse_paths(params.get(FIELDS_PARAM, '')), path)
+        if selected:
+            fields = type(fields)(
+                (name, field) for name, field in fields.items()
+                if name in selected or name in expanded
+            )
+        return fields
+
+    def _field_path(self) -> list:
+        """
+        Field names leading from the root serializer to this one
+        """
+        path, node = [], self
+        while node.parent is not None:
+            if node.field_name:
+                path.insert(0, node.field_name)
+            node = node.parent
+        return path
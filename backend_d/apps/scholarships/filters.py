@@ -0,0 +1,33 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+# Text search configuration the search_vector trigger indexes with
+SEARCH_CONFIG = 'english'
+
+
+class ScholarshipSearchFilter(filters.SearchFilter):
+    """
+    ?search= against the weighted search_vector column on Postgres, ranked
+    with ts_rank. Other databases keep DRF's icontains search over
+    search_fields.
+
+    Meant to run after OrderingFilter: unless ?ordering= is given, the best
+    ranked scholarships come first and the view's ordering breaks ties.
+    """
+    rank_annotation = 'search_rank'
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms or connections[queryset.db].vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+
+        query = SearchQuery(' '.join(search_terms), search_type='websearch', config=SEARCH_CONFIG)
+        queryset = queryset.filter(search_vector=query).annotate(
+            **{self.rank_annotation: SearchRank(F('search_vector'), query)}
+        )
+        if api_settings.ORDERING_PARAM not in request.query_params:
+            queryset = queryset.order_by(f'-{self.rank_annotation}', *queryset.query.order_by)
+        return queryset
@@ -0,0 +1,176 @@
+import hashlib
+import json
+from collections.abc import Mapping, Sequence
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import SlugRelatedField
+from .fieldsets import representation_variant
+
+FRAGMENT_KEY = 'scholarships:fragment:{serializer}:{variant}:{pk}:{version}'
+
+# Keys change with every edit, so old fragments only need to age out
+FRAGMENT_TTL = 60 * 60 * 24
+
+
+def fragment_cache_enabled() -> bool:
+    return getattr(settings, 'SCHOLARSHIP_FRAGMENT_CACHE', False)
+
+
+class RenderedObject(Mapping):
+    """
+    One serialized object held as JSON bytes, decoded only if read
+    """
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = json.loads(self.raw)
+        return self._data
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+
+class RenderedRows(Sequence):
+    """
+    Serialized objects held as JSON fragments, written out by
+    FragmentJSONRenderer without being decoded
+    """
+
+    def __init__(self, fragments: list):
+        self.fragments = fragments
+
+    @property
+    def raw(self) -> bytes:
+        return b'[' + b','.join(self.fragments) + b']'
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [json.loads(fragment) for fragment in self.fragments[index]]
+        return json.loads(self.fragments[index])
+
+    def __len__(self):
+        return len(self.fragments)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+
+def _tag_attributes(field) -> list:
+    """
+    Tag attributes read by the tags field, whether nested or compact
+    """
+    child = getattr(field, 'child', None) or field.child_relation
+    if isinstance(child, SlugRelatedField):
+        return ['pk', child.slug_field]
+    return ['pk', *(tag_field.source for tag_field in child.fields.values())]
+
+
+def fragment_version(instance, fields) -> str:
+    """
+    Everything the rendered fragment depends on: the row's updated_at, the
+    tag attributes it renders and the current date, which decides is_expired
+    """
+    parts = [str(instance.updated_at.timestamp()), timezone.now().date().isoformat()]
+    if 'tags' in fields:
+        # Tag renames and counts change the nested tags without touching the row
+        attributes = _tag_attributes(fields['tags'])
+        parts.extend(
+            ':'.join(str(getattr(tag, attribute)) for attribute in attributes)
+            for tag in instance.tags.all()
+        )
+    return hashlib.blake2b('|'.join(parts).encode(), digest_size=12).hexdigest()
+
+
+def fragment_key(instance, serializer_class, fields, variant='') -> str:
+    return FRAGMENT_KEY.format(
+        serializer=serializer_class.__name__,
+        # ?fields=, ?expand= and ?compact= reshape the fragment
+        variant=variant or 'full',
+        pk=instance.pk,
+        version=fragment_version(instance, fields)
+    )
+
+
+def render_fragments(instances, serializer_class, context) -> list:
+    """
+    JSON bytes of each instance, from the cache where present. Misses are
+    serialized in one pass and cached.
+    """
+    fields = serializer_class(context=context).fields
+    variant = representation_variant(context.get('request'))
+    keys = [fragment_key(instance, serializer_class, fields, variant) for instance in instances]
+    cached = cache.get_many(keys)
+    missing = [(key, instance) for key, instance in zip(keys, instances) if key not in cached]
+    if missing:
+        data = serializer_class([instance for _, instance in missing], many=True, context=context).data
+        from .renderers import ORJSONRenderer
+        renderer = ORJSONRenderer()
+        fresh = {key: renderer.render(item) for (key, _), item in zip(missing, data)}
+        cache.set_many(fresh, timeout=FRAGMENT_TTL)
+        cached.update(fresh)
+    return [cached[key] for key in keys]
+
+
+class CachedSerializer:
+    """
+    Stands in for a read-only serializer, producing .data from fragments
+    """
+
+    def __init__(self, serializer_class, instance, many, context):
+        self.serializer_class = serializer_class
+        self.instance = instance
+        self.many = many
+        self.context = context
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            if self.many:
+                fragments = render_fragments(list(self.instance), self.serializer_class, self.context)
+                self._data = RenderedRows(fragments)
+            else:
+                fragment = render_fragments([self.instance], self.serializer_class, self.context)[0]
+                self._data = RenderedObject(fragment)
+        return self._data
+
+
+class FragmentCacheMixin:
+    """
+    Viewset mixin serving the reads of fragment_actions from cached JSON
+    fragments of each object, when the response is rendered by
+    FragmentJSONRenderer and settings.SCHOLARSHIP_FRAGMENT_CACHE is on
+    """
+    fragment_actions = ('list', 'retrieve')
+
+    def use_fragment_cache(self) -> bool:
+        from .renderers import FragmentJSONRenderer
+        return (
+            fragment_cache_enabled()
+            and self.action in self.fragment_actions
+            and self.request.method in SAFE_METHODS
+            and isinstance(getattr(self.request, 'accepted_renderer', None), FragmentJSONRenderer)
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        if not args or 'data' in kwargs or not self.use_fragment_cache():
+            return super().get_serializer(*args, **kwargs)
+        return CachedSerializer(
+            self.get_serializer_class(),
+            args[0],
+            kwargs.get('many', False),
+            self.get_serializer_context()
+        )
@@ -0,0 +1,180 @@
+from django.db import transaction
+from .catalog import bump_catalog_version
+from .models import Scholarship, ScholarshipTag
+from .serializers import ScholarshipBulkItemSerializer
+
+BULK_BATCH_SIZE = 500
+
+# Written on conflict when the item sent them; created_at keeps the first
+# ingest time
+UPSERT_FIELDS = [
+    'title',
+    'description',
+    'amount',
+    'deadline',
+    'eligibility_criteria',
+    'education_level',
+    'field_of_study',
+    'location',
+    'is_active',
+]
+# Derived or touched on every write, whatever the item sent
+ALWAYS_UPDATED = ['status', 'updated_at']
+
+
+def _validate(items, offset, seen):
+    """
+    Validate a batch of raw items.
+
+    Returns:
+        (valid, errors): valid is a list of (index, validated_data) and errors
+        a list of per-item error dicts, both indexed into the whole request
+    """
+    valid, errors = [], []
+    for position, item in enumerate(items):
+        index = offset + position
+        serializer = ScholarshipBulkItemSerializer(data=item)
+        if not serializer.is_valid():
+            errors.append({'index': index, 'errors': serializer.errors})
+            continue
+        external_id = serializer.validated_data['external_id']
+        if external_id in seen:
+            errors.append({
+                'index': index,
+                'errors': {'external_id': [f"Repeats item {seen[external_id]}"]}
+            })
+            continue
+        seen[external_id] = index
+        valid.append((index, serializer.validated_data))
+    return valid, errors
+
+
+def _resolve_tags(valid, errors):
+    """
+    Look up the batch's tag names in one query. Items naming unknown tags
+    become errors.
+    """
+    names = {name for _, data in valid for name in data.get('tags', [])}
+    tag_ids = dict(ScholarshipTag.objects.filter(name__in=names).values_list('name', 'id'))
+    resolved = []
+    for index, data in valid:
+        unknown = sorted(set(data.get('tags', [])) - tag_ids.keys())
+        if unknown:
+            errors.append({'index': index, 'errors': {'tags': [f"Unknown tags: {', '.join(unknown)}"]}})
+            continue
+        resolved.append((index, data))
+    return resolved, tag_ids
+
+
+def _build(data, existing_is_active=None):
+    scholarship = Scholarship(**{key: value for key, value in data.items() if key != 'tags'})
+    if 'is_active' not in data and existing_is_active is not None:
+        # The status of an existing row follows its stored is_active
+        scholarship.is_active = existing_is_active
+    # bulk_create skips save(), which derives the status
+    scholarship.status = scholarship.compute_status()
+    return scholarship
+
+
+def _sent_fields(data) -> tuple:
+    """
+    The UPSERT_FIELDS an item sent; fields it left out keep their stored
+    values on update
+    """
+    return tuple(field for field in UPSERT_FIELDS if field in data)
+
+
+def _upsert(rows, tag_ids):
+    """
+    Insert or update one batch of validated rows and replace the tags of
+    the items that sent them. Existing rows only take the fields each item
+    sent, so rows are upserted in groups sending the same fields.
+
+    Returns:
+        ({external_id: scholarship id}, external ids that already existed,
+        ids of every tag gaining or losing a scholarship)
+    """
+    external_ids = [data['external_id'] for _, data in rows]
+    existing = dict(
+        Scholarship.objects.filter(external_id__in=external_ids).values_list('external_id', 'is_active')
+    )
+    groups = {}
+    for _, data in rows:
+        groups.setdefault(_sent_fields(data), []).append(data)
+    for sent, group in groups.items():
+        Scholarship.objects.bulk_create(
+            [_build(data, existing.get(data['external_id'])) for data in group],
+            update_conflicts=True,
+            unique_fields=['external_id'],
+            update_fields=[*sent, *ALWAYS_UPDATED]
+        )
+    # Upserted rows don't get their primary keys back on every backend
+    ids = dict(
+        Scholarship.objects.filter(external_id__in=external_ids).values_list('external_id', 'id')
+    )
+
+    tagged = [data for _, data in rows if 'tags' in data]
+    if not tagged:
+        return ids, existing, set()
+    Through = Scholarship.tags.through
+    links = Through.objects.filter(scholarship_id__in=[ids[data['external_id']] for data in tagged])
+    touched_tags = set(links.values_list('scholarshiptag_id', flat=True))
+    links.delete()
+    new_links = [
+        Through(scholarship_id=ids[data['external_id']], scholarshiptag_id=tag_ids[name])
+        for data in tagged
+        for name in set(data['tags'])
+    ]
+    Through.objects.bulk_create(new_links)
+    touched_tags.update(link.scholarshiptag_id for link in new_links)
+    return ids, existing, touched_tags
+
+
+def ingest_scholarships(items, batch_size: int = None) -> dict:
+    """
+    Upsert partner scholarships keyed by external_id. Optional fields an
+    item leaves out keep their stored values when it updates a scholarship.
+
+    Items are validated and written a batch at a time, each batch in its own
+    transaction, so a bad item only fails itself. Bulk writes skip model
+    signals, so tag counts, the catalog version and stored matches are
+    refreshed here.
+
+    Returns:
+        {'created', 'updated', 'results', 'errors'} where results and errors
+        carry the index of each item in the request
+    """
+    from .tasks import refresh_matches_for_scholarships
+    batch_size = batch_size or BULK_BATCH_SIZE
+    summary = {'created': 0, 'updated': 0, 'results': [], 'errors': []}
+    seen = {}
+    scholarship_ids = []
+
+    for offset in range(0, len(items), batch_size):
+        valid, errors = _validate(items[offset:offset + batch_size], offset, seen)
+        rows, tag_ids = _resolve_tags(valid, errors)
+        summary['errors'].extend(errors)
+        if not rows:
+            continue
+
+        with transaction.atomic():
+            ids, existing, touched_tags = _upsert(rows, tag_ids)
+            ScholarshipTag.refresh_scholarship_counts(touched_tags)
+
+        for index, data in rows:
+            external_id = data['external_id']
+            status = 'updated' if external_id in existing else 'created'
+            summary[status] += 1
+            summary['results'].append({
+                'index': index,
+                'id': ids[external_id],
+                'external_id': external_id,
+                'status': status
+            })
+            scholarship_ids.append(ids[external_id])
+
+    summary['errors'].sort(key=lambda error: error['index'])
+    if scholarship_ids:
+        transaction.on_commit(bump_catalog_version)
+        transaction.on_commit(lambda: refresh_matches_for_scholarships.delay(scholarship_ids))
+    return summary
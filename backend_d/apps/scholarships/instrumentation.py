@@ -0,0 +1,122 @@
+import json
+import logging
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Request header staff users send to profile a matched feed request
+DEBUG_HEADER = 'X-Match-Debug'
+
+
+def estimate_rows(queryset):
+    """
+    Planner row estimate for queryset from EXPLAIN, or None when the database
+    does not report one
+    """
+    if connection.vendor != 'postgresql':
+        return None
+    plan = json.loads(queryset.explain(format='json'))
+    return plan[0]['Plan']['Plan Rows']
+
+
+def log_metrics(metrics: dict):
+    """
+    Default metrics hook: log the profile as JSON
+    """
+    logger.info("Match profile: %s", json.dumps(metrics))
+
+
+def get_metrics_hook():
+    """
+    The callable set in settings.SCHOLARSHIP_MATCH_METRICS_HOOK, or log_metrics
+    """
+    hook = getattr(settings, 'SCHOLARSHIP_MATCH_METRICS_HOOK', None)
+    return import_string(hook) if hook else log_metrics
+
+
+def debug_requested(request) -> bool:
+    """
+    Whether a staff user asked for this request to be profiled
+    """
+    return bool(
+        request.user.is_authenticated
+        and request.user.is_staff
+        and request.headers.get(DEBUG_HEADER, '').lower() in ('1', 'true')
+    )
+
+
+class MatchProfiler:
+    """
+    Collects stage timings and per-component costs of one matching request
+    and hands them to the metrics hook.
+
+    Components are costed by evaluating each one's SQL expression on its own
+    over the candidates, so the extra queries only run for profiled requests.
+    """
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.stages = {}
+        self.components = {}
+        matcher.profiler = self
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def profile_components(self, queryset):
+        """
+        Time every weighted component over queryset and record the
+        planner's row estimate for it
+        """
+        for component in self.matcher.active_components():
+            scored = queryset.annotate(
+                component_score=component.expression(self.matcher)
+            ).values_list('component_score', flat=True)
+            start = time.perf_counter()
+            rows = len(list(scored))
+            elapsed = (time.perf_counter() - start) * 1000
+            self.components[component.name] = {
+                'weight': self.matcher.weights[component.weight],
+                'cost': component.cost,
+                'ms': round(elapsed, 3),
+                'rows': rows,
+                'estimated_rows': estimate_rows(scored),
+            }
+
+    def as_dict(self) -> dict:
+        return {
+            'user': self.matcher.user_profile.user_id,
+            'engine': type(self.matcher).__name__,
+            'stages': {name: round(elapsed, 3) for name, elapsed in self.stages.items()},
+            'components': self.components,
+        }
+
+    def emit(self):
+        """
+        Send the profile to the metrics hook; a failing hook never fails the request
+        """
+        try:
+            get_metrics_hook()(self.as_dict())
+        except Exception:
+            logger.exception("Match metrics hook failed")
+
+    def server_timing(self) -> str:
+        """
+        Stage and component timings as a Server-Timing header value
+        """
+        entries = [f'{name};dur={elapsed:.1f}' for name, elapsed in self.stages.items()]
+        entries += [
+            f'component-{name};dur={metrics["ms"]:.1f}'
+            for name, metrics in self.components.items()
+        ]
+        return ', '.join(entries)
@@ -0,0 +1,165 @@
+import json
+import math
+import random
+import subprocess
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.applications.models import Application
+from apps.scholarships.models import Scholarship
+
+User = get_user_model()
+
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile of values
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize(timings, query_counts, errors):
+    return {
+        'iterations': len(timings),
+        'errors': errors,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'mean_ms': round(sum(timings) / len(timings), 3),
+        'max_ms': round(max(timings), 3),
+        'queries_p50': percentile(query_counts, 50),
+        'queries_max': max(query_counts),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Measure latency and query counts of the feed endpoints and write the results as JSON'
+
+    # name -> (method, url name, request builder)
+    ENDPOINTS = {
+        'matched': ('get', 'scholarships:scholarship-matched', lambda rng, ids: {}),
+        'scholarship_list': (
+            'get', 'scholarships:scholarship-list',
+            lambda rng, ids: {'exclude_swiped': 'true', 'pagination': 'cursor'}
+        ),
+        'scholarship_search': (
+            'get', 'scholarships:scholarship-list',
+            lambda rng, ids: {'search': rng.choice(['research', 'nursing', 'leadership']), 'pagination': 'cursor'}
+        ),
+        'application_stats': ('get', 'applications:application-stats', lambda rng, ids: {}),
+        'swipe': (
+            'post', 'applications:application-swipe',
+            lambda rng, ids: {'scholarship_id': rng.choice(ids), 'swipe_direction': rng.choice(['left', 'right', 'saved'])}
+        ),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help='Timed requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed requests per endpoint')
+        parser.add_argument('--users', type=int, default=10, help='Students to spread requests over')
+        parser.add_argument('--prefix', type=str, default='synthetic', help='Prefix of the generated students')
+        parser.add_argument('--endpoints', nargs='+', choices=sorted(self.ENDPOINTS), help='Endpoints to run')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed')
+        parser.add_argument('--label', type=str, help='Name of this run, defaults to the current git commit')
+        parser.add_argument('--output', type=str, help='JSON file path (defaults to stdout)')
+        parser.add_argument('--compare', type=str, help='Earlier results file to compare against')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+        users = list(User.objects.filter(
+            username__startswith=f"{options['prefix']}-"
+        ).order_by('id')[:options['users']])
+        if not users:
+            raise CommandError(f"No users with prefix {options['prefix']!r}; run generate_synthetic_data first")
+        scholarship_ids = list(Scholarship.objects.values_list('id', flat=True)[:10000])
+
+        rng = random.Random(options['seed'])
+        results = {}
+        # The test client talks to the 'testserver' host
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for name in options['endpoints'] or self.ENDPOINTS:
+                results[name] = self.run_endpoint(name, users, scholarship_ids, rng, options)
+                self.stderr.write(
+                    f"{name}: p50 {results[name]['p50_ms']}ms, p95 {results[name]['p95_ms']}ms, "
+                    f"{results[name]['queries_p50']} queries"
+                )
+
+        report = {
+            'label': options['label'] or self.git_commit(),
+            'created_at': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'scale': {
+                'scholarships': Scholarship.objects.count(),
+                'applications': Application.objects.count(),
+                'users': User.objects.count(),
+            },
+            'endpoints': results,
+        }
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output)
+        else:
+            self.stdout.write(output)
+
+        if options['compare']:
+            self.compare(options['compare'], report)
+
+    def run_endpoint(self, name, users, scholarship_ids, rng, options):
+        method, url_name, build = self.ENDPOINTS[name]
+        url = reverse(url_name)
+        client = APIClient()
+        timings, query_counts, errors = [], [], 0
+
+        for iteration in range(options['warmup'] + options['iterations']):
+            client.force_authenticate(user=users[iteration % len(users)])
+            data = build(rng, scholarship_ids)
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = getattr(client, method)(url, data, format='json' if method == 'post' else None)
+                elapsed = (time.perf_counter() - start) * 1000
+            if iteration < options['warmup']:
+                continue
+            timings.append(elapsed)
+            query_counts.append(len(queries))
+            errors += response.status_code >= 400
+
+        return summarize(timings, query_counts, errors)
+
+    def compare(self, path, report):
+        """
+        Print p50/p95 changes against an earlier run
+        """
+        with open(path) as f:
+            baseline = json.load(f)
+        self.stderr.write(f"Compared with {baseline.get('label')}:")
+        for name, current in report['endpoints'].items():
+            previous = baseline.get('endpoints', {}).get(name)
+            if not previous:
+                continue
+            changes = []
+            for key in ('p50_ms', 'p95_ms', 'queries_p50'):
+                before, after = previous[key], current[key]
+                change = f'{(after - before) / before * 100:+.1f}%' if before else 'n/a'
+                changes.append(f'{key} {before} -> {after} ({change})')
+            self.stderr.write(f"  {name}: " + ', '.join(changes))
+
+    @staticmethod
+    def git_commit():
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,113 @@
+import json
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from apps.scholarships.management.commands.benchmark_endpoints import Command as EndpointBenchmark, percentile
+from apps.scholarships.middleware import brotli
+from apps.scholarships.renderers import ORJSONRenderer
+
+User = get_user_model()
+
+
+def wire_sizes(body: bytes) -> dict:
+    """
+    Bytes sent for body uncompressed, gzipped and, when available, brotli
+    compressed as CompressionMiddleware would
+    """
+    sizes = {'raw': len(body), 'gzip': len(compress_string(body))}
+    if brotli is not None:
+        sizes['br'] = len(brotli.compress(body, quality=4))
+    return sizes
+
+
+class Command(BaseCommand):
+    help = 'Compare render time and bytes on the wire of JSONRenderer and ORJSONRenderer on the largest payloads'
+
+    # name -> (url name, query parameters)
+    PAYLOADS = {
+        'scholarship_list': ('scholarships:scholarship-list', {}),
+        'applications_applied': ('applications:application-applied', {}),
+    }
+    RENDERERS = {
+        'json': JSONRenderer,
+        'orjson': ORJSONRenderer,
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Timed renders per payload and renderer')
+        parser.add_argument('--prefix', type=str, default='synthetic', help='Prefix of the generated students')
+        parser.add_argument('--label', type=str, help='Name of this run, defaults to the current git commit')
+        parser.add_argument('--output', type=str, help='JSON file path (defaults to stdout)')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+        # The student with the most applications has the largest applied list
+        user = User.objects.filter(
+            username__startswith=f"{options['prefix']}-"
+        ).annotate(total=Count('applications')).order_by('-total', 'id').first()
+        if user is None:
+            raise CommandError(f"No users with prefix {options['prefix']!r}; run generate_synthetic_data first")
+
+        results = {}
+        for name, (url_name, params) in self.PAYLOADS.items():
+            data = self.fetch(user, url_name, params)
+            results[name] = {
+                renderer_name: self.run_renderer(renderer_class(), data, options['iterations'])
+                for renderer_name, renderer_class in self.RENDERERS.items()
+            }
+            summary = ', '.join(
+                f"{renderer_name} p50 {result['p50_ms']}ms / {result['bytes']['raw']}B"
+                for renderer_name, result in results[name].items()
+            )
+            self.stderr.write(f"{name}: {summary}")
+
+        report = {
+            'label': options['label'] or EndpointBenchmark.git_commit(),
+            'created_at': timezone.now().isoformat(),
+            'brotli': brotli is not None,
+            'payloads': results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output)
+        else:
+            self.stdout.write(output)
+
+    def fetch(self, user, url_name, params):
+        """
+        The data the endpoint hands to its renderer
+        """
+        client = APIClient()
+        client.force_authenticate(user=user)
+        # Fragment-cached data only renders through FragmentJSONRenderer;
+        # the test client talks to the 'testserver' host
+        with override_settings(
+            SCHOLARSHIP_FRAGMENT_CACHE=False,
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']
+        ):
+            response = client.get(reverse(url_name), params)
+        if response.status_code != 200:
+            raise CommandError(f"{url_name} answered {response.status_code}")
+        return response.data
+
+    def run_renderer(self, renderer, data, iterations):
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            body = renderer.render(data, 'application/json')
+            timings.append((time.perf_counter() - start) * 1000)
+        return {
+            'p50_ms': round(percentile(timings, 50), 3),
+            'mean_ms': round(sum(timings) / len(timings), 3),
+            'bytes': wire_sizes(body),
+        }
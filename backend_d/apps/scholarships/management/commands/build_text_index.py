@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from apps.scholarships.text import build_text_index
+
+class Command(BaseCommand):
+    help = 'Rebuild the TF-IDF index used by the text_match score component'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        counts = build_text_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {counts['documents']} scholarships: "
+            f"{counts['terms']} terms, {counts['postings']} postings"
+        ))
@@ -0,0 +1,194 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from apps.applications.models import Application
+from apps.scholarships.models import Scholarship, ScholarshipTag
+from apps.users.models import UserProfile
+
+User = get_user_model()
+
+FIELDS = [
+    'Computer Science', 'Computer Engineering', 'Mechanical Engineering', 'Nursing',
+    'Biology', 'Chemistry', 'Mathematics', 'Economics', 'Business Administration',
+    'Education', 'Fine Arts', 'Music', 'History', 'Psychology', 'Political Science',
+]
+LOCATIONS = ['', '', '', 'California', 'Texas', 'New York', 'Florida', 'Ohio', 'Georgia']
+EDUCATION_LEVELS = ['', 'undergraduate', 'graduate', 'high_school']
+WORDS = [
+    'students', 'community', 'leadership', 'research', 'service', 'first-generation',
+    'financial', 'need', 'merit', 'academic', 'excellence', 'women', 'minority',
+    'veterans', 'rural', 'urban', 'science', 'technology', 'engineering', 'arts',
+    'health', 'medicine', 'teaching', 'business', 'innovation', 'essay', 'volunteer',
+    'athletics', 'music', 'environment', 'agriculture', 'law', 'public', 'policy',
+]
+AMOUNTS = [500, 1000, 1500, 2000, 2500, 5000, 7500, 10000, 20000]
+SWIPES = ['left', 'right', 'saved']
+SWIPE_WEIGHTS = [6, 2, 2]
+STATUSES = ['pending', 'submitted', 'under_review', 'accepted', 'rejected']
+STATUS_WEIGHTS = [10, 3, 2, 1, 1]
+
+
+class Command(BaseCommand):
+    help = 'Generate deterministic synthetic scholarships, tags, students and applications for benchmarking'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scholarships', type=int, default=1000, help='Scholarships to create')
+        parser.add_argument('--tags', type=int, default=50, help='Tags to create')
+        parser.add_argument('--users', type=int, default=100, help='Students to create')
+        parser.add_argument('--applications', type=int, default=10000, help='Applications to create')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert')
+        parser.add_argument('--prefix', type=str, default='synthetic', help='Marks generated rows for cleanup')
+        parser.add_argument('--clear', action='store_true', help='Delete data from a previous run first')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.prefix = options['prefix']
+        self.batch_size = options['batch_size']
+
+        if options['clear']:
+            self.clear()
+
+        with transaction.atomic():
+            tag_ids = self.create_tags(options['tags'])
+            scholarship_ids = self.create_scholarships(options['scholarships'], tag_ids)
+            user_ids = self.create_students(options['users'], tag_ids)
+            applications = self.create_applications(options['applications'], user_ids, scholarship_ids)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {len(tag_ids)} tags, {len(scholarship_ids)} scholarships, '
+            f'{len(user_ids)} students and {applications} applications'
+        ))
+
+    def clear(self):
+        """
+        Delete rows created by earlier runs with the same prefix
+        """
+        users = User.objects.filter(username__startswith=f'{self.prefix}-')
+        Application.objects.filter(user__in=users).delete()
+        UserProfile.objects.filter(user__in=users).delete()
+        users.delete()
+        Scholarship.objects.filter(title__startswith=f'{self.prefix} ').delete()
+        ScholarshipTag.objects.filter(name__startswith=f'{self.prefix}-').delete()
+
+    def bulk_create(self, model, rows):
+        """
+        Insert rows in batches without keeping them all in memory
+        """
+        batch = []
+        created = 0
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                model.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_create(batch)
+            created += len(batch)
+        return created
+
+    def create_tags(self, count):
+        self.bulk_create(ScholarshipTag, (
+            ScholarshipTag(name=f'{self.prefix}-tag-{i:05d}', slug=f'{self.prefix}-tag-{i:05d}')
+            for i in range(count)
+        ))
+        return list(
+            ScholarshipTag.objects.filter(name__startswith=f'{self.prefix}-').order_by('id').values_list('id', flat=True)
+        )
+
+    def create_scholarships(self, count, tag_ids):
+        today = timezone.now().date()
+
+        def scholarships():
+            for i in range(count):
+                scholarship = Scholarship(
+                    title=f'{self.prefix} scholarship {i:07d}',
+                    description=' '.join(self.rng.choices(WORDS, k=60)),
+                    eligibility_criteria=' '.join(self.rng.choices(WORDS, k=20)),
+                    amount=Decimal(self.rng.choice(AMOUNTS)),
+                    # About one in ten has already closed
+                    deadline=today + timedelta(days=self.rng.randint(-40, 365)),
+                    is_active=self.rng.random() < 0.95,
+                    education_level=self.rng.choice(EDUCATION_LEVELS),
+                    field_of_study=self.rng.choice(FIELDS),
+                    location=self.rng.choice(LOCATIONS),
+                )
+                # bulk_create skips save(), which derives the status
+                scholarship.status = scholarship.compute_status(today)
+                yield scholarship
+
+        self.bulk_create(Scholarship, scholarships())
+        scholarship_ids = list(
+            Scholarship.objects.filter(
+                title__startswith=f'{self.prefix} '
+            ).order_by('id').values_list('id', flat=True)
+        )
+
+        if tag_ids:
+            through = Scholarship.tags.through
+            self.bulk_create(through, (
+                through(scholarship_id=scholarship_id, scholarshiptag_id=tag_id)
+                for scholarship_id in scholarship_ids
+                for tag_id in self.rng.sample(tag_ids, min(len(tag_ids), self.rng.randint(1, 5)))
+            ))
+            # bulk_create skips the signals that keep tag counts
+            ScholarshipTag.refresh_scholarship_counts(tag_ids)
+        return scholarship_ids
+
+    def create_students(self, count, tag_ids):
+        # Hash once; per-user hashing would dominate the run
+        password = make_password('synthetic-password')
+        self.bulk_create(User, (
+            User(
+                username=f'{self.prefix}-{i:07d}',
+                email=f'{self.prefix}-{i:07d}@example.com',
+                firebase_uid=f'{self.prefix}-{i:07d}',
+                password=password,
+            )
+            for i in range(count)
+        ))
+        users = list(
+            User.objects.filter(username__startswith=f'{self.prefix}-').order_by('id').values_list('id', 'firebase_uid')
+        )
+
+        tag_names = dict(ScholarshipTag.objects.filter(id__in=tag_ids).values_list('id', 'name'))
+        self.bulk_create(UserProfile, (
+            UserProfile(
+                user_id=user_id,
+                firebase_uid=firebase_uid,
+                user_type='student',
+                interests=[
+                    tag_names[tag_id]
+                    for tag_id in self.rng.sample(tag_ids, min(len(tag_ids), self.rng.randint(1, 6)))
+                ],
+                education_level=self.rng.choice(EDUCATION_LEVELS[1:]),
+                field_of_study=self.rng.choice(FIELDS),
+                location=self.rng.choice(LOCATIONS),
+            )
+            for user_id, firebase_uid in users
+        ))
+        return [user_id for user_id, _ in users]
+
+    def create_applications(self, count, user_ids, scholarship_ids):
+        if not user_ids or not scholarship_ids:
+            return 0
+        per_user, remainder = divmod(count, len(user_ids))
+
+        def applications():
+            for index, user_id in enumerate(user_ids):
+                wanted = min(per_user + (index < remainder), len(scholarship_ids))
+                for scholarship_id in self.rng.sample(scholarship_ids, wanted):
+                    yield Application(
+                        user_id=user_id,
+                        scholarship_id=scholarship_id,
+                        swipe_status=self.rng.choices(SWIPES, SWIPE_WEIGHTS)[0],
+                        status=self.rng.choices(STATUSES, STATUS_WEIGHTS)[0],
+                    )
+
+        return self.bulk_create(Application, applications())
@@ -0,0 +1,41 @@
+import csv
+from django.core.management.base import BaseCommand
+from apps.scholarships.matching import ScholarshipMatcher
+from apps.users.models import UserProfile
+
+class Command(BaseCommand):
+    help = 'Write the top-N matched scholarships for every active student as CSV rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-n', type=int, default=10, help='Scholarships per user')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Profiles scored per batch')
+        parser.add_argument('--workers', type=int, default=1, help='Process pool size')
+        parser.add_argument('--output', type=str, help='CSV file path (defaults to stdout)')
+
+    def handle(self, *args, **options):
+        profiles = UserProfile.objects.filter(
+            user_type='student',
+            user__is_active=True
+        ).only(
+            'user_id', 'interests', 'education_level', 'field_of_study',
+            'location', 'min_amount', 'max_amount'
+        ).order_by('user_id').iterator(chunk_size=options['chunk_size'])
+
+        output = open(options['output'], 'w', newline='') if options['output'] else self.stdout
+        try:
+            writer = csv.writer(output)
+            writer.writerow(['user_id', 'scholarship_id', 'score'])
+            written = 0
+            for user_id, scholarship_id, score in ScholarshipMatcher.match_many(
+                profiles,
+                top_n=options['top_n'],
+                chunk_size=options['chunk_size'],
+                workers=options['workers']
+            ):
+                writer.writerow([user_id, scholarship_id, f'{score:.6f}'])
+                written += 1
+        finally:
+            if options['output']:
+                output.close()
+
+        self.stderr.write(self.style.SUCCESS(f'Wrote {written} matches'))
@@ -1,23 +1,213 @@
-from django.db.models import F, ExpressionWrapper, FloatField, Func
-from django.db.models.functions import Cast, Random
+import hashlib
+import logging
+from contextlib import nullcontext
+from django.conf import settings
+from django.db import connection
+from django.db.models import (
+    F, BigIntegerField, Case, Count, ExpressionWrapper, FloatField, Func, OuterRef, Subquery, Sum,
+    Value, When
+)
+from django.db.models.functions import Cast, Coalesce, Least
 from django.contrib.postgres.search import TrigramSimilarity
 from django.db.models import Q
 from django.core.paginator import Paginator
 from django.db.models import QuerySet
 from django.utils import timezone
-from datetime import datetime
 from apps.users.models import UserProfile
-from .models import Scholarship
+from .models import Scholarship, ScholarshipTermWeight, UserScholarshipMatch
+from .text import profile_vector
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WEIGHTS = {
+    'tag_match': 0.40,
+    'education_match': 0.30,
+    'field_match': 0.20,
+    'random_factor': 0.10,  # Add randomization weight
+    'amount_match': 0.0,
+    'location_match': 0.0,
+    'text_match': 0.0
+}
+
+# The tie-break hashes ids within 31 bits, so every product fits a bigint
+TIEBREAK_MASK = 2 ** 31 - 1
+TIEBREAK_SCALE = float(2 ** 31)
+# Multiplier of the final mixing round
+TIEBREAK_MIX = 0x45d9f3b
+
+# Students scored and written per upsert when scholarships are rescored
+REFRESH_CHUNK_SIZE = 500
+
+
+class ScoreComponent:
+    """
+    One weighted term of the match score.
+
+    Args:
+        name: Component name, used for stored scores and metrics
+        weight: Key of the component's weight in the matcher's weights
+        cost: Relative per-row cost, cheaper components are evaluated first
+        expression: Callable taking the matcher and returning a SQL expression
+        stored: Whether the term is part of the precomputed score
+    """
+
+    def __init__(self, name, weight, cost, expression, stored=True):
+        self.name = name
+        self.weight = weight
+        self.cost = cost
+        self.expression = expression
+        self.stored = stored
+
+    def __repr__(self):
+        return f'<ScoreComponent {self.name} weight={self.weight} cost={self.cost}>'
+
+
+SCORE_COMPONENTS = {}
+
+
+def score_component(name: str, weight: str, cost: int, stored: bool = True):
+    """
+    Register a score component.
+
+    Decorates a ScholarshipMatcher method, or any function taking the matcher,
+    that builds the component's SQL expression. A component only takes part
+    in scoring once its weight is non-zero.
+    """
+    def register(expression):
+        SCORE_COMPONENTS[name] = ScoreComponent(name, weight, cost, expression, stored)
+        return expression
+    return register
+
+
+def trigram_threshold():
+    """
+    Similarity threshold for the pg_trgm ``%`` prefilter, or None when the
+    prefilter is disabled or the database has no pg_trgm.
+    """
+    threshold = getattr(settings, 'SCHOLARSHIP_TRIGRAM_THRESHOLD', None)
+    if threshold is None or connection.vendor != 'postgresql':
+        return None
+    return threshold
+
+
+def daily_tiebreak_seed(user_id, day=None):
+    """
+    Per-user, per-day parameters for the deterministic tie-break.
+
+    The parameters key the tie-break hash, which shuffles scholarships
+    differently for each user but keeps a user's ranking stable for the
+    whole day, so feed pages never reshuffle.
+
+    Returns:
+        (multiplier, offset); the multiplier is odd
+    """
+    day = day or timezone.now().date()
+    digest = hashlib.blake2b(f'{user_id}:{day.isoformat()}'.encode(), digest_size=8).digest()
+    seed = int.from_bytes(digest, 'big')
+    multiplier = (seed & TIEBREAK_MASK) | 1
+    offset = (seed >> 32) & TIEBREAK_MASK
+    return multiplier, offset
+
+
+def tiebreak_value(ids, multiplier, offset):
+    """
+    Keyed hash of scholarship ids to [0, 1): xorshift and multiply rounds
+    within 31 bits, which mix every bit of the id, so neighbouring ids land
+    far apart in a different order for every seed.
+
+    Takes an int or a NumPy integer array; ScholarshipMatcher._tiebreak
+    computes the same hash in SQL.
+    """
+    x = (ids + offset) & TIEBREAK_MASK
+    x = x ^ (x >> 16)
+    x = (x * multiplier) & TIEBREAK_MASK
+    x = x ^ (x >> 15)
+    x = (x * TIEBREAK_MIX) & TIEBREAK_MASK
+    x = x ^ (x >> 16)
+    return x / TIEBREAK_SCALE
+
+def merge_weights(weights: dict = None) -> dict:
+    """
+    DEFAULT_WEIGHTS with the given weights applied over them
+    """
+    return {**DEFAULT_WEIGHTS, **(weights or {})}
 
 class ScholarshipMatcher:
-    def __init__(self, user_profile: UserProfile):
+    # Components with a column of their own in UserScholarshipMatch
+    STORED_COLUMNS = ('tag', 'education', 'field')
+
+    def __init__(self, user_profile: UserProfile, weights: dict = None):
         self.user_profile = user_profile
-        self.weights = {
-            'tag_match': 0.40,
-            'education_match': 0.30,
-            'field_match': 0.20,
-            'random_factor': 0.10  # Add randomization weight
-        }
+        self.weights = merge_weights(weights)
+        # Set by MatchProfiler while a request is being instrumented
+        self.profiler = None
+        self._text_vector = None
+
+    def active_components(self):
+        """
+        Registered components with a non-zero weight, cheapest first
+        """
+        return sorted(
+            (component for component in SCORE_COMPONENTS.values() if self.weights.get(component.weight)),
+            key=lambda component: component.cost
+        )
+
+    def stored_components(self):
+        """
+        Components precomputed by refresh_match_scores, cheapest first
+        """
+        return sorted(
+            (
+                component for component in SCORE_COMPONENTS.values()
+                if component.stored and (
+                    component.name in self.STORED_COLUMNS or self.weights.get(component.weight)
+                )
+            ),
+            key=lambda component: component.cost
+        )
+
+    def stage(self, name: str):
+        """
+        Time a pipeline stage when the request is being profiled
+        """
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.stage(name)
+
+    @classmethod
+    def match_many(cls, profiles, top_n: int = 10, weights: dict = None,
+                   chunk_size: int = 500, workers: int = 1):
+        """
+        Score many users in one pass.
+
+        Args:
+            profiles: Iterable of UserProfile, ideally a queryset iterator
+            top_n: Number of scholarships to return per user
+            chunk_size: Profiles scored per batch
+            workers: Size of the process pool, 1 scores in-process
+
+        Yields:
+            (user_id, scholarship_id, score) rows, best first per user
+        """
+        from .vectorized import match_many
+        return match_many(
+            profiles,
+            top_n=top_n,
+            weights=weights,
+            chunk_size=chunk_size,
+            workers=workers
+        )
+
+    @staticmethod
+    def get_candidate_queryset() -> QuerySet:
+        """
+        Scholarships that can appear in a matched feed. The deadline check
+        covers rows that lapsed since expire_scholarships last ran.
+        """
+        return Scholarship.objects.filter(
+            status=Scholarship.Status.ACTIVE,
+            deadline__gte=timezone.now().date()
+        )
 
     def get_matched_scholarships(
         self, 
@@ -36,8 +226,8 @@ class ScholarshipMatcher:
         Returns:
             Paginated queryset of matched scholarships
         """
-        # First apply any filtering/matching logic
-        matched_scholarships = self._apply_matching_criteria(queryset)
+        # Drop scholarships the user can never qualify for, then score the rest
+        matched_scholarships = self._apply_matching_criteria(self.apply_eligibility(queryset))
         
         # Then paginate the results
         paginator = Paginator(matched_scholarships, page_size)
@@ -45,6 +235,169 @@ class ScholarshipMatcher:
         
         return paginated_scholarships
 
+    def eligibility_filter(self) -> Q:
+        """
+        Hard constraints a scholarship must meet before it is scored.
+
+        A constraint only applies once the profile sets it, and a blank
+        scholarship field means the scholarship is open to everyone.
+        """
+        return self._education_filter() & self._amount_range_filter() & self._location_filter()
+
+    def apply_eligibility(self, queryset: QuerySet) -> QuerySet:
+        """
+        Eligibility stage of the pipeline: prune candidates with indexed filters
+        """
+        return queryset.filter(self.eligibility_filter())
+
+    def eligibility_report(self, queryset: QuerySet) -> dict:
+        """
+        Count how many scholarships in queryset the eligibility stage prunes.
+
+        Returns:
+            Dict with 'candidates', 'eligible' and 'pruned' counts
+        """
+        condition = self.eligibility_filter()
+        if condition:
+            counts = queryset.aggregate(
+                candidates=Count('id'),
+                eligible=Count('id', filter=condition)
+            )
+        else:
+            total = queryset.count()
+            counts = {'candidates': total, 'eligible': total}
+        counts['pruned'] = counts['candidates'] - counts['eligible']
+        return counts
+
+    def get_stored_matches(self, queryset: QuerySet) -> QuerySet:
+        """
+        Order the queryset by the precomputed scores in UserScholarshipMatch.
+
+        Falls back to a synchronous refresh the first time a user is seen so
+        the feed is never empty while the background refresh catches up.
+        """
+        user = self.user_profile.user
+        if not UserScholarshipMatch.objects.filter(user=user).exists():
+            with self.stage('refresh'):
+                self.refresh_match_scores()
+
+        return queryset.filter(
+            user_matches__user=user
+        ).annotate(
+            match_score=F('user_matches__score'),
+            tiebreak=self._tiebreak()
+        ).order_by('-match_score', '-tiebreak', 'id')
+
+    def refresh_match_scores(self, scholarship_ids=None) -> int:
+        """
+        Recompute the stored component scores for this user.
+
+        Args:
+            scholarship_ids: Restrict the refresh to these scholarships.
+                When omitted, the user's whole feed is rebuilt.
+
+        Returns:
+            Number of rows written
+        """
+        user = self.user_profile.user
+        candidates = self.get_candidate_queryset()
+        stale = UserScholarshipMatch.objects.filter(user=user)
+        if scholarship_ids is not None:
+            candidates = candidates.filter(id__in=scholarship_ids)
+            stale = stale.filter(scholarship_id__in=scholarship_ids)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Eligibility pruned %(pruned)d of %(candidates)d scholarships for user %(user)s",
+                {**self.eligibility_report(candidates), 'user': user.pk}
+            )
+        # Ineligible scholarships get no row, and rows they had are dropped below
+        candidates = self.apply_eligibility(candidates)
+
+        components = self._score_components(candidates)
+
+        matches = [
+            self.build_match(scholarship_id, scores)
+            for scholarship_id, scores in components.items()
+        ]
+
+        stale.exclude(scholarship_id__in=components.keys()).delete()
+        self.write_matches(matches)
+        return len(matches)
+
+    def build_match(self, scholarship_id: int, scores: dict) -> UserScholarshipMatch:
+        """
+        Unsaved stored match of a scholarship from its component scores
+        """
+        return UserScholarshipMatch(
+            user_id=self.user_profile.user_id,
+            scholarship_id=scholarship_id,
+            tag_score=scores.get('tag', 0),
+            education_score=scores.get('education', 0),
+            field_score=scores.get('field', 0),
+            score=self._stored_score(scores)
+        )
+
+    @staticmethod
+    def write_matches(matches: list):
+        """
+        Insert stored matches, overwriting the scores of existing pairs
+        """
+        UserScholarshipMatch.objects.bulk_create(
+            matches,
+            update_conflicts=True,
+            unique_fields=['user', 'scholarship'],
+            update_fields=['tag_score', 'education_score', 'field_score', 'score', 'updated_at']
+        )
+
+    def _score_components(self, candidates: QuerySet) -> dict:
+        """
+        Compute the stored component scores of each candidate.
+
+        Returns:
+            Mapping of scholarship id to a dict of component name to score
+        """
+        prefilter = self._use_trigram_prefilter()
+        components = self.stored_components()
+        annotations = {
+            f'{component.name}_score': (
+                Value(0.0) if prefilter and component.name == 'field' else component.expression(self)
+            )
+            for component in components
+        }
+        rows = candidates.annotate(**annotations).values_list('id', *annotations)
+
+        scores = {
+            row[0]: {
+                component.name: score or 0
+                for component, score in zip(components, row[1:])
+            }
+            for row in rows
+        }
+
+        if prefilter:
+            # Only rows passing the % operator can score; fetch them through the
+            # trigram index and compute the similarity for those alone
+            similar = candidates.filter(
+                field_of_study__trigram_similar=self.user_profile.field_of_study
+            ).annotate(
+                field_score=TrigramSimilarity('field_of_study', self.user_profile.field_of_study)
+            ).values_list('id', 'field_score')
+            for scholarship_id, field_score in similar:
+                scores[scholarship_id]['field'] = field_score
+
+        return scores
+
+    def _stored_score(self, scores: dict) -> float:
+        """
+        Weighted score without the random factor, which only breaks ties at read time
+        """
+        return sum(
+            scores.get(component.name, 0) * self.weights[component.weight]
+            for component in self.active_components()
+            if component.stored
+        )
+
     def _apply_matching_criteria(self, queryset: QuerySet) -> QuerySet:
         """
         Apply the matching criteria to the queryset.
@@ -52,36 +405,64 @@ class ScholarshipMatcher:
         """
         scored_scholarships = queryset.annotate(
             match_score=self._calculate_match_score(),
-            random_score=Random()  # Add random score
-        ).order_by('-match_score', '-random_score')
+            tiebreak=self._tiebreak()
+        ).order_by('-match_score', '-tiebreak', 'id')
         
         return scored_scholarships
 
     def _calculate_match_score(self):
         """
-        Calculates the weighted match score using all criteria plus randomization
+        Calculates the weighted match score from every weighted component,
+        including the seeded random factor
+        """
+        score = Value(0.0, output_field=FloatField())
+        for component in self.active_components():
+            score = score + component.expression(self) * self.weights[component.weight]
+        return ExpressionWrapper(score, output_field=FloatField())
+
+    @score_component('random', weight='random_factor', cost=1, stored=False)
+    def _tiebreak(self):
+        """
+        Deterministic pseudo-random value in [0, 1) per (user, scholarship,
+        day): tiebreak_value written as SQL
         """
+        multiplier, offset = daily_tiebreak_seed(self.user_profile.user_id)
+        x = (Cast('id', BigIntegerField()) + offset).bitand(TIEBREAK_MASK)
+        x = x.bitxor(x.bitrightshift(16))
+        x = (x * multiplier).bitand(TIEBREAK_MASK)
+        x = x.bitxor(x.bitrightshift(15))
+        x = (x * TIEBREAK_MIX).bitand(TIEBREAK_MASK)
+        x = x.bitxor(x.bitrightshift(16))
         return ExpressionWrapper(
-            (self._tag_match_score() * self.weights['tag_match']) +
-            (self._education_match_score() * self.weights['education_match']) +
-            (self._field_match_score() * self.weights['field_match']) +
-            (Random() * self.weights['random_factor']),  # Add random factor
+            Cast(x, FloatField()) / Value(TIEBREAK_SCALE),
             output_field=FloatField()
         )
 
+    @score_component('tag', weight='tag_match', cost=5)
     def _tag_match_score(self):
         """
-        Calculates score based on matching tags between user interests and scholarship
+        Fraction of the user's interests that appear as scholarship tags.
+
+        Counted with a correlated subquery rather than a join on the tags
+        table, so every scholarship yields exactly one row.
         """
-        user_interests = self.user_profile.interests
+        user_interests = set(self.user_profile.interests or [])
+        if not user_interests:
+            return Value(0.0, output_field=FloatField())
+
+        matched_tags = Scholarship.tags.through.objects.filter(
+            scholarship_id=OuterRef('pk'),
+            scholarshiptag__name__in=user_interests
+        ).order_by().values('scholarship_id').annotate(
+            matched=Count('*')
+        ).values('matched')
+
         return ExpressionWrapper(
-            Cast(
-                Q(tags__name__in=user_interests),  # Use Q instead of F().in_
-                output_field=FloatField()
-            ),
+            Cast(Coalesce(Subquery(matched_tags), 0), FloatField()) / Value(float(len(user_interests))),
             output_field=FloatField()
         )
 
+    @score_component('education', weight='education_match', cost=1)
     def _education_match_score(self):
         """
         Score based on education level match
@@ -92,29 +473,208 @@ class ScholarshipMatcher:
             output_field=FloatField()
         )
 
+    @score_component('field', weight='field_match', cost=10)
     def _field_match_score(self):
         """
         Score based on field of study similarity
         """
         user_field = self.user_profile.field_of_study
-        return TrigramSimilarity('field_of_study', user_field)
+        similarity = TrigramSimilarity('field_of_study', user_field)
+        if self._use_trigram_prefilter():
+            # Skip the similarity for rows the indexed % operator rules out
+            similarity = Case(
+                When(field_of_study__trigram_similar=user_field, then=similarity),
+                default=Value(0.0),
+                output_field=FloatField()
+            )
+        return Coalesce(
+            similarity,
+            Value(0.0),
+            output_field=FloatField()
+        )
+
+    def _use_trigram_prefilter(self) -> bool:
+        return bool(self.user_profile.field_of_study) and trigram_threshold() is not None
 
-    def _amount_range_score(self):
+    @score_component('amount', weight='amount_match', cost=1)
+    def _amount_score(self):
         """
-        Score based on whether scholarship amount is in user's preferred range
+        Award size as a share of the most the user is looking for
         """
-        min_amount = self.user_profile.min_amount or 0
-        max_amount = self.user_profile.max_amount or float('inf')
-        
-        return ExpressionWrapper(
-            Cast(F('amount') >= min_amount, FloatField()) *
-            Cast(F('amount') <= max_amount, FloatField()),
+        max_amount = self.user_profile.max_amount
+        if not max_amount:
+            return Value(0.0, output_field=FloatField())
+        return Least(
+            Cast('amount', FloatField()) / Value(float(max_amount)),
+            Value(1.0),
             output_field=FloatField()
         )
 
-    def _location_match_score(self):
+    @score_component('location', weight='location_match', cost=2)
+    def _location_score(self):
+        """
+        1.0 for scholarships aimed at the user's location rather than open to all
+        """
+        user_location = self.user_profile.location
+        if not user_location:
+            return Value(0.0, output_field=FloatField())
+        return Cast(Q(location__iexact=user_location), output_field=FloatField())
+
+    @score_component('text', weight='text_match', cost=20)
+    def _text_match_score(self):
+        """
+        Cosine similarity of the profile's career goals, bio and skills to the
+        scholarship's indexed description and eligibility criteria.
+
+        Both vectors are unit length, so the cosine is the sum over shared
+        terms of the products of their weights, read from the postings of the
+        profile's strongest terms only.
+        """
+        vector = self.text_vector()
+        if not vector:
+            return Value(0.0, output_field=FloatField())
+
+        similarity = ScholarshipTermWeight.objects.filter(
+            scholarship_id=OuterRef('pk'),
+            term_id__in=vector
+        ).order_by().values('scholarship_id').annotate(
+            similarity=Sum(Case(
+                *[When(term_id=term_id, then=F('weight') * Value(weight)) for term_id, weight in vector.items()],
+                default=Value(0.0),
+                output_field=FloatField()
+            ))
+        ).values('similarity')
+
+        return Coalesce(Subquery(similarity), Value(0.0), output_field=FloatField())
+
+    def text_vector(self) -> dict:
+        """
+        TF-IDF vector of the profile's free text, looked up once per matcher
+        """
+        if self._text_vector is None:
+            self._text_vector = profile_vector(self.user_profile)
+        return self._text_vector
+
+    def _education_filter(self) -> Q:
+        """
+        Scholarships for the user's education level or for any level
+        """
+        user_education = self.user_profile.education_level
+        if not user_education:
+            return Q()
+        return Q(education_level='') | Q(education_level=user_education)
+
+    def _amount_range_filter(self) -> Q:
+        """
+        Scholarships whose amount is in the user's preferred range
+        """
+        amount_range = Q()
+        if self.user_profile.min_amount is not None:
+            amount_range &= Q(amount__gte=self.user_profile.min_amount)
+        if self.user_profile.max_amount is not None:
+            amount_range &= Q(amount__lte=self.user_profile.max_amount)
+        return amount_range
+
+    def _location_filter(self) -> Q:
         """
-        Score based on location match if applicable
+        Scholarships open to the user's location or to any location
         """
         user_location = self.user_profile.location
-        return Cast(F('location') == user_location, FloatField()) 
\ No newline at end of file
+        if not user_location:
+            return Q()
+        return Q(location='') | Q(location__iexact=user_location)
+
+def get_matcher(user_profile: UserProfile, weights: dict = None) -> ScholarshipMatcher:
+    """
+    Build the matcher selected by settings.SCHOLARSHIP_MATCHING_ENGINE.
+
+    'orm' scores in Postgres, 'numpy' scores against an in-memory copy of the
+    catalog held by each worker.
+    """
+    engine = getattr(settings, 'SCHOLARSHIP_MATCHING_ENGINE', 'orm')
+    if engine == 'numpy':
+        from .vectorized import VectorizedMatcher
+        return VectorizedMatcher(user_profile, weights)
+    if engine != 'orm':
+        raise ValueError(f"Unknown scholarship matching engine: {engine}")
+    return ScholarshipMatcher(user_profile, weights)
+
+
+def refresh_user_matches(user_id: int) -> int:
+    """
+    Rebuild the stored matches for a single user
+    """
+    profile = UserProfile.objects.filter(user_id=user_id).first()
+    if profile is None:
+        return 0
+    return get_matcher(profile).refresh_match_scores()
+
+
+def refresh_scholarship_matches(scholarship_id: int) -> int:
+    """
+    Refresh one scholarship's stored score for every student
+    """
+    return refresh_matches_for_scholarships([scholarship_id])
+
+
+def refresh_matches_for_scholarships(scholarship_ids, chunk_size: int = None) -> int:
+    """
+    Refresh the stored scores of several scholarships for every student.
+
+    The scholarships are read once into a CatalogMatrix and students are
+    scored against it in memory, each chunk of students written with one
+    delete and one upsert, so the queries grow with the number of chunks
+    rather than of students.
+    """
+    from .vectorized import CatalogMatrix
+    scholarship_ids = list(scholarship_ids)
+    chunk_size = chunk_size or REFRESH_CHUNK_SIZE
+    catalog = CatalogMatrix.load(
+        candidates=ScholarshipMatcher.get_candidate_queryset().filter(id__in=scholarship_ids)
+    )
+    profiles = UserProfile.objects.filter(user_type='student').order_by('pk').iterator(chunk_size=chunk_size)
+
+    written, chunk = 0, []
+    for profile in profiles:
+        chunk.append(profile)
+        if len(chunk) >= chunk_size:
+            written += _refresh_chunk(chunk, scholarship_ids, catalog)
+            chunk = []
+    if chunk:
+        written += _refresh_chunk(chunk, scholarship_ids, catalog)
+    return written
+
+
+def _refresh_chunk(profiles, scholarship_ids, catalog) -> int:
+    """
+    Score a chunk of students against catalog, which holds the scholarships
+    of scholarship_ids still open, and store the eligible pairs. The other
+    pairs lose their stored rows.
+    """
+    from .vectorized import VectorizedMatcher
+    matches, written = [], 0
+    # Students grouped by the scholarships they keep rows for
+    kept_by = {}
+    for profile in profiles:
+        try:
+            matcher = VectorizedMatcher(profile, catalog=catalog)
+        except ValueError:
+            # Weighted with components only SQL can score
+            written += ScholarshipMatcher(profile).refresh_match_scores(scholarship_ids)
+            continue
+        components = matcher.component_scores()
+        kept = []
+        for index in matcher.eligible().nonzero()[0].tolist():
+            scholarship_id = int(catalog.ids[index])
+            scores = {name: float(values[index]) for name, values in components.items()}
+            matches.append(matcher.build_match(scholarship_id, scores))
+            kept.append(scholarship_id)
+        kept_by.setdefault(frozenset(kept), []).append(profile.user_id)
+
+    stale = Q()
+    for kept, user_ids in kept_by.items():
+        stale |= Q(user_id__in=user_ids) & ~Q(scholarship_id__in=kept)
+    if stale:
+        UserScholarshipMatch.objects.filter(scholarship_id__in=scholarship_ids).filter(stale).delete()
+    ScholarshipMatcher.write_matches(matches)
+    return written + len(matches)
@@ -0,0 +1,87 @@
+import re
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # Optional; responses are gzipped without it
+    brotli = None
+
+DEFAULT_MIN_SIZE = 1024
+
+# Compressing binary formats gains little
+COMPRESSIBLE_TYPES = ('application/json', 'text/', 'application/javascript', 'application/xml')
+
+
+def accepted_encodings(header: str) -> dict:
+    """
+    Content codings of an Accept-Encoding header with their q-values
+    """
+    encodings = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        if not coding:
+            continue
+        match = re.search(r'q=([0-9.]+)', params)
+        try:
+            quality = float(match.group(1)) if match else 1.0
+        except ValueError:
+            quality = 0.0
+        encodings[coding.strip().lower()] = quality
+    return encodings
+
+
+def choose_encoding(header: str):
+    """
+    The best coding the client accepts: br when brotli is installed, then
+    gzip, or None
+    """
+    encodings = accepted_encodings(header)
+    wildcard = encodings.get('*', 0)
+    available = ['br', 'gzip'] if brotli is not None else ['gzip']
+    for coding in available:
+        if encodings.get(coding, wildcard) > 0:
+            return coding
+    return None
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress responses of at least settings.RESPONSE_COMPRESSION_MIN_SIZE
+    bytes with brotli or gzip, whichever the client prefers of those
+    available.
+
+    Like Django's GZipMiddleware, the gzip stream carries random bytes
+    against BREACH and strong ETags are weakened, which still lets
+    ConditionalGetMixin match them.
+    """
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+            return response
+        if len(response.content) < getattr(settings, 'RESPONSE_COMPRESSION_MIN_SIZE', DEFAULT_MIN_SIZE):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        coding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if coding is None:
+            return response
+
+        if coding == 'br':
+            compressed = brotli.compress(response.content, quality=4)
+        else:
+            compressed = compress_string(response.content, max_random_bytes=100)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = coding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
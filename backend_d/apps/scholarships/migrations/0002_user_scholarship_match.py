@@ -0,0 +1,57 @@
+# Generated by Django 4.2.10 on 2026-10-18 19:44
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("scholarships", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserScholarshipMatch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("tag_score", models.FloatField(default=0)),
+                ("education_score", models.FloatField(default=0)),
+                ("field_score", models.FloatField(default=0)),
+                ("score", models.FloatField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "scholarship",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="user_matches",
+                        to="scholarships.scholarship",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="scholarship_matches",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["user", "-score"], name="user_match_score_idx")
+                ],
+                "unique_together": {("user", "scholarship")},
+            },
+        ),
+    ]
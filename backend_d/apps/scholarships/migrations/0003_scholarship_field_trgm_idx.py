@@ -0,0 +1,43 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS scholarship_field_trgm_idx "
+        "ON scholarships_scholarship USING gin (field_of_study gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS scholarship_field_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scholarships", "0002_user_scholarship_match"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="scholarship",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        fields=["field_of_study"],
+                        name="scholarship_field_trgm_idx",
+                        opclasses=["gin_trgm_ops"],
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_trigram_index, drop_trigram_index),
+            ],
+        ),
+    ]
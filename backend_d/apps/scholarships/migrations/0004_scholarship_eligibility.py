@@ -0,0 +1,38 @@
+# Generated by Django 4.2.10 on 2026-10-18 19:59
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scholarships", "0003_scholarship_field_trgm_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scholarship",
+            name="location",
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        migrations.AddIndex(
+            model_name="scholarship",
+            index=models.Index(
+                fields=["is_active", "deadline"], name="scholarship_active_dl_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="scholarship",
+            index=models.Index(
+                fields=["education_level", "amount"], name="scholarship_edu_amount_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="scholarship",
+            index=models.Index(
+                django.db.models.functions.text.Upper("location"),
+                name="scholarship_location_idx",
+            ),
+        ),
+    ]
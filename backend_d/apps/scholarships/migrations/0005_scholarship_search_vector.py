@@ -0,0 +1,82 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('english', coalesce({row}title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce({row}eligibility_criteria, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce({row}description, '')), 'C')
+"""
+
+
+def create_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION scholarship_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR_SQL.format(row="NEW.")};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    schema_editor.execute(
+        "DROP TRIGGER IF EXISTS scholarship_search_vector_trigger ON scholarships_scholarship"
+    )
+    schema_editor.execute(
+        """
+        CREATE TRIGGER scholarship_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, description, eligibility_criteria
+        ON scholarships_scholarship
+        FOR EACH ROW EXECUTE PROCEDURE scholarship_search_vector_update()
+        """
+    )
+    schema_editor.execute(
+        f"UPDATE scholarships_scholarship SET search_vector = {SEARCH_VECTOR_SQL.format(row='')}"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS scholarship_search_idx "
+        "ON scholarships_scholarship USING gin (search_vector)"
+    )
+
+
+def drop_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS scholarship_search_idx")
+    schema_editor.execute(
+        "DROP TRIGGER IF EXISTS scholarship_search_vector_trigger ON scholarships_scholarship"
+    )
+    schema_editor.execute("DROP FUNCTION IF EXISTS scholarship_search_vector_update()")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scholarships", "0004_scholarship_eligibility"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scholarship",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="scholarship",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        fields=["search_vector"], name="scholarship_search_idx"
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_search_trigger, drop_search_trigger),
+            ],
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.10 on 2026-10-18 20:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scholarships", "0005_scholarship_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScholarshipTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=64, unique=True)),
+                ("document_frequency", models.PositiveIntegerField()),
+                ("idf", models.FloatField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ScholarshipTermWeight",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("weight", models.FloatField()),
+                (
+                    "scholarship",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="term_weights",
+                        to="scholarships.scholarship",
+                    ),
+                ),
+                (
+                    "term",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="postings",
+                        to="scholarships.scholarshipterm",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("term", "scholarship")},
+            },
+        ),
+    ]
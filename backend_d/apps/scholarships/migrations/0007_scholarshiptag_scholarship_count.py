@@ -0,0 +1,38 @@
+# Generated by Django 4.2.10 on 2026-10-18 20:29
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_scholarships(apps, schema_editor):
+    ScholarshipTag = apps.get_model("scholarships", "ScholarshipTag")
+    Through = apps.get_model("scholarships", "Scholarship").tags.through
+    ScholarshipTag.objects.update(
+        scholarship_count=Coalesce(
+            Subquery(
+                Through.objects.filter(scholarshiptag_id=OuterRef("pk"))
+                .order_by()
+                .values("scholarshiptag_id")
+                .annotate(total=Count("*"))
+                .values("total")
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scholarships", "0006_scholarship_text_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scholarshiptag",
+            name="scholarship_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_scholarships, migrations.RunPython.noop),
+    ]
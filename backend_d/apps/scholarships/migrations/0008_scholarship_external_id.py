@@ -0,0 +1,18 @@
+# Generated by Django 4.2.10 on 2026-10-18 20:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scholarships", "0007_scholarshiptag_scholarship_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scholarship",
+            name="external_id",
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.10 on 2026-10-18 21:07
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def set_status(apps, schema_editor):
+    Scholarship = apps.get_model("scholarships", "Scholarship")
+    Scholarship.objects.filter(is_active=False).update(status="archived")
+    Scholarship.objects.filter(
+        is_active=True, deadline__lt=timezone.now().date()
+    ).update(status="expired")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scholarships", "0008_scholarship_external_id"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="scholarship",
+            name="scholarship_active_dl_idx",
+        ),
+        migrations.AddField(
+            model_name="scholarship",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("active", "Active"),
+                    ("expired", "Expired"),
+                    ("archived", "Archived"),
+                ],
+                default="active",
+                editable=False,
+                max_length=10,
+            ),
+        ),
+        migrations.RunPython(set_status, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="scholarship",
+            index=models.Index(
+                condition=models.Q(("status", "active")),
+                fields=["deadline"],
+                name="scholarship_live_dl_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="scholarship",
+            index=models.Index(
+                condition=models.Q(("status", "expired"), _negated=True),
+                fields=["-created_at"],
+                name="scholarship_unexpired_idx",
+            ),
+        ),
+    ]
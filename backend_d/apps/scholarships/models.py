@@ -1,21 +1,46 @@
 from django.db import models
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Upper
 from django.utils.text import slugify
 
 # Create your models here.
 
 class Scholarship(models.Model):
+    class Status(models.TextChoices):
+        ACTIVE = 'active', 'Active'
+        EXPIRED = 'expired', 'Expired'
+        ARCHIVED = 'archived', 'Archived'
+
     title = models.CharField(max_length=200)
     description = models.TextField()
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     deadline = models.DateField()
     eligibility_criteria = models.TextField()
     is_active = models.BooleanField(default=True)
+    # Derived from is_active and deadline on save; the expire_scholarships
+    # task flips rows whose deadline has passed
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.ACTIVE,
+        editable=False
+    )
     tags = models.ManyToManyField(
         'ScholarshipTag',
         related_name='scholarships'
     )
     education_level = models.CharField(max_length=50, blank=True)
     field_of_study = models.CharField(max_length=100, blank=True)
+    # Blank means open to applicants from any location
+    location = models.CharField(max_length=200, blank=True)
+    # Partner's id for the scholarship; the upsert key of bulk ingest
+    external_id = models.CharField(max_length=100, unique=True, null=True, blank=True)
+    # Weighted title (A), eligibility (B) and description (C) lexemes,
+    # maintained by a database trigger on Postgres
+    search_vector = SearchVectorField(null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -24,6 +49,31 @@ class Scholarship(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Scholarship'
         verbose_name_plural = 'Scholarships'
+        indexes = [
+            # Candidate set of the matcher and the matched feed: live rows only
+            models.Index(
+                fields=['deadline'],
+                name='scholarship_live_dl_idx',
+                condition=models.Q(status='active')
+            ),
+            # Default list, newest first, which hides expired rows
+            models.Index(
+                fields=['-created_at'],
+                name='scholarship_unexpired_idx',
+                condition=~models.Q(status='expired')
+            ),
+            # Hard eligibility constraints of the matcher
+            models.Index(fields=['education_level', 'amount'], name='scholarship_edu_amount_idx'),
+            models.Index(Upper('location'), name='scholarship_location_idx'),
+            # Created by a Postgres-only migration; serves TrigramSimilarity and %
+            GinIndex(
+                fields=['field_of_study'],
+                name='scholarship_field_trgm_idx',
+                opclasses=['gin_trgm_ops']
+            ),
+            # Created by a Postgres-only migration; serves ?search=
+            GinIndex(fields=['search_vector'], name='scholarship_search_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -34,6 +84,24 @@ class Scholarship(models.Model):
         from django.utils import timezone
         return self.deadline < timezone.now().date()
 
+    def compute_status(self, today=None):
+        """Lifecycle status implied by is_active and the deadline"""
+        from django.utils import timezone
+        if not self.is_active:
+            return self.Status.ARCHIVED
+        # Unsaved rows may still hold the deadline as a string
+        deadline = self._meta.get_field('deadline').to_python(self.deadline)
+        if deadline < (today or timezone.now().date()):
+            return self.Status.EXPIRED
+        return self.Status.ACTIVE
+
+    def save(self, *args, **kwargs):
+        self.status = self.compute_status()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'status'}
+        super().save(*args, **kwargs)
+
     @classmethod
     def get_by_tag(cls, tag_slug):
         """Get all scholarships for a specific tag"""
@@ -53,6 +121,9 @@ class ScholarshipTag(models.Model):
     name = models.CharField(max_length=255, unique=True)
     slug = models.SlugField(max_length=255, unique=True, blank=True)
     description = models.TextField(blank=True)
+    # Maintained by signals on tag membership and scholarship deletes,
+    # repaired by the reconcile_tag_counts task
+    scholarship_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -70,4 +141,96 @@ class ScholarshipTag(models.Model):
     
     def get_scholarships_count(self):
         """Get count of scholarships with this tag"""
-        return self.scholarships.count()
\ No newline at end of file
+        return self.scholarships.count()
+
+    @classmethod
+    def count_subquery(cls):
+        """Live number of scholarships with the outer tag"""
+        return Coalesce(Subquery(
+            Scholarship.tags.through.objects.filter(
+                scholarshiptag_id=OuterRef('pk')
+            ).order_by().values('scholarshiptag_id').annotate(
+                total=Count('*')
+            ).values('total')
+        ), 0)
+
+    @classmethod
+    def refresh_scholarship_counts(cls, tag_ids):
+        """Recount scholarship_count for the given tags"""
+        if not tag_ids:
+            return 0
+        return cls.objects.filter(pk__in=tag_ids).update(scholarship_count=cls.count_subquery())
+
+class UserScholarshipMatch(models.Model):
+    """Precomputed match scores for a (user, scholarship) pair.
+
+    Rows are refreshed incrementally by ``ScholarshipMatcher.refresh_match_scores``
+    whenever a profile or scholarship changes, so the matched feed can be read
+    with an index scan instead of re-scoring the catalog on every request.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='scholarship_matches'
+    )
+    scholarship = models.ForeignKey(
+        Scholarship,
+        on_delete=models.CASCADE,
+        related_name='user_matches'
+    )
+    tag_score = models.FloatField(default=0)
+    education_score = models.FloatField(default=0)
+    field_score = models.FloatField(default=0)
+    score = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = 'scholarships'
+        unique_together = ['user', 'scholarship']
+        indexes = [
+            models.Index(fields=['user', '-score'], name='user_match_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} -> {self.scholarship_id}: {self.score:.3f}"
+
+class ScholarshipTerm(models.Model):
+    """A term of the scholarship text index with its inverse document frequency.
+
+    Built offline by ``apps.scholarships.text.build_text_index``.
+    """
+    term = models.CharField(max_length=64, unique=True)
+    document_frequency = models.PositiveIntegerField()
+    idf = models.FloatField()
+
+    class Meta:
+        app_label = 'scholarships'
+
+    def __str__(self):
+        return self.term
+
+class ScholarshipTermWeight(models.Model):
+    """Posting of the inverted text index: the TF-IDF weight of a term in a
+    scholarship's L2-normalised vector.
+
+    Only each scholarship's strongest terms are kept, and the (term,
+    scholarship) unique index is the lookup path for scoring a profile.
+    """
+    term = models.ForeignKey(
+        ScholarshipTerm,
+        on_delete=models.CASCADE,
+        related_name='postings'
+    )
+    scholarship = models.ForeignKey(
+        Scholarship,
+        on_delete=models.CASCADE,
+        related_name='term_weights'
+    )
+    weight = models.FloatField()
+
+    class Meta:
+        app_label = 'scholarships'
+        unique_together = ['term', 'scholarship']
+
+    def __str__(self):
+        return f"{self.scholarship_id}/{self.term_id}: {self.weight:.3f}"
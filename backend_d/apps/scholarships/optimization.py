@@ -0,0 +1,106 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _concrete_fields(model, prefix=''):
+    return {f'{prefix}{field.name}' for field in model._meta.concrete_fields}
+
+
+def _plan(model, serializer, prefix=''):
+    """
+    Work out what a serializer reads from model.
+
+    Returns:
+        (select_related paths, prefetch_related lookups, only() fields). The
+        fields are None when a serializer field reads something other than a
+        model field and has not declared its dependencies in
+        Meta.field_dependencies.
+    """
+    select, prefetch, only = [], [], {f'{prefix}{model._meta.pk.name}'}
+    dependencies = getattr(getattr(serializer, 'Meta', None), 'field_dependencies', {})
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        source = field.source
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            if name not in dependencies:
+                only = None
+            elif only is not None:
+                only.update(f'{prefix}{dependency}' for dependency in dependencies[name])
+            continue
+
+        path = f'{prefix}{source}'
+        if model_field.many_to_many or model_field.one_to_many:
+            child = field.child if isinstance(field, serializers.ListSerializer) else None
+            if isinstance(child, serializers.ModelSerializer):
+                # A reverse foreign key prefetch matches rows on the foreign key
+                back_reference = [model_field.field.name] if model_field.one_to_many else []
+                queryset = optimize_for_serializer(
+                    model_field.related_model._default_manager.all(), child, back_reference
+                )
+                prefetch.append(Prefetch(path, queryset=queryset))
+            elif isinstance(getattr(field, 'child_relation', None), serializers.SlugRelatedField):
+                related = model_field.related_model
+                queryset = related._default_manager.only(related._meta.pk.name, field.child_relation.slug_field)
+                prefetch.append(Prefetch(path, queryset=queryset))
+            else:
+                prefetch.append(path)
+        elif model_field.is_relation and isinstance(field, serializers.ModelSerializer):
+            select.append(path)
+            child_select, child_prefetch, child_only = _plan(model_field.related_model, field, f'{path}__')
+            select.extend(child_select)
+            prefetch.extend(child_prefetch)
+            if only is not None:
+                only.add(path)
+                only.update(child_only or _concrete_fields(model_field.related_model, f'{path}__'))
+        elif only is not None:
+            only.add(path)
+
+    return select, prefetch, only
+
+
+def optimize_for_serializer(queryset, serializer, extra_fields=()):
+    """
+    Apply the select_related, prefetch_related and only() calls serializer
+    needs to render queryset without a query per row.
+
+    Args:
+        queryset: Queryset of the serializer's model
+        serializer: Serializer instance to read the fields from
+        extra_fields: Further model fields to load, e.g. ordering keys
+    """
+    select, prefetch, only = _plan(queryset.model, serializer)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    if only is not None:
+        model_fields = {field.name for field in queryset.model._meta.concrete_fields}
+        queryset = queryset.only(*only, *(field for field in extra_fields if field in model_fields))
+    return queryset
+
+
+class QuerysetOptimizationMixin:
+    """
+    Viewset mixin whose optimize_queryset() shapes the queryset for the
+    serializer of the current action. Call it at the end of get_queryset().
+
+    Only read requests are optimized; writes load whole rows as before.
+    """
+    # Actions that don't render the action's serializer
+    unoptimized_actions = ()
+    # Model fields read outside the serializer
+    always_load = ()
+
+    def optimize_queryset(self, queryset):
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in SAFE_METHODS or self.action in self.unoptimized_actions:
+            return queryset
+        serializer = self.get_serializer_class()(context=self.get_serializer_context())
+        ordering = getattr(self, 'ordering_fields', None) or []
+        return optimize_for_serializer(queryset, serializer, extra_fields=[*ordering, *self.always_load])
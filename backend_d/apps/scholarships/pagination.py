@@ -0,0 +1,244 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal, DecimalException
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError as InvalidQuery
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def planner_estimate(queryset):
+    """
+    Postgres' estimate of the rows in queryset: the table's reltuples when
+    unfiltered, otherwise the planner's row estimate. None when the table
+    has never been analyzed.
+    """
+    connection = connections[queryset.db]
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+            if row and row[0] >= 0:
+                return row[0]
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def estimate_count(queryset, threshold):
+    """
+    Count queryset without scanning past threshold rows.
+
+    Returns:
+        (count, is_estimate). Up to threshold rows the count is exact. Above
+        it the count is Postgres' estimate, never below threshold + 1, or
+        threshold + 1 on other databases.
+    """
+    capped = queryset.order_by()[:threshold + 1].count()
+    if capped <= threshold:
+        return capped, False
+    if connections[queryset.db].vendor != 'postgresql':
+        return capped, True
+    estimate = planner_estimate(queryset)
+    return max(estimate or 0, capped), True
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opt-in cursor pagination keyed on the queryset's own ordering.
+
+    Each page filters on the sort key of the previous page's last row instead
+    of using OFFSET, and no COUNT query is run, so deep pages cost the same as
+    the first one. The primary key is appended to the ordering so the key is
+    unique. Only plain field or annotation names are supported as sort keys.
+
+    Pagination is only applied when the request asks for it with
+    ``?pagination=cursor`` or passes a ``cursor``; other requests keep the
+    unpaginated response. ``?count=true`` adds the total, counted exactly up
+    to exact_count_threshold rows and estimated above it.
+    """
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    count_query_param = 'count'
+    exact_count_threshold = 1000
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = 'Invalid cursor'
+    invalid_ordering_message = 'Cursor pagination cannot order by {key}'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        self.key_fields = self.get_key_fields(queryset)
+        queryset = queryset.order_by(*self.ordering)
+        self.count = self.count_is_estimate = None
+        if request.query_params.get(self.count_query_param, '').lower() == 'true':
+            self.count, self.count_is_estimate = estimate_count(queryset, self.exact_count_threshold)
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            queryset = self.filter_after(queryset, encoded)
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        results = results[:self.page_size]
+        self.next_cursor = self.encode_cursor(results[-1]) if self.has_next else None
+        return results
+
+    def is_requested(self, request):
+        return (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == 'cursor'
+        )
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_ordering(self, queryset):
+        """
+        The queryset's ordering with the primary key appended as a tie-break
+        """
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        for key in ordering:
+            if not isinstance(key, str) or '__' in key or key.startswith('?'):
+                raise InvalidQuery({'ordering': [self.invalid_ordering_message.format(key=key)]})
+        fields = [key.lstrip('-') for key in ordering]
+        if 'id' not in fields and 'pk' not in fields:
+            ordering.append('id')
+        return ordering
+
+    def get_key_fields(self, queryset):
+        """
+        The model or annotation field behind each sort key, used to check
+        the values a cursor carries
+        """
+        fields = []
+        for key in self.ordering:
+            name = key.lstrip('-')
+            if name in queryset.query.annotations:
+                fields.append(queryset.query.annotations[name].output_field)
+                continue
+            try:
+                field = queryset.model._meta.pk if name == 'pk' else queryset.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                raise InvalidQuery({'ordering': [self.invalid_ordering_message.format(key=key)]})
+            fields.append(field)
+        return fields
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.mode_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        response = {
+            'next': self.get_next_link(),
+            'next_cursor': self.next_cursor,
+        }
+        if self.count is not None:
+            response['count'] = self.count
+            response['count_is_estimate'] = self.count_is_estimate
+        response['results'] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'next_cursor': {'type': 'string', 'nullable': True},
+                'count': {'type': 'integer'},
+                'count_is_estimate': {'type': 'boolean'},
+                'results': schema,
+            },
+        }
+
+    def _after(self, values):
+        """
+        Rows strictly after the given key in the current ordering:
+        (a < x) OR (a = x AND b < y) OR ... for descending keys
+        """
+        condition = Q()
+        equal = {}
+        for key, value in zip(self.ordering, values):
+            field = key.lstrip('-')
+            lookup = 'lt' if key.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{field}__{lookup}': value})
+            equal[field] = value
+        return condition
+
+    def encode_cursor(self, obj):
+        values = [self._encode_value(getattr(obj, key.lstrip('-'))) for key in self.ordering]
+        payload = json.dumps(values, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+    def filter_after(self, queryset, encoded):
+        """
+        Rows after the cursor. Cursors that don't decode to one valid,
+        non-null value per sort key answer 404 rather than reaching the
+        database.
+        """
+        try:
+            values = self.decode_cursor(encoded)
+            if len(values) != len(self.key_fields):
+                raise ValueError(values)
+            values = [field.to_python(value) for field, value in zip(self.key_fields, values)]
+            if any(value is None for value in values):
+                raise ValueError(values)
+            return queryset.filter(self._after(values))
+        except (TypeError, ValueError, DecimalException, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def decode_cursor(self, encoded):
+        """
+        The values of an encoded cursor; raises ValueError if it isn't one
+        """
+        padded = encoded + '=' * (-len(encoded) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list):
+            raise ValueError(values)
+        return [self._decode_value(value) for value in values]
+
+    @staticmethod
+    def _encode_value(value):
+        if isinstance(value, datetime):
+            return {'dt': value.isoformat()}
+        if isinstance(value, date):
+            return {'d': value.isoformat()}
+        if isinstance(value, Decimal):
+            return {'dec': str(value)}
+        return value
+
+    @staticmethod
+    def _decode_value(value):
+        if isinstance(value, dict):
+            if 'dt' in value:
+                return parse_datetime(value['dt'])
+            if 'd' in value:
+                return parse_date(value['d'])
+            if 'dec' in value:
+                return Decimal(value['dec'])
+            raise ValueError(value)
+        return value
@@ -1,18 +1,16 @@
 from rest_framework import serializers
+from apps.scholarships.fieldsets import SparseFieldsMixin
 from apps.scholarships.models import Scholarship, ScholarshipTag
 
 class ScholarshipTagSerializer(serializers.ModelSerializer):
-    scholarship_count = serializers.SerializerMethodField()
+    scholarship_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = ScholarshipTag
         fields = ['id', 'name', 'slug', 'description', 'created_at', 'scholarship_count']
         read_only_fields = ['slug', 'created_at', 'scholarship_count']
 
-    def get_scholarship_count(self, obj):
-        return obj.get_scholarships_count()
-
-class ScholarshipListSerializer(serializers.ModelSerializer):
+class ScholarshipListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     tags = ScholarshipTagSerializer(many=True, read_only=True)
     is_expired = serializers.BooleanField(read_only=True)
 
@@ -26,11 +24,21 @@ class ScholarshipListSerializer(serializers.ModelSerializer):
             'tags', 
             'is_active',
             'is_expired',
-            'created_at'
+            'created_at',
+            'description',
+            'eligibility_criteria'
         ]
         read_only_fields = ['created_at']
+        # Model fields read by non-field sources, for queryset optimization
+        field_dependencies = {'is_expired': ['deadline']}
+        # Sent only when named in ?expand=
+        expandable_fields = ['description', 'eligibility_criteria']
+        # Swapped in by ?compact=true
+        compact_fields = {
+            'tags': serializers.SlugRelatedField(many=True, read_only=True, slug_field='name')
+        }
 
-class ScholarshipDetailSerializer(serializers.ModelSerializer):
+class ScholarshipDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     tags = ScholarshipTagSerializer(many=True, read_only=True)
     tag_ids = serializers.PrimaryKeyRelatedField(
         many=True,
@@ -54,10 +62,13 @@ class ScholarshipDetailSerializer(serializers.ModelSerializer):
             'tag_ids',
             'is_active',
             'is_expired',
+            'status',
             'created_at',
             'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
+        field_dependencies = {'is_expired': ['deadline']}
+        compact_fields = ScholarshipListSerializer.Meta.compact_fields
 
     def validate_deadline(self, value):
         """Validate that deadline is not in the past"""
@@ -112,4 +123,33 @@ class ScholarshipUpdateSerializer(ScholarshipDetailSerializer):
         
         if tags is not None:
             instance.tags.set(tags)
-        return instance 
\ No newline at end of file
+        return instance
+
+class ScholarshipBulkItemSerializer(ScholarshipDetailSerializer):
+    """
+    One scholarship of a bulk ingest, keyed by the partner's external_id.
+    Tags are given by name and resolved for the whole batch at once.
+    """
+    tags = serializers.ListField(
+        child=serializers.CharField(max_length=255),
+        required=False
+    )
+
+    class Meta(ScholarshipDetailSerializer.Meta):
+        fields = [
+            'external_id',
+            'title',
+            'description',
+            'amount',
+            'deadline',
+            'eligibility_criteria',
+            'education_level',
+            'field_of_study',
+            'location',
+            'is_active',
+            'tags'
+        ]
+        extra_kwargs = {
+            # Existing ids are updated, so skip the per-item uniqueness query
+            'external_id': {'required': True, 'allow_null': False, 'validators': []}
+        }
@@ -0,0 +1,115 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+from apps.applications.models import Application
+from apps.users.models import UserProfile
+from .cards import reset_card_queue
+from .catalog import bump_catalog_version
+from .swipes import record_swipe
+from .models import Scholarship, ScholarshipTag
+from .tasks import refresh_user_matches, refresh_scholarship_matches
+
+@receiver(post_save, sender=UserProfile)
+def refresh_matches_for_profile(sender, instance, **kwargs):
+    """
+    Queue a rebuild of the user's stored matches once the profile is committed.
+    Saves that leave the match version alone keep the current ranking.
+    """
+    if not getattr(instance, 'match_version_changed', True):
+        return
+    user_id = instance.user_id
+    transaction.on_commit(lambda: reset_card_queue(user_id))
+    transaction.on_commit(lambda: refresh_user_matches.delay(user_id))
+
+@receiver(post_save, sender=Scholarship)
+def refresh_matches_for_scholarship(sender, instance, **kwargs):
+    """Queue a rescore of the scholarship once it is committed"""
+    transaction.on_commit(lambda: refresh_scholarship_matches.delay(instance.pk))
+
+@receiver(m2m_changed, sender=Scholarship.tags.through)
+def refresh_matches_for_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    """Tag changes alter tag scores, so touch and rescore the affected scholarships"""
+    if action == 'pre_clear' and reverse:
+        # pk_set is empty on clear, so remember which scholarships lose the tag
+        instance._cleared_scholarship_ids = list(
+            instance.scholarships.values_list('id', flat=True)
+        )
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        scholarship_ids = [instance.pk]
+    elif action == 'post_clear':
+        scholarship_ids = getattr(instance, '_cleared_scholarship_ids', [])
+    else:
+        scholarship_ids = list(pk_set or [])
+    # updated_at versions cached match explanations
+    Scholarship.objects.filter(pk__in=scholarship_ids).update(updated_at=timezone.now())
+    for scholarship_id in scholarship_ids:
+        transaction.on_commit(
+            lambda scholarship_id=scholarship_id: refresh_scholarship_matches.delay(scholarship_id)
+        )
+
+@receiver(m2m_changed, sender=Scholarship.tags.through)
+def count_tag_scholarships(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep ScholarshipTag.scholarship_count in step with tag membership"""
+    if action == 'pre_clear' and not reverse:
+        # pk_set is empty on clear, so remember which tags lose the scholarship
+        instance._cleared_tag_ids = list(instance.tags.values_list('id', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        tag_ids = [instance.pk]
+    elif action == 'post_clear':
+        tag_ids = getattr(instance, '_cleared_tag_ids', [])
+    else:
+        tag_ids = list(pk_set or [])
+    ScholarshipTag.refresh_scholarship_counts(tag_ids)
+
+@receiver(pre_delete, sender=Scholarship)
+def remember_scholarship_tags(sender, instance, **kwargs):
+    """The cascade removes tag links without m2m_changed"""
+    instance._deleted_tag_ids = list(instance.tags.values_list('id', flat=True))
+
+@receiver(post_delete, sender=Scholarship)
+def count_tags_after_delete(sender, instance, **kwargs):
+    ScholarshipTag.refresh_scholarship_counts(getattr(instance, '_deleted_tag_ids', []))
+
+@receiver(post_save, sender=Scholarship)
+@receiver(post_delete, sender=Scholarship)
+@receiver(post_save, sender=ScholarshipTag)
+@receiver(post_delete, sender=ScholarshipTag)
+def bump_version_on_catalog_change(sender, **kwargs):
+    """Tell in-memory catalog copies to reload"""
+    transaction.on_commit(bump_catalog_version)
+
+@receiver(m2m_changed, sender=Scholarship.tags.through)
+def bump_version_on_tag_change(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        transaction.on_commit(bump_catalog_version)
+
+@receiver(connection_created)
+def set_trigram_threshold(sender, connection, **kwargs):
+    """Use the configured threshold for the pg_trgm % operator"""
+    threshold = getattr(settings, 'SCHOLARSHIP_TRIGRAM_THRESHOLD', None)
+    if threshold is None or connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('SET pg_trgm.similarity_threshold = %s', [threshold])
+
+@receiver(post_save, sender=Application)
+def cache_swipe(sender, instance, **kwargs):
+    """Keep the user's swiped-id set in step with swipes"""
+    transaction.on_commit(
+        lambda: record_swipe(instance.user_id, instance.scholarship_id, instance.swipe_status)
+    )
+
+@receiver(post_delete, sender=Application)
+def uncache_swipe(sender, instance, **kwargs):
+    transaction.on_commit(
+        lambda: record_swipe(instance.user_id, instance.scholarship_id, None)
+    )
@@ -0,0 +1,116 @@
+import logging
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from redis.exceptions import RedisError
+from apps.applications.models import Application
+
+logger = logging.getLogger(__name__)
+
+# Swipes that hide a scholarship from the user's feed
+EXCLUDED_SWIPES = ('left', 'right')
+
+SWIPED_KEY = 'scholarships:swiped:{user_id}'
+SWIPED_TTL = 60 * 60 * 24 * 7
+
+# Scholarship ids start at 1, so 0 marks a set loaded from the database.
+# Redis drops empty sets, and a set written to after it expired lacks the
+# marker, so either case is treated as a miss.
+LOADED_MARKER = 0
+
+
+def swipe_cache_enabled() -> bool:
+    return getattr(settings, 'SCHOLARSHIP_SWIPE_CACHE', False)
+
+
+def get_redis():
+    from django_redis import get_redis_connection
+    return get_redis_connection('default')
+
+
+def load_swiped_ids(user_id: int) -> set:
+    """
+    Swiped scholarship ids from the applications table
+    """
+    return set(
+        Application.objects.filter(
+            user_id=user_id,
+            swipe_status__in=EXCLUDED_SWIPES
+        ).values_list('scholarship_id', flat=True)
+    )
+
+
+def get_swiped_ids(user_id: int):
+    """
+    Ids of the scholarships the user swiped away, read from Redis.
+
+    Returns:
+        Set of scholarship ids, or None when the cache is disabled or
+        unreachable and the caller should query the applications table
+    """
+    if not swipe_cache_enabled():
+        return None
+    key = SWIPED_KEY.format(user_id=user_id)
+    try:
+        client = get_redis()
+        members = {int(member) for member in client.smembers(key)}
+        if LOADED_MARKER in members:
+            members.discard(LOADED_MARKER)
+            return members
+
+        swiped_ids = load_swiped_ids(user_id)
+        pipeline = client.pipeline()
+        pipeline.delete(key)
+        pipeline.sadd(key, LOADED_MARKER, *swiped_ids)
+        pipeline.expire(key, SWIPED_TTL)
+        pipeline.execute()
+        return swiped_ids
+    except RedisError:
+        logger.warning("Swiped-id cache unavailable for user %s", user_id, exc_info=True)
+        return None
+
+
+def exclude_swiped(queryset, user_id: int):
+    """
+    Drop the scholarships the user swiped away from queryset
+    """
+    swiped_ids = get_swiped_ids(user_id)
+    if swiped_ids is not None:
+        return queryset.exclude(id__in=swiped_ids)
+    # NOT EXISTS anti-join, answered from the (user, scholarship) index
+    return queryset.filter(~Exists(
+        Application.objects.filter(
+            user_id=user_id,
+            scholarship=OuterRef('pk'),
+            swipe_status__in=EXCLUDED_SWIPES
+        )
+    ))
+
+
+def record_swipe(user_id: int, scholarship_id: int, swipe_status: str):
+    """
+    Add or remove a scholarship from the user's cached swiped set
+    """
+    if not swipe_cache_enabled():
+        return
+    key = SWIPED_KEY.format(user_id=user_id)
+    try:
+        client = get_redis()
+        if swipe_status in EXCLUDED_SWIPES:
+            client.sadd(key, scholarship_id)
+        else:
+            client.srem(key, scholarship_id)
+    except RedisError:
+        # The stale set would hide or show the wrong cards; drop it instead
+        forget_swipes(user_id)
+
+
+def forget_swipes(user_id: int):
+    """
+    Drop the user's cached set so the next read reloads it
+    """
+    if not swipe_cache_enabled():
+        return
+    try:
+        get_redis().delete(SWIPED_KEY.format(user_id=user_id))
+    except RedisError:
+        logger.warning("Could not drop swiped-id cache for user %s", user_id, exc_info=True)
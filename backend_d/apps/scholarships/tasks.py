@@ -0,0 +1,123 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+logger = get_task_logger(__name__)
+
+@shared_task(
+    bind=True,
+    retry_backoff=True,
+    max_retries=3,
+    name='scholarships.refresh_user_matches'
+)
+def refresh_user_matches(self, user_id):
+    """Rebuild stored match scores after a profile change"""
+    from .cards import card_queue_enabled, schedule_refill
+    from .matching import refresh_user_matches as refresh
+    try:
+        written = refresh(user_id)
+        logger.info(f"Refreshed {written} matches for user {user_id}")
+        if card_queue_enabled():
+            schedule_refill(user_id)
+    except Exception as exc:
+        logger.error(f"Failed to refresh matches for user {user_id}: {exc}")
+        self.retry(exc=exc)
+
+@shared_task(
+    bind=True,
+    retry_backoff=True,
+    max_retries=3,
+    name='scholarships.refresh_scholarship_matches'
+)
+def refresh_scholarship_matches(self, scholarship_id):
+    """Rescore a changed scholarship for every student"""
+    from .matching import refresh_scholarship_matches as refresh
+    try:
+        written = refresh(scholarship_id)
+        logger.info(f"Refreshed {written} matches for scholarship {scholarship_id}")
+    except Exception as exc:
+        logger.error(f"Failed to refresh matches for scholarship {scholarship_id}: {exc}")
+        self.retry(exc=exc)
+
+@shared_task(
+    bind=True,
+    retry_backoff=True,
+    max_retries=3,
+    name='scholarships.refresh_matches_for_scholarships'
+)
+def refresh_matches_for_scholarships(self, scholarship_ids):
+    """Rescore a batch of ingested scholarships for every student"""
+    from .matching import refresh_matches_for_scholarships as refresh
+    try:
+        written = refresh(scholarship_ids)
+        logger.info(f"Refreshed {written} matches for {len(scholarship_ids)} scholarships")
+    except Exception as exc:
+        logger.error(f"Failed to refresh matches for {len(scholarship_ids)} scholarships: {exc}")
+        self.retry(exc=exc)
+
+@shared_task(
+    bind=True,
+    retry_backoff=True,
+    max_retries=3,
+    name='scholarships.refill_card_queue'
+)
+def refill_card_queue(self, user_id):
+    """Top up the user's queue of ranked cards"""
+    from .cards import fill_card_queue
+    try:
+        queued = fill_card_queue(user_id)
+        logger.info(f"Queued {queued} cards for user {user_id}")
+    except Exception as exc:
+        logger.error(f"Failed to refill card queue for user {user_id}: {exc}")
+        self.retry(exc=exc)
+
+@shared_task(
+    bind=True,
+    retry_backoff=True,
+    max_retries=3,
+    name='scholarships.build_text_index'
+)
+def build_text_index(self):
+    """Rebuild the TF-IDF index of scholarship text"""
+    from .text import build_text_index as build
+    try:
+        counts = build()
+        logger.info(
+            f"Indexed {counts['documents']} scholarships: "
+            f"{counts['terms']} terms, {counts['postings']} postings"
+        )
+    except Exception as exc:
+        logger.error(f"Failed to build scholarship text index: {exc}")
+        self.retry(exc=exc)
+
+@shared_task(name='scholarships.expire_scholarships')
+def expire_scholarships():
+    """Flip live scholarships whose deadline has passed to expired"""
+    from django.utils import timezone
+    from .models import Scholarship
+    # Bumping updated_at re-versions cached fragments and conditional GETs
+    expired = Scholarship.objects.filter(
+        status=Scholarship.Status.ACTIVE,
+        deadline__lt=timezone.now().date()
+    ).update(status=Scholarship.Status.EXPIRED, updated_at=timezone.now())
+    if expired:
+        from .catalog import bump_catalog_version
+        bump_catalog_version()
+        logger.info(f"Expired {expired} scholarships")
+    return expired
+
+@shared_task(name='scholarships.reconcile_tag_counts')
+def reconcile_tag_counts():
+    """Repair tag scholarship counts that drifted from the tag links"""
+    from django.db.models import F
+    from .models import ScholarshipTag
+    drifted = list(
+        ScholarshipTag.objects.annotate(
+            actual=ScholarshipTag.count_subquery()
+        ).exclude(scholarship_count=F('actual')).values_list('id', flat=True)
+    )
+    ScholarshipTag.refresh_scholarship_counts(drifted)
+    if drifted:
+        from .catalog import bump_catalog_version
+        bump_catalog_version()
+        logger.warning(f"Repaired scholarship counts of {len(drifted)} tags")
+    return len(drifted)
@@ -17,6 +17,23 @@ def scholarship_tag():
         description='Engineering scholarships'
     )
 
+@pytest.fixture
+def scholarship_factory():
+    """Creates open scholarships; tests pass only the fields they care about"""
+    def create(title='Test Scholarship', tags=(), **fields):
+        defaults = {
+            'description': 'Test Description',
+            'amount': 3000,
+            'deadline': timezone.now().date() + timedelta(days=30),
+            'eligibility_criteria': 'Test Criteria',
+            'is_active': True,
+        }
+        scholarship = Scholarship.objects.create(title=title, **{**defaults, **fields})
+        if tags:
+            scholarship.tags.add(*tags)
+        return scholarship
+    return create
+
 @pytest.fixture
 def active_scholarship(scholarship_tag):
     scholarship = Scholarship.objects.create(
@@ -61,4 +78,64 @@ def test_user(django_user_model):
 def disable_throttling(settings):
     """Disable throttling for all tests"""
     settings.REST_FRAMEWORK['DEFAULT_THROTTLE_CLASSES'] = []
-    settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] = {} 
\ No newline at end of file
+    settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] = {} 
+
+class FakeRedis:
+    """Just enough of the redis client for the swiped-id sets and card queues"""
+
+    def __init__(self):
+        self.data = {}
+
+    def smembers(self, key):
+        return {str(member).encode() for member in self.data.get(key, set())}
+
+    def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+
+    def srem(self, key, *members):
+        self.data.get(key, set()).difference_update(members)
+
+    def rpush(self, key, *values):
+        self.data.setdefault(key, []).extend(values)
+
+    def lpop(self, key, count=None):
+        values = self.data.get(key)
+        if not values:
+            return None
+        popped, self.data[key] = values[:count or 1], values[count or 1:]
+        popped = [str(value).encode() for value in popped]
+        return popped if count else popped[0]
+
+    def llen(self, key):
+        return len(self.data.get(key, []))
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def expire(self, key, seconds):
+        pass
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.calls.append((name, args))
+            return self
+        return queue
+
+    def execute(self):
+        results = [getattr(self.client, name)(*args) for name, args in self.calls]
+        self.calls = []
+        return results
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = FakeRedis()
+    monkeypatch.setattr('apps.scholarships.swipes.get_redis', lambda: client)
+    return client
@@ -0,0 +1,107 @@
+import json
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from apps.applications.models import Application
+from apps.scholarships.management.commands.benchmark_endpoints import percentile
+from apps.scholarships.models import Scholarship, ScholarshipTag
+from apps.users.models import UserProfile
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+SMALL_SCALE = ['--scholarships', '30', '--tags', '8', '--users', '3', '--applications', '20']
+
+def snapshot():
+    return (
+        list(Scholarship.objects.order_by('title').values_list(
+            'title', 'amount', 'education_level', 'field_of_study', 'location'
+        )),
+        sorted(Scholarship.tags.through.objects.values_list('scholarship__title', 'scholarshiptag__name')),
+        list(UserProfile.objects.filter(
+            user__username__startswith='synthetic-'
+        ).order_by('user__username').values_list('interests', 'education_level', 'location')),
+        sorted(Application.objects.values_list('user__username', 'scholarship__title', 'swipe_status')),
+    )
+
+class TestGenerateSyntheticData:
+    def test_creates_requested_scale(self):
+        call_command('generate_synthetic_data', *SMALL_SCALE)
+
+        assert ScholarshipTag.objects.filter(name__startswith='synthetic-').count() == 8
+        assert Scholarship.objects.filter(title__startswith='synthetic ').count() == 30
+        assert User.objects.filter(username__startswith='synthetic-').count() == 3
+        assert UserProfile.objects.filter(user__username__startswith='synthetic-').count() == 3
+        assert Application.objects.count() == 20
+
+    def test_same_seed_recreates_same_data(self):
+        call_command('generate_synthetic_data', *SMALL_SCALE)
+        first = snapshot()
+
+        call_command('generate_synthetic_data', *SMALL_SCALE, '--clear')
+
+        assert snapshot() == first
+        assert Scholarship.objects.count() == 30
+
+class TestBenchmarkEndpoints:
+    def test_percentile_uses_nearest_rank(self):
+        values = list(range(1, 21))
+        assert percentile(values, 50) == 10
+        assert percentile(values, 95) == 19
+        assert percentile([], 50) is None
+
+    def test_writes_results_per_endpoint(self, tmp_path):
+        call_command('generate_synthetic_data', *SMALL_SCALE)
+        output = tmp_path / 'results.json'
+
+        call_command(
+            'benchmark_endpoints', '--iterations', '3', '--warmup', '1',
+            '--label', 'test', '--output', str(output)
+        )
+
+        report = json.loads(output.read_text())
+        assert report['label'] == 'test'
+        assert report['scale']['scholarships'] == 30
+        assert set(report['endpoints']) == {
+            'matched', 'scholarship_list', 'scholarship_search', 'application_stats', 'swipe'
+        }
+        for result in report['endpoints'].values():
+            assert result['iterations'] == 3
+            assert result['errors'] == 0
+            assert result['p50_ms'] <= result['p95_ms']
+            assert result['queries_p50'] > 0
+
+    def test_rejects_zero_iterations(self):
+        with pytest.raises(CommandError, match='--iterations'):
+            call_command('benchmark_endpoints', '--iterations', '0')
+
+    def test_compares_with_earlier_run(self, tmp_path, capsys):
+        call_command('generate_synthetic_data', *SMALL_SCALE)
+        baseline = tmp_path / 'baseline.json'
+        call_command(
+            'benchmark_endpoints', '--iterations', '2', '--endpoints', 'matched',
+            '--label', 'before', '--output', str(baseline)
+        )
+
+        call_command(
+            'benchmark_endpoints', '--iterations', '2', '--endpoints', 'matched',
+            '--output', str(tmp_path / 'after.json'), '--compare', str(baseline)
+        )
+
+        assert 'Compared with before' in capsys.readouterr().err
+
+class TestBenchmarkRenderers:
+    def test_reports_time_and_size_per_renderer(self, tmp_path):
+        call_command('generate_synthetic_data', *SMALL_SCALE)
+        output = tmp_path / 'renderers.json'
+
+        call_command('benchmark_renderers', '--iterations', '2', '--label', 'test', '--output', str(output))
+
+        report = json.loads(output.read_text())
+        assert set(report['payloads']) == {'scholarship_list', 'applications_applied'}
+        for results in report['payloads'].values():
+            assert set(results) == {'json', 'orjson'}
+            # Both renderers produce the same document
+            assert results['json']['bytes'] == results['orjson']['bytes']
+            assert results['json']['bytes']['gzip'] < results['json']['bytes']['raw']
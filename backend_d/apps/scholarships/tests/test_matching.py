@@ -1,7 +1,19 @@
 import pytest
 from django.utils import timezone
-from apps.scholarships.matching import ScholarshipMatcher
-from apps.scholarships.models import Scholarship, ScholarshipTag
+from apps.scholarships.matching import (
+    SCORE_COMPONENTS,
+    ScholarshipMatcher,
+    daily_tiebreak_seed,
+    refresh_matches_for_scholarships,
+    refresh_scholarship_matches,
+    score_component,
+    tiebreak_value
+)
+from django.db.models import FloatField, Value
+from apps.scholarships.models import (
+    Scholarship, ScholarshipTag, ScholarshipTerm, ScholarshipTermWeight, UserScholarshipMatch
+)
+from apps.scholarships.text import MAX_TERM_LENGTH, build_text_index, profile_vector, tokenize
 from apps.users.models import UserProfile
 from django.test import TestCase
 
@@ -188,4 +200,387 @@ class TestScholarshipMatcher:
             page=1,
             page_size=5
         ))
-        assert len(custom_page) == 5 
\ No newline at end of file
+        assert len(custom_page) == 5 
+class TestSeededTiebreak:
+    @pytest.fixture
+    def scholarships(self, scholarship_factory):
+        return [scholarship_factory(f'Scholarship {i}') for i in range(12)]
+
+    def test_ranking_is_stable(self, test_user, scholarships):
+        matcher = ScholarshipMatcher(test_user.profile)
+        first = [s.id for s in matcher._apply_matching_criteria(Scholarship.objects.all())]
+        second = [s.id for s in matcher._apply_matching_criteria(Scholarship.objects.all())]
+        assert first == second
+
+    def test_pages_do_not_overlap(self, test_user, scholarships):
+        matcher = ScholarshipMatcher(test_user.profile)
+        page_1 = [s.id for s in matcher.get_matched_scholarships(Scholarship.objects.all(), page=1, page_size=5)]
+        page_2 = [s.id for s in matcher.get_matched_scholarships(Scholarship.objects.all(), page=2, page_size=5)]
+        page_3 = [s.id for s in matcher.get_matched_scholarships(Scholarship.objects.all(), page=3, page_size=5)]
+        assert sorted(page_1 + page_2 + page_3) == sorted(s.id for s in scholarships)
+
+    def test_seed_changes_daily(self):
+        today = timezone.now().date()
+        assert daily_tiebreak_seed(1, today) == daily_tiebreak_seed(1, today)
+        assert daily_tiebreak_seed(1, today) != daily_tiebreak_seed(1, today + timezone.timedelta(days=1))
+        assert daily_tiebreak_seed(1, today) != daily_tiebreak_seed(2, today)
+
+    def test_orders_differ_beyond_rotation(self):
+        today = timezone.now().date()
+        ids = range(1, 51)
+
+        def order(user_id, day):
+            seed = daily_tiebreak_seed(user_id, day)
+            return sorted(ids, key=lambda pk: tiebreak_value(pk, *seed))
+
+        def neighbours(ranking):
+            # Cyclic successor pairs survive any rotation of the order
+            return {(a, b) for a, b in zip(ranking, ranking[1:] + ranking[:1])}
+
+        base = order(1, today)
+        for other in (order(2, today), order(1, today + timezone.timedelta(days=1))):
+            assert other != base
+            assert len(neighbours(base) & neighbours(other)) < len(ids) // 2
+
+class TestTagOverlap:
+    def test_one_row_per_scholarship(self, test_user):
+        profile = test_user.profile
+        profile.interests = ['Engineering', 'Technology', 'Math']
+        profile.save()
+
+        tags = [ScholarshipTag.objects.create(name=name) for name in ['Engineering', 'Technology', 'Art']]
+        scholarship = Scholarship.objects.create(
+            title='Multi Tag',
+            description='Test Description',
+            amount=3000.00,
+            deadline=timezone.now().date() + timezone.timedelta(days=30),
+            eligibility_criteria='Test Criteria',
+            is_active=True
+        )
+        scholarship.tags.add(*tags)
+
+        matcher = ScholarshipMatcher(profile)
+        matched = list(matcher.get_matched_scholarships(Scholarship.objects.all()))
+
+        assert [s.id for s in matched] == [scholarship.id]
+
+    def test_score_is_fraction_of_interests(self, test_user):
+        profile = test_user.profile
+        profile.interests = ['Engineering', 'Technology', 'Math', 'Art']
+        profile.save()
+
+        scholarship = Scholarship.objects.create(
+            title='Half Match',
+            description='Test Description',
+            amount=3000.00,
+            deadline=timezone.now().date() + timezone.timedelta(days=30),
+            eligibility_criteria='Test Criteria',
+            is_active=True
+        )
+        scholarship.tags.add(
+            ScholarshipTag.objects.create(name='Engineering'),
+            ScholarshipTag.objects.create(name='Math'),
+            ScholarshipTag.objects.create(name='History')
+        )
+
+        components = ScholarshipMatcher(profile)._score_components(Scholarship.objects.all())
+
+        assert components[scholarship.id]['tag'] == pytest.approx(0.5)
+
+class TestStoredMatches:
+    @pytest.fixture
+    def profile(self, test_user):
+        profile = test_user.profile
+        profile.interests = ['Engineering']
+        profile.education_level = 'undergraduate'
+        profile.field_of_study = 'Computer Science'
+        profile.save()
+        return profile
+
+    def test_refresh_stores_component_scores(self, profile, scholarship_factory):
+        eng_tag = ScholarshipTag.objects.create(name='Engineering')
+        art_tag = ScholarshipTag.objects.create(name='Art')
+        perfect = scholarship_factory(
+            'Perfect Match',
+            education_level='undergraduate',
+            field_of_study='Computer Science'
+        )
+        perfect.tags.add(eng_tag, art_tag)
+        poor = scholarship_factory('Poor Match', field_of_study='Fine Arts')
+        poor.tags.add(art_tag)
+
+        written = ScholarshipMatcher(profile).refresh_match_scores()
+
+        assert written == 2
+        stored = {m.scholarship_id: m for m in UserScholarshipMatch.objects.filter(user=profile.user)}
+        assert stored[perfect.id].tag_score == 1.0
+        assert stored[perfect.id].education_score == 1.0
+        assert stored[perfect.id].field_score == pytest.approx(1.0)
+        assert stored[perfect.id].score == pytest.approx(0.9)
+        assert stored[poor.id].tag_score == 0.0
+        assert stored[poor.id].score < stored[perfect.id].score
+
+    def test_refresh_drops_expired_scholarships(self, profile, scholarship_factory):
+        scholarship = scholarship_factory('Closing Soon')
+        matcher = ScholarshipMatcher(profile)
+        matcher.refresh_match_scores()
+        assert UserScholarshipMatch.objects.filter(scholarship=scholarship).exists()
+
+        scholarship.deadline = timezone.now().date() - timezone.timedelta(days=1)
+        scholarship.save()
+        matcher.refresh_match_scores([scholarship.id])
+
+        assert not UserScholarshipMatch.objects.filter(scholarship=scholarship).exists()
+
+    def test_stored_matches_ordered_by_score(self, profile, scholarship_factory):
+        poor = scholarship_factory('Poor Match', education_level='')
+        good = scholarship_factory('Good Match', education_level='undergraduate')
+
+        matcher = ScholarshipMatcher(profile)
+        matched = list(matcher.get_stored_matches(Scholarship.objects.all()))
+
+        assert [s.id for s in matched] == [good.id, poor.id]
+        assert matched[0].match_score > matched[1].match_score
+
+    def test_refresh_scholarship_matches(self, profile, scholarship_factory):
+        scholarship = scholarship_factory('New Scholarship', education_level='undergraduate')
+
+        refresh_scholarship_matches(scholarship.id)
+
+        match = UserScholarshipMatch.objects.get(user=profile.user, scholarship=scholarship)
+        assert match.education_score == 1.0
+
+    def test_rescoring_scholarships_batches_students(self, profile, django_user_model, scholarship_factory):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        scholarship = scholarship_factory('New Scholarship', education_level='undergraduate')
+
+        def queries():
+            with CaptureQueriesContext(connection) as context:
+                refresh_matches_for_scholarships([scholarship.id])
+            return len(context)
+
+        before = queries()
+        for i in range(3):
+            django_user_model.objects.create_user(
+                username=f'student{i}', password='testpass123', firebase_uid=f'student{i}'
+            )
+        assert queries() == before
+        assert UserScholarshipMatch.objects.filter(scholarship=scholarship).count() == 4
+        match = UserScholarshipMatch.objects.get(user=profile.user, scholarship=scholarship)
+        assert match.education_score == 1.0
+
+    def test_rescoring_drops_ineligible_pairs(self, profile, scholarship_factory):
+        scholarship = scholarship_factory('Graduate Only', education_level='undergraduate')
+        refresh_matches_for_scholarships([scholarship.id])
+        assert UserScholarshipMatch.objects.filter(user=profile.user, scholarship=scholarship).exists()
+
+        scholarship.education_level = 'graduate'
+        scholarship.save()
+        refresh_matches_for_scholarships([scholarship.id], chunk_size=1)
+
+        assert not UserScholarshipMatch.objects.filter(user=profile.user, scholarship=scholarship).exists()
+
+class TestEligibility:
+    @pytest.fixture
+    def profile(self, test_user):
+        profile = test_user.profile
+        profile.interests = ['Engineering']
+        profile.education_level = 'undergraduate'
+        profile.location = 'Texas'
+        profile.min_amount = 1000
+        profile.max_amount = 5000
+        profile.save()
+        return profile
+
+    @pytest.fixture
+    def scholarships(self, scholarship_factory):
+        return {
+            'open': scholarship_factory('Open'),
+            'same_level': scholarship_factory('Same Level', education_level='undergraduate'),
+            'other_level': scholarship_factory('Other Level', education_level='graduate'),
+            'too_small': scholarship_factory('Too Small', amount=500.00),
+            'too_large': scholarship_factory('Too Large', amount=10000.00),
+            'same_location': scholarship_factory('Same Location', location='texas'),
+            'other_location': scholarship_factory('Other Location', location='Ohio'),
+        }
+
+    def test_prunes_before_scoring(self, profile, scholarships):
+        matched = ScholarshipMatcher(profile).get_matched_scholarships(
+            Scholarship.objects.all(), page_size=100
+        )
+        assert {s.title for s in matched} == {'Open', 'Same Level', 'Same Location'}
+
+    def test_unset_constraints_do_not_filter(self, test_user, scholarships):
+        matched = ScholarshipMatcher(test_user.profile).get_matched_scholarships(
+            Scholarship.objects.all(), page_size=100
+        )
+        assert len(matched) == len(scholarships)
+
+    def test_report_counts_pruned(self, profile, scholarships):
+        report = ScholarshipMatcher(profile).eligibility_report(Scholarship.objects.all())
+        assert report == {'candidates': 7, 'eligible': 3, 'pruned': 4}
+
+    def test_refresh_skips_ineligible(self, profile, scholarships):
+        ScholarshipMatcher(profile).refresh_match_scores()
+        stored = set(
+            UserScholarshipMatch.objects.filter(user=profile.user).values_list('scholarship__title', flat=True)
+        )
+        assert stored == {'Open', 'Same Level', 'Same Location'}
+
+class TestScoreComponents:
+    def test_builtin_components(self):
+        assert {'tag', 'education', 'field', 'random', 'amount', 'location', 'text'} <= set(SCORE_COMPONENTS)
+
+    def test_zero_weight_components_are_skipped(self, test_user):
+        names = [c.name for c in ScholarshipMatcher(test_user.profile).active_components()]
+        assert 'amount' not in names and 'location' not in names
+        assert names == sorted(names, key=lambda name: SCORE_COMPONENTS[name].cost)
+
+    def test_amount_and_location_weights(self, test_user, scholarship_factory):
+        profile = test_user.profile
+        profile.location = 'Texas'
+        profile.max_amount = 10000
+        profile.save()
+        small_local = scholarship_factory('Small Local', amount=1000.00, location='TEXAS')
+        large_open = scholarship_factory('Large Open', amount=10000.00)
+
+        by_amount = ScholarshipMatcher(profile, {'amount_match': 1.0, 'random_factor': 0.0})
+        by_location = ScholarshipMatcher(profile, {'location_match': 1.0, 'random_factor': 0.0})
+
+        assert [s.id for s in by_amount.get_matched_scholarships(Scholarship.objects.all())] == [
+            large_open.id, small_local.id
+        ]
+        assert [s.id for s in by_location.get_matched_scholarships(Scholarship.objects.all())] == [
+            small_local.id, large_open.id
+        ]
+        components = by_amount._score_components(Scholarship.objects.all())
+        assert components[small_local.id]['amount'] == pytest.approx(0.1)
+
+    def test_custom_component(self, test_user, monkeypatch, scholarship_factory):
+        monkeypatch.setattr('apps.scholarships.matching.SCORE_COMPONENTS', dict(SCORE_COMPONENTS))
+        score_component('constant', weight='constant_match', cost=0)(
+            lambda matcher: Value(1.0, output_field=FloatField())
+        )
+        scholarship = scholarship_factory('Any')
+
+        matcher = ScholarshipMatcher(test_user.profile, {'constant_match': 0.5, 'random_factor': 0.0})
+        matcher.refresh_match_scores()
+
+        assert UserScholarshipMatch.objects.get(scholarship=scholarship).score == pytest.approx(0.5)
+
+
+class TestTextMatch:
+    @pytest.fixture
+    def catalog(self, scholarship_factory):
+        def create(title, description, criteria='Open to all students'):
+            return scholarship_factory(title, description=description, eligibility_criteria=criteria)
+
+        return {
+            'marine': create('Ocean', 'Marine biology research on coral reefs and ocean ecosystems'),
+            'nursing': create('Care', 'Nursing students pursuing careers in pediatric healthcare'),
+            'music': create('Music', 'Jazz and classical music performance', 'Audition required'),
+        }
+
+    @pytest.fixture
+    def profile(self, test_user):
+        profile = test_user.profile
+        profile.career_goals = 'I want to research coral reefs as a marine biologist'
+        profile.bio = 'Diver who loves the ocean'
+        profile.skills = ['biology', 'scuba']
+        profile.save()
+        return profile
+
+    def test_tokenize_drops_stopwords_and_short_words(self):
+        assert tokenize('The AI of marine-biology, 2024!') == ['marine', 'biology']
+
+    def test_tokenize_drops_words_longer_than_terms(self):
+        longest = 'a' * MAX_TERM_LENGTH
+        assert tokenize(f'{longest} {longest}b marine') == [longest, 'marine']
+
+    def test_index_skips_long_words(self, catalog):
+        catalog['music'].description += ' ' + 'x' * (MAX_TERM_LENGTH + 1)
+        catalog['music'].save()
+
+        build_text_index()
+
+        assert not ScholarshipTerm.objects.filter(term__startswith='xxx').exists()
+
+    def test_index_stores_unit_vectors(self, catalog):
+        counts = build_text_index()
+
+        assert counts['documents'] == 3
+        assert ScholarshipTerm.objects.get(term='students').document_frequency == 2
+        assert ScholarshipTerm.objects.get(term='jazz').document_frequency == 1
+        for scholarship in catalog.values():
+            weights = scholarship.term_weights.values_list('weight', flat=True)
+            assert sum(w * w for w in weights) == pytest.approx(1.0)
+
+    def test_rebuild_replaces_index(self, catalog):
+        build_text_index()
+        catalog['music'].delete()
+        build_text_index()
+
+        assert not ScholarshipTerm.objects.filter(term='jazz').exists()
+        assert ScholarshipTermWeight.objects.values('scholarship').distinct().count() == 2
+
+    def test_profile_vector_ignores_unknown_terms(self, catalog, profile):
+        build_text_index()
+
+        vector = profile_vector(profile)
+        terms = set(ScholarshipTerm.objects.filter(id__in=vector).values_list('term', flat=True))
+        assert terms == {'research', 'coral', 'reefs', 'marine', 'ocean', 'biology'}
+        assert sum(w * w for w in vector.values()) == pytest.approx(1.0)
+
+    def test_text_weight_ranks_by_similarity(self, catalog, profile):
+        build_text_index()
+        matcher = ScholarshipMatcher(profile, {'text_match': 1.0, 'random_factor': 0.0})
+
+        ranked = list(matcher.get_matched_scholarships(Scholarship.objects.all()))
+
+        assert ranked[0] == catalog['marine']
+        assert 0 < ranked[0].match_score <= 1
+        assert ranked[1].match_score == 0
+
+    def test_text_score_is_stored(self, catalog, profile):
+        build_text_index()
+        matcher = ScholarshipMatcher(profile, {'text_match': 1.0, 'random_factor': 0.0})
+
+        matcher.refresh_match_scores()
+
+        scores = dict(UserScholarshipMatch.objects.values_list('scholarship_id', 'score'))
+        assert scores[catalog['marine'].id] > 0
+        assert scores[catalog['music'].id] == 0
+
+    def test_without_index_scores_zero(self, catalog, profile):
+        matcher = ScholarshipMatcher(profile, {'text_match': 1.0, 'random_factor': 0.0})
+
+        assert all(s.match_score == 0 for s in matcher.get_matched_scholarships(Scholarship.objects.all()))
+
+
+class TestProfileMatchVersion:
+    @pytest.fixture
+    def refreshes(self, monkeypatch):
+        refreshes = []
+        monkeypatch.setattr('apps.scholarships.signals.refresh_user_matches.delay', refreshes.append)
+        return refreshes
+
+    def test_matching_change_refreshes(self, test_user, refreshes, django_capture_on_commit_callbacks):
+        profile = test_user.profile
+        with django_capture_on_commit_callbacks(execute=True):
+            profile.education_level = 'graduate'
+            profile.save()
+
+        assert refreshes == [test_user.pk]
+
+    def test_other_change_keeps_matches(self, test_user, refreshes, django_capture_on_commit_callbacks):
+        profile = test_user.profile
+        with django_capture_on_commit_callbacks(execute=True):
+            profile.hear_about_us = 'A friend'
+            profile.credits = 5
+            profile.save()
+            # Saving the user saves the profile too
+            test_user.first_name = 'Test'
+            test_user.save()
+
+        assert refreshes == []
@@ -22,6 +22,56 @@ class TestScholarshipTag:
     def test_scholarship_count(self, scholarship_tag, active_scholarship):
         assert scholarship_tag.get_scholarships_count() == 1
 
+class TestTagScholarshipCount:
+    def _count(self, tag):
+        tag.refresh_from_db()
+        return tag.scholarship_count
+
+    def test_add_and_remove(self, scholarship_tag, active_scholarship, expired_scholarship):
+        assert self._count(scholarship_tag) == 2
+
+        active_scholarship.tags.remove(scholarship_tag)
+        assert self._count(scholarship_tag) == 1
+        # Removing a tag that is not linked leaves the count alone
+        active_scholarship.tags.remove(scholarship_tag)
+        assert self._count(scholarship_tag) == 1
+
+        scholarship_tag.scholarships.add(active_scholarship)
+        assert self._count(scholarship_tag) == 2
+
+    def test_clear(self, scholarship_tag, active_scholarship, expired_scholarship):
+        other = ScholarshipTag.objects.create(name='Art')
+        active_scholarship.tags.add(other)
+
+        active_scholarship.tags.clear()
+        assert self._count(scholarship_tag) == 1
+        assert self._count(other) == 0
+
+        scholarship_tag.scholarships.clear()
+        assert self._count(scholarship_tag) == 0
+
+    def test_scholarship_delete(self, scholarship_tag, active_scholarship, expired_scholarship):
+        active_scholarship.delete()
+        assert self._count(scholarship_tag) == 1
+
+        Scholarship.objects.all().delete()
+        assert self._count(scholarship_tag) == 0
+
+    def test_reconcile_repairs_drift(self, scholarship_tag, active_scholarship):
+        from apps.scholarships.tasks import reconcile_tag_counts
+        ScholarshipTag.objects.update(scholarship_count=7)
+
+        assert reconcile_tag_counts() == 1
+        assert self._count(scholarship_tag) == 1
+        assert reconcile_tag_counts() == 0
+
+    def test_serializer_reads_column(self, scholarship_tag, active_scholarship, django_assert_num_queries):
+        from apps.scholarships.serializers import ScholarshipTagSerializer
+        scholarship_tag.refresh_from_db()
+
+        with django_assert_num_queries(0):
+            assert ScholarshipTagSerializer(scholarship_tag).data['scholarship_count'] == 1
+
 class TestScholarship:
     def test_scholarship_creation(self, active_scholarship):
         assert str(active_scholarship) == 'Test Scholarship'
@@ -41,4 +91,37 @@ class TestScholarship:
     def test_get_active_tags(self, scholarship_tag, active_scholarship):
         tags = Scholarship.get_active_tags()
         assert tags.count() == 1
-        assert tags.first() == scholarship_tag 
\ No newline at end of file
+        assert tags.first() == scholarship_tag 
+
+
+class TestScholarshipStatus:
+    def test_save_derives_status(self, active_scholarship, expired_scholarship):
+        assert active_scholarship.status == Scholarship.Status.ACTIVE
+        assert expired_scholarship.status == Scholarship.Status.EXPIRED
+
+        active_scholarship.is_active = False
+        active_scholarship.save(update_fields=['is_active'])
+        active_scholarship.refresh_from_db()
+        assert active_scholarship.status == Scholarship.Status.ARCHIVED
+
+        expired_scholarship.deadline = timezone.now().date() + timedelta(days=5)
+        expired_scholarship.save()
+        assert expired_scholarship.status == Scholarship.Status.ACTIVE
+
+    def test_expire_task_flips_lapsed_rows(self, active_scholarship, expired_scholarship):
+        from apps.scholarships.catalog import get_catalog_version
+        from apps.scholarships.matching import ScholarshipMatcher
+        from apps.scholarships.tasks import expire_scholarships
+        # The deadline passes without a save, as it does overnight
+        yesterday = timezone.now().date() - timedelta(days=1)
+        Scholarship.objects.filter(pk=active_scholarship.pk).update(deadline=yesterday)
+        # Lapsed rows leave the feed before the task runs
+        assert not ScholarshipMatcher.get_candidate_queryset().exists()
+        version = get_catalog_version()
+
+        assert expire_scholarships() == 1
+
+        active_scholarship.refresh_from_db()
+        assert active_scholarship.status == Scholarship.Status.EXPIRED
+        assert get_catalog_version() > version
+        assert expire_scholarships() == 0
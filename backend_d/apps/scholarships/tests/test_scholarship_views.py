@@ -67,6 +67,875 @@ class TestScholarshipViewSet:
         response = api_client.get(url)  # Default: don't show expired
         assert len(response.data) == 1
 
+    def test_matched_reads_stored_scores(self, auth_client, test_user, active_scholarship, expired_scholarship):
+        profile = test_user.profile
+        profile.interests = ['Engineering']
+        profile.save()
+
+        auth_client.force_authenticate(user=test_user)
+        url = reverse('scholarships:scholarship-matched')
+        response = auth_client.get(url, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 1
+        assert response.data['results'][0]['id'] == active_scholarship.id
+        assert test_user.scholarship_matches.filter(scholarship=active_scholarship).exists()
+
+    def test_matched_debug_header_for_staff(self, admin_client, test_user, active_scholarship, monkeypatch):
+        collected_profiles = []
+        monkeypatch.setattr(
+            'apps.scholarships.instrumentation.log_metrics',
+            collected_profiles.append
+        )
+
+        url = reverse('scholarships:scholarship-matched')
+        response = admin_client.get(url, format='json', HTTP_X_MATCH_DEBUG='1')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert 'component-tag' in response['Server-Timing']
+        profile = collected_profiles[0]
+        assert profile['user'] == test_user.id
+        assert {'refresh', 'query', 'serialize'} <= set(profile['stages'])
+        assert set(profile['components']) == {'education', 'random', 'tag', 'field'}
+        assert profile['components']['tag']['rows'] == 1
+
+    def test_matched_debug_header_ignored_for_students(self, auth_client, test_user, active_scholarship):
+        auth_client.force_authenticate(user=test_user)
+        url = reverse('scholarships:scholarship-matched')
+        response = auth_client.get(url, format='json', HTTP_X_MATCH_DEBUG='1')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert 'Server-Timing' not in response
+
+    def test_metrics_hook_setting(self, settings):
+        from apps.scholarships.instrumentation import get_metrics_hook, log_metrics
+        assert get_metrics_hook() is log_metrics
+        settings.SCHOLARSHIP_MATCH_METRICS_HOOK = 'json.dumps'
+        import json
+        assert get_metrics_hook() is json.dumps
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    @pytest.fixture
+    def scholarships(self, scholarship_factory):
+        return [scholarship_factory(f'Scholarship {i}', amount=1000 + i) for i in range(7)]
+
+    def _walk(self, client, url):
+        seen, pages = [], 0
+        while url:
+            response = client.get(url, format='json')
+            assert response.status_code == status.HTTP_200_OK
+            assert 'count' not in response.data
+            seen.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+            pages += 1
+        return seen, pages
+
+    def test_list_cursor_pages(self, api_client, scholarships):
+        url = reverse('scholarships:scholarship-list')
+        seen, pages = self._walk(api_client, f'{url}?pagination=cursor&page_size=3')
+        assert pages == 3
+        assert seen == [s.id for s in sorted(scholarships, key=lambda s: (s.created_at, s.id), reverse=True)]
+
+    def test_list_cursor_respects_ordering(self, api_client, scholarships):
+        url = reverse('scholarships:scholarship-list')
+        seen, _ = self._walk(api_client, f'{url}?pagination=cursor&page_size=2&ordering=amount')
+        assert seen == [s.id for s in scholarships]
+
+    def test_matched_cursor_pages(self, api_client, test_user, scholarships):
+        api_client.force_authenticate(user=test_user)
+        url = reverse('scholarships:scholarship-matched')
+        unpaginated = api_client.get(url, format='json').data['results']
+
+        seen, pages = self._walk(api_client, f'{url}?pagination=cursor&page_size=3')
+
+        assert pages == 3
+        assert seen == [item['id'] for item in unpaginated]
+
+    def test_invalid_cursor(self, api_client, scholarships):
+        url = reverse('scholarships:scholarship-list')
+        response = api_client.get(f'{url}?cursor=not-a-cursor', format='json')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.parametrize('values', [
+        ['abc', 'abc'],
+        [{'dt': 'not-a-date'}, 1],
+        [None, 1],
+        [{'dt': '2024-01-01T00:00:00'}],
+    ])
+    def test_malformed_cursor_values(self, api_client, scholarships, values):
+        import base64
+        import json
+        url = reverse('scholarships:scholarship-list')
+        cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+        response = api_client.get(f'{url}?cursor={cursor}', format='json')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_malformed_decimal_key(self, api_client, scholarships):
+        import base64
+        import json
+        url = reverse('scholarships:scholarship-list')
+        cursor = base64.urlsafe_b64encode(json.dumps([{'dec': 'x'}, 1]).encode()).decode()
+        response = api_client.get(f'{url}?ordering=amount&cursor={cursor}', format='json')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_unsupported_ordering(self, rf):
+        from apps.scholarships.models import Scholarship
+        from apps.scholarships.pagination import KeysetPagination
+        from rest_framework.exceptions import ValidationError
+        from rest_framework.request import Request
+        request = Request(rf.get('/', {'pagination': 'cursor'}))
+        with pytest.raises(ValidationError):
+            KeysetPagination().paginate_queryset(Scholarship.objects.order_by('tags__name'), request)
+
+    def test_exact_count_below_threshold(self, api_client, scholarships):
+        url = reverse('scholarships:scholarship-list')
+        response = api_client.get(f'{url}?pagination=cursor&page_size=3&count=true', format='json')
+
+        assert response.data['count'] == 7
+        assert response.data['count_is_estimate'] is False
+
+        response = api_client.get(response.data['next'], format='json')
+        assert response.data['count'] == 7
+
+    def test_estimated_count_above_threshold(self, api_client, scholarships, monkeypatch):
+        from apps.scholarships.pagination import KeysetPagination
+        monkeypatch.setattr(KeysetPagination, 'exact_count_threshold', 4)
+        url = reverse('scholarships:scholarship-list')
+        response = api_client.get(f'{url}?pagination=cursor&count=true', format='json')
+
+        # Without the Postgres planner the count is capped just past the threshold
+        assert response.data['count'] == 5
+        assert response.data['count_is_estimate'] is True
+
+@pytest.mark.django_db
+class TestScholarshipSearchFilter:
+    def _filter(self, query_string, monkeypatch, vendor):
+        from django.db import connection
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+        from apps.scholarships.filters import ScholarshipSearchFilter
+        from apps.scholarships.models import Scholarship
+        from apps.scholarships.views import ScholarshipViewSet
+        monkeypatch.setattr(connection, 'vendor', vendor)
+        request = Request(APIRequestFactory().get(f'/{query_string}'))
+        queryset = Scholarship.objects.order_by('-created_at')
+        return ScholarshipSearchFilter().filter_queryset(request, queryset, ScholarshipViewSet())
+
+    def test_postgres_uses_search_vector(self, monkeypatch):
+        queryset = self._filter('?search=nursing+texas', monkeypatch, 'postgresql')
+        sql = str(queryset.query)
+        assert '@@' in sql and 'ts_rank' in sql
+        assert 'LIKE' not in sql
+        assert queryset.query.order_by == ('-search_rank', '-created_at')
+
+    def test_explicit_ordering_wins(self, monkeypatch):
+        queryset = self._filter('?search=nursing&ordering=amount', monkeypatch, 'postgresql')
+        assert queryset.query.order_by == ('-created_at',)
+
+    def test_other_databases_use_icontains(self, monkeypatch, active_scholarship):
+        queryset = self._filter('?search=Test', monkeypatch, 'sqlite')
+        assert 'LIKE' in str(queryset.query)
+        assert list(queryset) == [active_scholarship]
+
+@pytest.mark.django_db
+class TestExcludeSwiped:
+    @pytest.fixture
+    def scholarships(self, scholarship_factory):
+        return [scholarship_factory(f'Scholarship {i}') for i in range(3)]
+
+    @pytest.fixture
+    def redis(self, settings, fake_redis):
+        settings.SCHOLARSHIP_SWIPE_CACHE = True
+        return fake_redis
+
+    def _swipe(self, client, scholarship, direction):
+        return client.post(
+            reverse('applications:application-swipe'),
+            {'scholarship_id': scholarship.id, 'swipe_direction': direction},
+            format='json'
+        )
+
+    def _feed(self, client):
+        url = reverse('scholarships:scholarship-list')
+        response = client.get(f'{url}?exclude_swiped=true', format='json')
+        assert response.status_code == status.HTTP_200_OK
+        return {item['id'] for item in response.data}
+
+    def test_anti_join(self, auth_client, test_user, scholarships):
+        auth_client.force_authenticate(user=test_user)
+        self._swipe(auth_client, scholarships[0], 'left')
+        self._swipe(auth_client, scholarships[1], 'saved')
+
+        assert self._feed(auth_client) == {scholarships[1].id, scholarships[2].id}
+
+    def test_cached_set_follows_swipes(self, auth_client, test_user, scholarships, redis,
+                                       django_capture_on_commit_callbacks):
+        auth_client.force_authenticate(user=test_user)
+        self._swipe(auth_client, scholarships[0], 'right')
+        assert self._feed(auth_client) == {scholarships[1].id, scholarships[2].id}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self._swipe(auth_client, scholarships[1], 'left')
+            self._swipe(auth_client, scholarships[0], 'saved')
+
+        key = f'scholarships:swiped:{test_user.pk}'
+        assert redis.data[key] == {0, scholarships[1].id}
+        assert self._feed(auth_client) == {scholarships[0].id, scholarships[2].id}
+
+    def test_cached_set_skips_applications_table(self, auth_client, test_user, scholarships, redis):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        auth_client.force_authenticate(user=test_user)
+        redis.sadd(f'scholarships:swiped:{test_user.pk}', 0, scholarships[2].id)
+
+        with CaptureQueriesContext(connection) as queries:
+            ids = self._feed(auth_client)
+        assert ids == {scholarships[0].id, scholarships[1].id}
+        assert not any('applications_application' in query['sql'] for query in queries)
+
+@pytest.mark.django_db
+class TestCardQueue:
+    @pytest.fixture(autouse=True)
+    def enable_queue(self, settings, fake_redis, monkeypatch):
+        from django.core.cache import cache
+        cache.clear()
+        settings.SCHOLARSHIP_CARD_QUEUE = True
+        settings.SCHOLARSHIP_CARD_QUEUE_SIZE = 3
+        settings.SCHOLARSHIP_CARD_QUEUE_LOW_WATER = 2
+        self.redis = fake_redis
+        self.refills = []
+        monkeypatch.setattr('apps.scholarships.tasks.refill_card_queue.delay', self.refills.append)
+
+    @pytest.fixture
+    def scholarships(self, test_user, scholarship_factory):
+        from apps.scholarships.models import ScholarshipTag
+        profile = test_user.profile
+        profile.interests = ['Engineering']
+        profile.save()
+        tag = ScholarshipTag.objects.create(name='Engineering')
+        return [scholarship_factory(f'Scholarship {i}', tags=[tag] if i < 2 else []) for i in range(5)]
+
+    def _matched(self, client, page_size):
+        url = reverse('scholarships:scholarship-matched')
+        response = client.get(f'{url}?page_size={page_size}', format='json')
+        assert response.status_code == status.HTTP_200_OK
+        return [item['id'] for item in response.data['results']]
+
+    def test_fill_ranks_and_skips_swiped(self, test_user, scholarships):
+        from apps.applications.models import Application
+        from apps.scholarships.cards import fill_card_queue
+        Application.objects.create(user=test_user, scholarship=scholarships[0], swipe_status='left')
+
+        assert fill_card_queue(test_user.pk) == 3
+        queued = self.redis.data[f'scholarships:cards:{test_user.pk}']
+        assert queued[0] == scholarships[1].id
+        assert scholarships[0].id not in queued
+
+    def test_matched_pops_cards(self, auth_client, test_user, scholarships):
+        from apps.scholarships.cards import fill_card_queue
+        auth_client.force_authenticate(user=test_user)
+        fill_card_queue(test_user.pk)
+        queued = list(self.redis.data[f'scholarships:cards:{test_user.pk}'])
+
+        assert self._matched(auth_client, 2) == queued[:2]
+        assert self.refills == [test_user.pk]
+        assert self._matched(auth_client, 2) == queued[2:]
+
+        # Served cards stay out of the next refill
+        fill_card_queue(test_user.pk)
+        assert not set(self.redis.data[f'scholarships:cards:{test_user.pk}']) & set(queued)
+
+    def test_matched_falls_back_to_live_scoring(self, auth_client, test_user, scholarships):
+        auth_client.force_authenticate(user=test_user)
+
+        assert len(self._matched(auth_client, 2)) == 2
+        assert self.refills == [test_user.pk]
+        # One refill in flight per user
+        self._matched(auth_client, 2)
+        assert self.refills == [test_user.pk]
+
+@pytest.mark.django_db
+class TestMatchExplanation:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    @pytest.fixture
+    def profile(self, test_user):
+        profile = test_user.profile
+        profile.interests = ['Engineering']
+        profile.education_level = 'undergraduate'
+        profile.save()
+        return profile
+
+    def _explain(self, client, scholarship, **params):
+        url = reverse('scholarships:scholarship-match-explanation', args=[scholarship.id])
+        response = client.get(url, params, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        return response.data
+
+    def test_breakdown(self, auth_client, test_user, profile, active_scholarship):
+        auth_client.force_authenticate(user=test_user)
+
+        data = self._explain(auth_client, active_scholarship)
+
+        components = {component['name']: component for component in data['components']}
+        assert set(components) == {'tag', 'education', 'field', 'random'}
+        assert components['tag']['score'] == pytest.approx(1.0)
+        assert components['tag']['contribution'] == pytest.approx(0.4)
+        assert components['education']['score'] == 0
+        assert 0 <= components['random']['score'] < 1
+        assert data['eligible'] is True
+        assert data['score'] == pytest.approx(sum(c['contribution'] for c in data['components']))
+        assert data['cached'] is False
+
+    def test_catalog_and_text_index_changes_invalidate(self, auth_client, test_user, profile, active_scholarship):
+        from apps.scholarships.catalog import bump_catalog_version
+        from apps.scholarships.text import build_text_index
+        auth_client.force_authenticate(user=test_user)
+        self._explain(auth_client, active_scholarship)
+
+        bump_catalog_version()
+        assert self._explain(auth_client, active_scholarship)['cached'] is False
+
+        build_text_index()
+        assert self._explain(auth_client, active_scholarship)['cached'] is False
+        assert self._explain(auth_client, active_scholarship)['cached'] is True
+
+    def test_cache_hit_skips_scoring_query(self, auth_client, test_user, profile, active_scholarship):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        auth_client.force_authenticate(user=test_user)
+        first = self._explain(auth_client, active_scholarship)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self._explain(auth_client, active_scholarship)
+
+        assert second['cached'] is True
+        assert second['components'] == first['components']
+        assert not any('scholarships_scholarship_tags' in query['sql'] for query in queries)
+
+    def test_tag_change_invalidates(self, auth_client, test_user, profile, active_scholarship, scholarship_tag):
+        auth_client.force_authenticate(user=test_user)
+        self._explain(auth_client, active_scholarship)
+
+        active_scholarship.tags.remove(scholarship_tag)
+        active_scholarship.refresh_from_db()
+
+        data = self._explain(auth_client, active_scholarship)
+        assert data['cached'] is False
+        assert next(c for c in data['components'] if c['name'] == 'tag')['score'] == 0
+
+    def test_profile_change_invalidates(self, auth_client, test_user, profile, active_scholarship):
+        auth_client.force_authenticate(user=test_user)
+        self._explain(auth_client, active_scholarship)
+
+        profile.education_level = ''
+        profile.save()
+
+        assert self._explain(auth_client, active_scholarship)['cached'] is False
+
+    def test_unrelated_profile_change_keeps_cache(self, auth_client, test_user, profile, active_scholarship):
+        auth_client.force_authenticate(user=test_user)
+        self._explain(auth_client, active_scholarship)
+
+        profile.hear_about_us = 'A friend'
+        profile.save()
+
+        assert self._explain(auth_client, active_scholarship)['cached'] is True
+
+    def test_staff_can_explain_for_student(self, admin_client, django_user_model, active_scholarship):
+        student = django_user_model.objects.create_user(
+            username='student', password='testpass123', firebase_uid='student123'
+        )
+        student.profile.interests = ['Engineering']
+        student.profile.save()
+
+        data = self._explain(admin_client, active_scholarship, user_id=student.pk)
+
+        assert next(c for c in data['components'] if c['name'] == 'tag')['score'] == pytest.approx(1.0)
+
+@pytest.mark.django_db
+class TestScholarshipQueryCounts:
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client, test_user, scholarship_factory):
+        from apps.scholarships.models import ScholarshipTag
+        self.client = api_client
+        self.user = test_user
+        self.create = scholarship_factory
+        self.tags = [ScholarshipTag.objects.create(name=name) for name in ('Engineering', 'Art')]
+        self.grow()
+
+    def grow(self):
+        from apps.scholarships.models import Scholarship
+        for i in range(3):
+            self.create(f'Scholarship {Scholarship.objects.count()}', tags=self.tags)
+
+    def fetch(self, url):
+        response = self.client.get(url, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        return response
+
+    def test_list(self, assert_constant_queries):
+        url = reverse('scholarships:scholarship-list')
+        # Scholarships and their prefetched tags
+        assert_constant_queries(lambda: self.fetch(url), self.grow, expected=2)
+        assert_constant_queries(lambda: self.fetch(f'{url}?pagination=cursor&page_size=2'), self.grow, expected=2)
+
+    def test_list_defers_unused_columns(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            self.fetch(reverse('scholarships:scholarship-list'))
+        assert 'eligibility_criteria' not in queries[0]['sql']
+
+    def test_matched(self, assert_constant_queries):
+        self.client.force_authenticate(user=self.user)
+        url = reverse('scholarships:scholarship-matched')
+
+        def grow():
+            from apps.scholarships.matching import refresh_user_matches
+            self.grow()
+            refresh_user_matches(self.user.pk)
+
+        self.fetch(url)
+        assert_constant_queries(lambda: self.fetch(url), grow)
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    def _get(self, client, url, **headers):
+        return client.get(url, format='json', **headers)
+
+    def test_list_not_modified(self, api_client, active_scholarship, django_assert_num_queries):
+        url = reverse('scholarships:scholarship-list')
+        response = self._get(api_client, url)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response['ETag']
+
+        with django_assert_num_queries(0):
+            response = self._get(api_client, url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+
+    def test_list_etag_changes_with_catalog(self, api_client, active_scholarship):
+        from apps.scholarships.catalog import bump_catalog_version
+        url = reverse('scholarships:scholarship-list')
+        etag = self._get(api_client, url)['ETag']
+
+        active_scholarship.title = 'Renamed'
+        active_scholarship.save()
+        # Runs on commit of the save
+        bump_catalog_version()
+
+        response = self._get(api_client, url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[0]['title'] == 'Renamed'
+
+    def test_list_etag_depends_on_query(self, api_client, active_scholarship):
+        url = reverse('scholarships:scholarship-list')
+        etag = self._get(api_client, url)['ETag']
+
+        response = self._get(api_client, f'{url}?ordering=amount', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_swipe_filtered_list_is_not_conditional(self, auth_client, test_user, active_scholarship):
+        auth_client.force_authenticate(user=test_user)
+        url = reverse('scholarships:scholarship-list')
+
+        assert 'ETag' not in self._get(auth_client, f'{url}?exclude_swiped=true')
+
+    def test_retrieve_uses_updated_at(self, api_client, active_scholarship):
+        from django.utils.http import http_date
+        url = reverse('scholarships:scholarship-detail', args=[active_scholarship.id])
+        response = self._get(api_client, url)
+        assert response['Last-Modified'] == http_date(int(active_scholarship.updated_at.timestamp()))
+
+        not_modified = self._get(api_client, url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+        active_scholarship.tags.clear()
+        response = self._get(api_client, url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['tags'] == []
+
+    def test_retrieve_etag_changes_with_tags(self, api_client, active_scholarship):
+        from apps.scholarships.catalog import bump_catalog_version
+        url = reverse('scholarships:scholarship-detail', args=[active_scholarship.id])
+        etag = self._get(api_client, url)['ETag']
+
+        # Renaming a tag leaves the scholarship's updated_at alone
+        tag = active_scholarship.tags.first()
+        tag.name = 'Renamed tag'
+        tag.save()
+        bump_catalog_version()
+
+        response = self._get(api_client, url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert 'Renamed tag' in [tag['name'] for tag in response.data['tags']]
+
+    def test_retrieve_if_modified_since(self, api_client, active_scholarship):
+        url = reverse('scholarships:scholarship-detail', args=[active_scholarship.id])
+        last_modified = self._get(api_client, url)['Last-Modified']
+
+        response = self._get(api_client, url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_retrieve_missing(self, api_client):
+        url = reverse('scholarships:scholarship-detail', args=[999])
+        assert self._get(api_client, url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_tags_not_modified(self, api_client, scholarship_tag):
+        url = reverse('scholarships:scholarship-tag-list')
+        etag = self._get(api_client, url)['ETag']
+
+        response = self._get(api_client, url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+@pytest.mark.django_db
+class TestFragmentCache:
+    @pytest.fixture(autouse=True)
+    def enable_cache(self, settings, monkeypatch):
+        from django.core.cache import cache
+        from apps.scholarships.serializers import ScholarshipListSerializer
+        cache.clear()
+        settings.SCHOLARSHIP_FRAGMENT_CACHE = True
+        self.serialized = []
+        original = ScholarshipListSerializer.to_representation
+
+        def to_representation(serializer, instance):
+            self.serialized.append(instance.pk)
+            return original(serializer, instance)
+
+        monkeypatch.setattr(ScholarshipListSerializer, 'to_representation', to_representation)
+
+    @pytest.fixture
+    def scholarships(self, active_scholarship, scholarship_tag, scholarship_factory):
+        other = scholarship_factory(
+            'Other Scholarship',
+            tags=[scholarship_tag],
+            description='Other Description',
+            amount=2000,
+            deadline=timezone.now().date() + timedelta(days=60)
+        )
+        return [active_scholarship, other]
+
+    def _list(self, client, query=''):
+        import json
+        response = client.get(f"{reverse('scholarships:scholarship-list')}{query}", HTTP_ACCEPT='application/json')
+        assert response.status_code == status.HTTP_200_OK
+        return json.loads(response.content)
+
+    def test_matches_uncached_response(self, api_client, scholarships, settings):
+        cached = self._list(api_client)
+        settings.SCHOLARSHIP_FRAGMENT_CACHE = False
+        assert cached == self._list(api_client)
+
+    def test_serializes_each_row_once(self, api_client, scholarships):
+        first = self._list(api_client)
+        second = self._list(api_client)
+
+        assert first == second
+        assert sorted(self.serialized) == sorted(s.id for s in scholarships)
+
+    def test_paginated_envelope(self, api_client, scholarships):
+        data = self._list(api_client, '?pagination=cursor&page_size=1')
+        assert len(data['results']) == 1
+        assert data['next_cursor']
+
+    def test_save_and_tag_changes_invalidate(self, api_client, scholarships, scholarship_tag):
+        self._list(api_client)
+
+        scholarships[0].title = 'Renamed'
+        scholarships[0].save()
+        scholarship_tag.name = 'Renamed Tag'
+        scholarship_tag.save()
+
+        data = {row['id']: row for row in self._list(api_client)}
+        assert data[scholarships[0].id]['title'] == 'Renamed'
+        assert data[scholarships[1].id]['tags'][0]['name'] == 'Renamed Tag'
+
+    def test_retrieve(self, api_client, scholarships):
+        url = reverse('scholarships:scholarship-detail', args=[scholarships[0].id])
+        first = api_client.get(url, HTTP_ACCEPT='application/json')
+        second = api_client.get(url, HTTP_ACCEPT='application/json')
+
+        assert first.content == second.content
+        assert second.data['title'] == 'Test Scholarship'
+
+@pytest.mark.django_db
+class TestBulkIngest:
+    @pytest.fixture(autouse=True)
+    def no_rescore(self, monkeypatch):
+        from apps.scholarships import tasks
+        self.rescored = []
+        monkeypatch.setattr(tasks.refresh_matches_for_scholarships, 'delay', self.rescored.append)
+
+    def _item(self, external_id, **fields):
+        return {
+            'external_id': external_id,
+            'title': f'Partner {external_id}',
+            'description': 'Partner description',
+            'amount': '1500.00',
+            'deadline': (timezone.now().date() + timedelta(days=30)).isoformat(),
+            'eligibility_criteria': 'Partner criteria',
+            **fields
+        }
+
+    def test_creates_then_updates(self, admin_client, scholarship_tag):
+        from apps.scholarships.models import Scholarship
+        url = reverse('scholarships:scholarship-bulk')
+        items = [self._item('p-1', tags=['Engineering']), self._item('p-2')]
+        response = admin_client.post(url, items, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['created'] == 2
+        created = Scholarship.objects.get(external_id='p-1')
+        assert list(created.tags.values_list('name', flat=True)) == ['Engineering']
+        scholarship_tag.refresh_from_db()
+        assert scholarship_tag.scholarship_count == 1
+
+        response = admin_client.post(url, [self._item('p-1', title='Renamed', tags=[])], format='json')
+
+        assert response.data['updated'] == 1
+        assert response.data['results'][0]['id'] == created.id
+        created.refresh_from_db()
+        assert created.title == 'Renamed'
+        assert not created.tags.exists()
+        scholarship_tag.refresh_from_db()
+        assert scholarship_tag.scholarship_count == 0
+
+    def test_update_keeps_omitted_fields(self, admin_client):
+        from apps.scholarships.models import Scholarship
+        url = reverse('scholarships:scholarship-bulk')
+        admin_client.post(url, [
+            self._item('p-1', location='Texas', is_active=False),
+            self._item('p-2', location='Ohio'),
+        ], format='json')
+
+        response = admin_client.post(url, [
+            self._item('p-1', title='Renamed'),
+            self._item('p-2', location=''),
+        ], format='json')
+
+        assert response.data['updated'] == 2
+        archived = Scholarship.objects.get(external_id='p-1')
+        assert archived.title == 'Renamed'
+        assert archived.location == 'Texas'
+        assert archived.is_active is False
+        assert archived.status == Scholarship.Status.ARCHIVED
+        assert Scholarship.objects.get(external_id='p-2').location == ''
+
+    def test_reports_item_errors(self, admin_client, scholarship_tag):
+        from apps.scholarships.models import Scholarship
+        items = [
+            self._item('p-1'),
+            self._item('p-2', amount='0'),
+            self._item('p-3', tags=['Missing']),
+            self._item('p-1'),
+        ]
+        response = admin_client.post(reverse('scholarships:scholarship-bulk'), items, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [error['index'] for error in response.data['errors']] == [1, 2, 3]
+        assert 'amount' in response.data['errors'][0]['errors']
+        assert list(Scholarship.objects.filter(external_id__startswith='p-').values_list('external_id', flat=True)) == ['p-1']
+
+    def test_ndjson_in_batches(self, admin_client, scholarship_tag, django_assert_max_num_queries,
+                               django_capture_on_commit_callbacks, monkeypatch):
+        import json
+        from apps.scholarships import ingest
+        monkeypatch.setattr(ingest, 'BULK_BATCH_SIZE', 10)
+        body = '\n'.join(json.dumps(self._item(f'p-{i}', tags=['Engineering'])) for i in range(30))
+
+        with django_assert_max_num_queries(40), django_capture_on_commit_callbacks(execute=True):
+            response = admin_client.generic(
+                'POST', reverse('scholarships:scholarship-bulk'), body, content_type='application/x-ndjson'
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['created'] == 30
+        assert len(self.rescored) == 1 and len(self.rescored[0]) == 30
+        scholarship_tag.refresh_from_db()
+        assert scholarship_tag.scholarship_count == 30
+
+    def test_requires_staff(self, auth_client, test_user):
+        from apps.scholarships.models import Scholarship
+        auth_client.force_authenticate(user=test_user)
+        response = auth_client.post(reverse('scholarships:scholarship-bulk'), [self._item('p-1')], format='json')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert not Scholarship.objects.filter(external_id='p-1').exists()
+
+    def test_rejects_non_list(self, admin_client):
+        response = admin_client.post(reverse('scholarships:scholarship-bulk'), self._item('p-1'), format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    def _list(self, client, query):
+        response = client.get(f"{reverse('scholarships:scholarship-list')}?{query}")
+        assert response.status_code == status.HTTP_200_OK
+        return response.data
+
+    def test_default_shape(self, api_client, active_scholarship):
+        row = self._list(api_client, '')[0]
+        assert 'description' not in row
+        assert row['tags'][0]['slug'] == 'engineering'
+
+    def test_fields_projects_queryset(self, api_client, active_scholarship):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            data = self._list(api_client, 'fields=id,title')
+
+        assert data == [{'id': active_scholarship.id, 'title': 'Test Scholarship'}]
+        assert len(queries) == 1
+        assert '"description"' not in queries[0]['sql']
+
+    def test_expand_and_compact(self, api_client, active_scholarship):
+        row = self._list(api_client, 'fields=title,tags&expand=description&compact=true')[0]
+        assert row == {
+            'title': 'Test Scholarship',
+            'tags': ['Engineering'],
+            'description': 'Test Description'
+        }
+
+    def test_detail_compact(self, api_client, active_scholarship):
+        url = reverse('scholarships:scholarship-detail', args=[active_scholarship.id])
+        response = api_client.get(f'{url}?compact=true')
+        assert response.data['tags'] == ['Engineering']
+        assert response.data['description'] == 'Test Description'
+
+    def test_fragments_keyed_by_shape(self, api_client, active_scholarship, settings):
+        from django.core.cache import cache
+        cache.clear()
+        settings.SCHOLARSHIP_FRAGMENT_CACHE = True
+        full = self._list(api_client, '')[0]
+        compact = self._list(api_client, 'compact=true')[0]
+
+        assert full['tags'][0]['name'] == 'Engineering'
+        assert compact['tags'] == ['Engineering']
+
+class TestORJSONRenderer:
+    def test_matches_json_renderer(self):
+        import uuid
+        from datetime import date, datetime, timezone as tz
+        from decimal import Decimal
+        from rest_framework.renderers import JSONRenderer
+        from apps.scholarships.renderers import ORJSONRenderer
+        data = {
+            'amount': Decimal('1500.50'),
+            'deadline': date(2026, 1, 31),
+            'created_at': datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=tz.utc),
+            'id': uuid.UUID(int=7),
+            'title': 'Bourse d\u2019\u00e9tudes \u2028',
+            'scores': {1: 0.5},
+            'tags': [{'name': 'Engineering'}, ('a', None, True)],
+        }
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_default_renderer_matches_json_renderer(self, settings):
+        from datetime import date, datetime, timezone as tz
+        from decimal import Decimal
+        from rest_framework.renderers import JSONRenderer
+        from rest_framework.response import Response
+        from rest_framework.settings import api_settings
+        from rest_framework.test import APIRequestFactory
+        from rest_framework.views import APIView
+        from apps.scholarships.renderers import ORJSONRenderer
+        from config import settings as project_settings
+        # The root conftest replaces REST_FRAMEWORK; restore the project's renderers
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_RENDERER_CLASSES': project_settings.REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'],
+        }
+        data = {
+            'amount': Decimal('1500.50'),
+            'amounts': [Decimal('0.10'), Decimal('12')],
+            'deadline': date(2026, 1, 31),
+            'created_at': datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=tz.utc),
+            'updated_at': datetime(2026, 1, 2, 3, 4, 5),
+        }
+
+        class PayloadView(APIView):
+            permission_classes = []
+            renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+
+            def get(self, request):
+                return Response(data)
+
+        response = PayloadView.as_view()(APIRequestFactory().get('/payload/'))
+        response.render()
+
+        assert isinstance(response.accepted_renderer, ORJSONRenderer)
+        assert response.content == JSONRenderer().render(data)
+
+    def test_indent_falls_back(self):
+        from apps.scholarships.renderers import ORJSONRenderer
+        rendered = ORJSONRenderer().render({'a': 1}, 'application/json; indent=2')
+        assert rendered == b'{\n  "a": 1\n}'
+
+@pytest.mark.django_db
+class TestCompressionMiddleware:
+    @pytest.fixture
+    def scholarships(self, scholarship_factory):
+        for i in range(20):
+            scholarship_factory(f'Scholarship {i}')
+
+    def _list(self, client, **headers):
+        return client.get(reverse('scholarships:scholarship-list'), **headers)
+
+    def test_gzips_large_responses(self, api_client, scholarships):
+        import gzip
+        import json
+        from apps.scholarships import middleware
+        plain = self._list(api_client)
+        response = self._list(api_client, HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        assert 'Accept-Encoding' in response['Vary']
+        assert response['Content-Encoding'] == ('br' if middleware.brotli else 'gzip')
+        if not middleware.brotli:
+            assert json.loads(gzip.decompress(response.content)) == json.loads(plain.content)
+        assert response['ETag'].startswith('W/')
+
+    def test_weak_etag_still_validates(self, api_client, scholarships):
+        etag = self._list(api_client, HTTP_ACCEPT_ENCODING='gzip')['ETag']
+        assert etag.startswith('W/"')
+
+        response = self._list(api_client, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not response.content
+
+    def test_weakened_identity_etag_validates(self, api_client, scholarships):
+        # A cache may hold the uncompressed response's tag and send it weak
+        etag = self._list(api_client, HTTP_ACCEPT_ENCODING='identity')['ETag']
+        assert etag.startswith('"')
+
+        response = self._list(api_client, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=f'W/{etag}')
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_skips_small_and_refused(self, api_client, scholarships, settings):
+        assert not self._list(api_client, HTTP_ACCEPT_ENCODING='gzip;q=0, identity').has_header('Content-Encoding')
+        settings.RESPONSE_COMPRESSION_MIN_SIZE = 10 ** 6
+        assert not self._list(api_client, HTTP_ACCEPT_ENCODING='gzip').has_header('Content-Encoding')
+
+    def test_choose_encoding(self, monkeypatch):
+        from apps.scholarships import middleware
+        monkeypatch.setattr(middleware, 'brotli', object())
+        assert middleware.choose_encoding('gzip, br') == 'br'
+        assert middleware.choose_encoding('gzip, br;q=0') == 'gzip'
+        assert middleware.choose_encoding('*') == 'br'
+        assert middleware.choose_encoding('identity') is None
+        monkeypatch.setattr(middleware, 'brotli', None)
+        assert middleware.choose_encoding('br, gzip') == 'gzip'
+
 @pytest.mark.django_db
 class TestScholarshipTagViewSet:
     def test_list_tags(self, api_client, scholarship_tag):
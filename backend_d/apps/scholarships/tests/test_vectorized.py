@@ -0,0 +1,310 @@
+import pytest
+from django.utils import timezone
+from apps.scholarships.catalog import bump_catalog_version
+from apps.scholarships.matching import ScholarshipMatcher, get_matcher, trigram_threshold
+from apps.scholarships.models import Scholarship, ScholarshipTag, UserScholarshipMatch
+from apps.scholarships.trigram import trigram_similarity
+from apps.scholarships import vectorized
+from apps.scholarships.vectorized import CatalogMatrix, VectorizedMatcher, get_catalog
+
+pytestmark = pytest.mark.django_db
+
+@pytest.fixture(autouse=True)
+def reset_catalog(monkeypatch):
+    """Version bumps run on commit, which never happens inside a test"""
+    monkeypatch.setattr(vectorized, '_catalog', None)
+
+NO_RANDOM = {'random_factor': 0.0}
+
+@pytest.fixture
+def profile(test_user):
+    profile = test_user.profile
+    profile.interests = ['Engineering', 'Technology']
+    profile.education_level = 'undergraduate'
+    profile.field_of_study = 'Computer Science'
+    profile.save()
+    return profile
+
+@pytest.fixture
+def catalog(scholarship_factory):
+    eng = ScholarshipTag.objects.create(name='Engineering')
+    art = ScholarshipTag.objects.create(name='Art')
+    tech = ScholarshipTag.objects.create(name='Technology')
+    scholarship_factory('Perfect', [eng, tech], education_level='undergraduate', field_of_study='Computer Science')
+    scholarship_factory('Close Field', [art], education_level='undergraduate', field_of_study='Computer Engineering')
+    scholarship_factory('Tag Only', [eng], education_level='graduate', field_of_study='History')
+    scholarship_factory('Education Only', [art], education_level='undergraduate', field_of_study='Fine Arts')
+    scholarship_factory('Nothing', [], education_level='high_school')
+    return CatalogMatrix.load()
+
+class TestTrigramSimilarity:
+    def test_identical(self):
+        assert trigram_similarity('Computer Science', 'computer science') == 1.0
+
+    def test_partial(self):
+        assert 0 < trigram_similarity('Computer Science', 'Computer Engineering') < 1
+
+    def test_null(self):
+        assert trigram_similarity('Computer Science', None) is None
+
+class TestCatalogMatrix:
+    def test_load_skips_inactive_and_expired(self, scholarship_factory):
+        active = scholarship_factory('Active')
+        scholarship_factory('Inactive', is_active=False)
+        scholarship_factory('Expired', deadline=timezone.now().date() - timezone.timedelta(days=1))
+        catalog = CatalogMatrix.load()
+        assert catalog.ids.tolist() == [active.id]
+
+    def test_reloads_when_version_changes(self, scholarship_factory):
+        first = get_catalog()
+        assert get_catalog() is first
+
+        scholarship_factory('New')
+        bump_catalog_version()
+
+        second = get_catalog()
+        assert second is not first
+        assert len(second) == len(first) + 1
+
+    def test_field_scores_threshold(self, catalog):
+        scores = dict(zip(catalog.ids.tolist(), catalog.field_scores('Computer Science').tolist()))
+        thresholded = dict(zip(
+            catalog.ids.tolist(),
+            catalog.field_scores('Computer Science', threshold=0.5).tolist()
+        ))
+        for scholarship_id, score in scores.items():
+            assert thresholded[scholarship_id] == (score if score >= 0.5 else 0.0)
+        assert max(thresholded.values()) == 1.0
+
+class TestTrigramThreshold:
+    def test_disabled_by_default(self):
+        assert trigram_threshold() is None
+
+    def test_ignored_without_pg_trgm(self, settings):
+        settings.SCHOLARSHIP_TRIGRAM_THRESHOLD = 0.3
+        assert trigram_threshold() is None
+
+class TestVectorizedMatcher:
+    def test_same_ranking_as_orm_matcher(self, profile, catalog):
+        orm_ranking = [
+            s.id for s in ScholarshipMatcher(profile, NO_RANDOM).get_matched_scholarships(
+                Scholarship.objects.all(), page_size=100
+            )
+        ]
+        numpy_ranking = [
+            s.id for s in VectorizedMatcher(profile, NO_RANDOM, catalog).get_matched_scholarships(
+                Scholarship.objects.all(), page_size=100
+            )
+        ]
+        assert numpy_ranking == orm_ranking
+
+    def test_same_ranking_with_seeded_random_factor(self, profile, catalog):
+        orm_ranking = [
+            s.id for s in ScholarshipMatcher(profile).get_matched_scholarships(
+                Scholarship.objects.all(), page_size=100
+            )
+        ]
+        numpy_ranking = [
+            s.id for s in VectorizedMatcher(profile, catalog=catalog).get_matched_scholarships(
+                Scholarship.objects.all(), page_size=100
+            )
+        ]
+        assert numpy_ranking == orm_ranking
+
+    def test_same_eligibility_as_orm_matcher(self, profile, catalog):
+        profile.location = 'Texas'
+        profile.min_amount = 1000
+        profile.max_amount = 5000
+        Scholarship.objects.filter(title='Close Field').update(location='TEXAS')
+        Scholarship.objects.filter(title='Education Only').update(location='Ohio')
+        Scholarship.objects.filter(title='Perfect').update(amount=6000)
+        catalog = CatalogMatrix.load()
+
+        orm = set(ScholarshipMatcher(profile).apply_eligibility(
+            Scholarship.objects.all()
+        ).values_list('id', flat=True))
+        vectorized = VectorizedMatcher(profile, catalog=catalog)
+        assert set(catalog.ids[vectorized.eligible()].tolist()) == orm
+        assert Scholarship.objects.get(id__in=orm).title == 'Close Field'
+
+    def test_tiebreak_matches_sql(self, profile, catalog):
+        sql = dict(
+            ScholarshipMatcher(profile)._apply_matching_criteria(
+                Scholarship.objects.all()
+            ).values_list('id', 'tiebreak')
+        )
+        matcher = VectorizedMatcher(profile, catalog=catalog)
+        for scholarship_id, tiebreak in zip(catalog.ids.tolist(), matcher.tiebreak().tolist()):
+            assert tiebreak == pytest.approx(sql[scholarship_id])
+
+    def test_same_components_as_orm_matcher(self, profile, catalog):
+        candidates = ScholarshipMatcher.get_candidate_queryset()
+        orm = ScholarshipMatcher(profile)._score_components(candidates)
+        vectorized = VectorizedMatcher(profile, catalog=catalog)._score_components(candidates)
+        assert orm.keys() == vectorized.keys()
+        for scholarship_id, components in orm.items():
+            assert vectorized[scholarship_id] == pytest.approx(components, abs=1e-6)
+
+    def test_respects_queryset_filter(self, profile, catalog):
+        queryset = Scholarship.objects.exclude(title='Perfect')
+        page = VectorizedMatcher(profile, NO_RANDOM, catalog).get_matched_scholarships(queryset)
+        assert 'Perfect' not in [s.title for s in page]
+        assert {s.title for s in page} == {'Close Field', 'Education Only'}
+
+    def test_mask_evaluated_in_memory(self, profile, catalog, django_assert_num_queries):
+        import numpy as np
+        profile.location = 'texas'
+        profile.max_amount = 5000
+        matcher = VectorizedMatcher(profile, catalog=catalog)
+        ids = Scholarship.objects.filter(title__in=['Perfect', 'Tag Only']).values_list('id', flat=True)
+        candidates = matcher.apply_eligibility(
+            ScholarshipMatcher.get_candidate_queryset().filter(id__in=list(ids))
+        )
+        expected = set(candidates.values_list('id', flat=True))
+
+        with django_assert_num_queries(0):
+            mask = matcher._mask(candidates)
+
+        assert set(catalog.ids[mask].tolist()) == expected
+        assert mask.dtype == np.bool_
+
+    def test_mask_location_lookups_match_orm(self, profile, scholarship_factory):
+        for location in ('Texas', 'TEXAS', 'texas', 'Ohio', ''):
+            scholarship_factory(f'In {location}', location=location)
+        matcher = VectorizedMatcher(profile, catalog=CatalogMatrix.load())
+
+        for queryset in (
+            Scholarship.objects.filter(location__iexact='tExas'),
+            Scholarship.objects.filter(location='Texas'),
+            Scholarship.objects.filter(location=''),
+            Scholarship.objects.exclude(location='texas'),
+        ):
+            mask = matcher._mask(queryset)
+            assert set(matcher.catalog.ids[mask].tolist()) == set(queryset.values_list('id', flat=True))
+
+    def test_mask_reads_unsupported_filters(self, profile, catalog, django_assert_num_queries):
+        matcher = VectorizedMatcher(profile, catalog=catalog)
+        queryset = Scholarship.objects.filter(tags__name='Art')
+
+        with django_assert_num_queries(1):
+            mask = matcher._mask(queryset)
+
+        assert set(catalog.ids[mask].tolist()) == set(queryset.values_list('id', flat=True))
+
+    def test_refresh_match_scores(self, profile, catalog):
+        written = VectorizedMatcher(profile, catalog=catalog).refresh_match_scores()
+        assert written == 3
+        perfect = UserScholarshipMatch.objects.get(user=profile.user, scholarship__title='Perfect')
+        assert perfect.score == pytest.approx(0.9)
+
+    def test_same_ranking_with_amount_and_location(self, profile, catalog):
+        profile.location = 'Ohio'
+        profile.max_amount = 8000
+        Scholarship.objects.filter(title='Nothing').update(location='ohio', amount=8000)
+        Scholarship.objects.filter(title='Tag Only').update(amount=500)
+        catalog = CatalogMatrix.load()
+        weights = {'amount_match': 0.3, 'location_match': 0.5, **NO_RANDOM}
+        profile.education_level = None
+
+        orm = ScholarshipMatcher(profile, weights).get_matched_scholarships(
+            Scholarship.objects.all(), page_size=100
+        )
+        numpy = VectorizedMatcher(profile, weights, catalog).get_matched_scholarships(
+            Scholarship.objects.all(), page_size=100
+        )
+        assert [s.id for s in numpy] == [s.id for s in orm]
+        assert [s.match_score for s in numpy] == pytest.approx([s.match_score for s in orm])
+
+    def test_rejects_custom_components(self, profile, catalog, monkeypatch):
+        from apps.scholarships import matching
+        monkeypatch.setattr(matching, 'SCORE_COMPONENTS', dict(matching.SCORE_COMPONENTS))
+        matching.score_component('custom', weight='custom_match', cost=1)(lambda matcher: None)
+        with pytest.raises(ValueError):
+            VectorizedMatcher(profile, {'custom_match': 1.0}, catalog)
+
+class TestGetMatcher:
+    def test_default_engine(self, profile):
+        assert type(get_matcher(profile)) is ScholarshipMatcher
+
+    def test_numpy_engine(self, profile, settings):
+        settings.SCHOLARSHIP_MATCHING_ENGINE = 'numpy'
+        assert isinstance(get_matcher(profile), VectorizedMatcher)
+
+    def test_unknown_engine(self, profile, settings):
+        settings.SCHOLARSHIP_MATCHING_ENGINE = 'faiss'
+        with pytest.raises(ValueError):
+            get_matcher(profile)
+
+class TestMatchMany:
+    @pytest.fixture
+    def profiles(self, django_user_model, catalog):
+        profiles = []
+        for index, (interests, education_level) in enumerate([
+            (['Engineering'], 'undergraduate'),
+            (['Art'], 'graduate'),
+            ([], None),
+        ]):
+            user = django_user_model.objects.create_user(
+                username=f'student{index}',
+                password='testpass123',
+                firebase_uid=f'uid-{index}'
+            )
+            profile = user.profile
+            profile.interests = interests
+            profile.education_level = education_level
+            profile.save()
+            profiles.append(profile)
+        return profiles
+
+    def test_top_n_per_user(self, profiles, catalog):
+        rows = list(ScholarshipMatcher.match_many(profiles, top_n=2, chunk_size=2))
+
+        # The graduate profile is only eligible for one scholarship
+        assert len(rows) == 5
+        by_user = {}
+        for user_id, scholarship_id, score in rows:
+            by_user.setdefault(user_id, []).append((scholarship_id, score))
+        first = by_user[profiles[0].user_id]
+        assert first[0][1] >= first[1][1]
+        assert Scholarship.objects.get(id=first[0][0]).title == 'Perfect'
+
+    def test_matches_single_user_scores(self, profiles, catalog):
+        rows = list(ScholarshipMatcher.match_many(profiles[:1], top_n=len(catalog)))
+        matcher = VectorizedMatcher(profiles[0], NO_RANDOM, catalog)
+        ranked_ids, scores = matcher.rank(matcher.eligible())
+        assert sorted(score for _, _, score in rows) == pytest.approx(sorted(scores.tolist()))
+
+    def test_same_scores_as_orm_engine(self, profiles, catalog):
+        Scholarship.objects.filter(title='Tag Only').update(amount=500)
+        catalog = CatalogMatrix.load()
+        weights = {'amount_match': 0.3}
+        for profile in profiles:
+            profile.max_amount = 5000
+            profile.save()
+
+        rows = list(ScholarshipMatcher.match_many(profiles, top_n=len(catalog), weights=weights))
+
+        for profile in profiles:
+            orm = ScholarshipMatcher(profile, {**weights, **NO_RANDOM}).get_matched_scholarships(
+                Scholarship.objects.all(), page_size=100
+            )
+            numpy = {scholarship_id: score for user_id, scholarship_id, score in rows if user_id == profile.user_id}
+            assert numpy == pytest.approx({s.id: s.match_score for s in orm})
+
+    def test_rejects_weights_the_matrix_cannot_score(self, profiles, catalog):
+        with pytest.raises(ValueError, match='text'):
+            ScholarshipMatcher.match_many(profiles, weights={'text_match': 0.2})
+
+    def test_process_pool(self, profiles, catalog):
+        inline = list(ScholarshipMatcher.match_many(profiles, top_n=3, chunk_size=1))
+        pooled = list(ScholarshipMatcher.match_many(profiles, top_n=3, chunk_size=1, workers=2))
+        assert pooled == inline
+
+    def test_match_digest_command(self, profiles, catalog):
+        from io import StringIO
+        from django.core.management import call_command
+        out = StringIO()
+        call_command('match_digest', top_n=1, stdout=out, stderr=StringIO())
+        lines = out.getvalue().strip().splitlines()
+        assert lines[0] == 'user_id,scholarship_id,score'
+        assert len(lines) == 1 + len(profiles)
@@ -0,0 +1,158 @@
+import math
+import re
+from collections import Counter
+from datetime import datetime, timezone
+from django.core.cache import cache
+from django.db import transaction
+from .models import Scholarship, ScholarshipTerm, ScholarshipTermWeight
+
+_WORD_RE = re.compile(r'[^\W\d_]+')
+
+STOPWORDS = frozenset("""
+    a about above after all also an and any are as at be been being both but by can
+    could did do does each for from had has have having he her here his how if in
+    into is it its more most must no not of on once only or other our out over own
+    per she should so some such than that the their them then there these they this
+    those through to too under until up very was we were what when where which while
+    who whom why will with would you your yours
+""".split())
+
+# Longer "words" are runs of letters such as pasted URLs or base64, and
+# wouldn't fit ScholarshipTerm.term
+MAX_TERM_LENGTH = ScholarshipTerm._meta.get_field('term').max_length
+
+TEXT_INDEX_VERSION_KEY = 'scholarships:text_index_version'
+
+# Terms kept per scholarship vector; the weakest ones add little to the
+# cosine but make up most of the postings table
+MAX_DOCUMENT_TERMS = 64
+
+# Profile terms looked up when scoring. Each is one branch of the scoring
+# expression, so this bounds the cost of the text component per scholarship.
+MAX_QUERY_TERMS = 16
+
+
+def tokenize(value: str) -> list:
+    """
+    Lowercase words of three to MAX_TERM_LENGTH letters, without stopwords
+    """
+    if not value:
+        return []
+    return [
+        word for word in _WORD_RE.findall(value.lower())
+        if 2 < len(word) <= MAX_TERM_LENGTH and word not in STOPWORDS
+    ]
+
+
+def scholarship_text(description: str, eligibility_criteria: str) -> str:
+    return f'{description or ""} {eligibility_criteria or ""}'
+
+
+def profile_text(profile) -> str:
+    """
+    Free text of a profile matched against scholarship text
+    """
+    skills = profile.skills if isinstance(profile.skills, list) else []
+    return ' '.join([profile.career_goals or '', profile.bio or '', *map(str, skills)])
+
+
+def normalize(weights: dict, limit: int) -> dict:
+    """
+    Keep the limit largest weights and scale them to unit length
+    """
+    top = sorted(weights.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    norm = math.sqrt(sum(weight * weight for _, weight in top))
+    if not norm:
+        return {}
+    return {term: weight / norm for term, weight in top}
+
+
+def tfidf(counts: Counter, idf: dict, limit: int) -> dict:
+    """
+    Normalised TF-IDF vector of a bag of words, with sublinear term frequency
+    """
+    return normalize(
+        {term: (1 + math.log(count)) * idf[term] for term, count in counts.items() if term in idf},
+        limit
+    )
+
+
+def build_text_index(batch_size: int = 5000) -> dict:
+    """
+    Rebuild the TF-IDF index of scholarship descriptions and eligibility criteria.
+
+    Returns:
+        Dict with 'documents', 'terms' and 'postings' counts
+    """
+    documents = {
+        scholarship_id: Counter(tokenize(scholarship_text(description, criteria)))
+        for scholarship_id, description, criteria in Scholarship.objects.values_list(
+            'id', 'description', 'eligibility_criteria'
+        ).iterator()
+    }
+    document_frequency = Counter()
+    for counts in documents.values():
+        document_frequency.update(counts.keys())
+
+    # Smoothed idf, as in scikit-learn, so terms in every document still count
+    total = len(documents)
+    idf = {
+        term: math.log((1 + total) / (1 + frequency)) + 1
+        for term, frequency in document_frequency.items()
+    }
+
+    with transaction.atomic():
+        ScholarshipTermWeight.objects.all().delete()
+        ScholarshipTerm.objects.all().delete()
+        ScholarshipTerm.objects.bulk_create(
+            [
+                ScholarshipTerm(term=term, document_frequency=document_frequency[term], idf=idf[term])
+                for term in sorted(idf)
+            ],
+            batch_size=batch_size
+        )
+        term_ids = dict(ScholarshipTerm.objects.values_list('term', 'id'))
+
+        postings = 0
+        batch = []
+        for scholarship_id, counts in documents.items():
+            for term, weight in tfidf(counts, idf, MAX_DOCUMENT_TERMS).items():
+                batch.append(ScholarshipTermWeight(
+                    term_id=term_ids[term], scholarship_id=scholarship_id, weight=weight
+                ))
+            if len(batch) >= batch_size:
+                ScholarshipTermWeight.objects.bulk_create(batch)
+                postings += len(batch)
+                batch = []
+        ScholarshipTermWeight.objects.bulk_create(batch)
+        postings += len(batch)
+
+    cache.set(TEXT_INDEX_VERSION_KEY, datetime.now(tz=timezone.utc).timestamp(), timeout=None)
+    return {'documents': total, 'terms': len(idf), 'postings': postings}
+
+
+def get_text_index_version():
+    """
+    Stamp of the last text index build, 0 if not known
+    """
+    return cache.get(TEXT_INDEX_VERSION_KEY) or 0
+
+
+def profile_vector(profile) -> dict:
+    """
+    Normalised TF-IDF vector of the profile's free text over the indexed terms.
+
+    Returns:
+        Mapping of ScholarshipTerm id to weight, at most MAX_QUERY_TERMS long
+    """
+    counts = Counter(tokenize(profile_text(profile)))
+    if not counts:
+        return {}
+    terms = {
+        term: (term_id, idf)
+        for term_id, term, idf in ScholarshipTerm.objects.filter(
+            term__in=counts
+        ).values_list('id', 'term', 'idf')
+    }
+    vector = tfidf(counts, {term: idf for term, (_, idf) in terms.items()}, MAX_QUERY_TERMS)
+    return {terms[term][0]: weight for term, weight in vector.items()}
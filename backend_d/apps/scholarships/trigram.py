@@ -0,0 +1,28 @@
+import re
+
+_WORD_RE = re.compile(r'[^\W_]+')
+
+
+def trigrams(value: str) -> set:
+    """
+    Extract trigrams the way pg_trgm does: lowercase, split into words and
+    pad each word with two leading spaces and one trailing space.
+    """
+    result = set()
+    for word in _WORD_RE.findall(value.lower()):
+        padded = f'  {word} '
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def trigram_similarity(a, b):
+    """
+    Python equivalent of pg_trgm's similarity(a, b)
+    """
+    if a is None or b is None:
+        return None
+    left, right = trigrams(a), trigrams(b)
+    if not left or not right:
+        return 0.0
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared)
@@ -0,0 +1,550 @@
+import operator
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from django.core.paginator import Paginator
+from django.db.models import QuerySet
+from django.db.models.expressions import Col
+from django.db.models.sql.where import OR, WhereNode
+from django.utils import timezone
+from apps.users.models import UserProfile
+from . import matching
+from .catalog import get_catalog_version
+from .matching import (
+    ScholarshipMatcher, daily_tiebreak_seed, merge_weights, tiebreak_value, trigram_threshold
+)
+from .models import Scholarship
+from .trigram import trigram_similarity
+
+
+# Score components CatalogMatrix has the columns to compute
+NUMPY_COMPONENTS = ('tag', 'education', 'field', 'amount', 'location', 'random')
+
+
+def check_components(weights: dict):
+    """
+    Raise ValueError when weights give any component the numpy engine can't
+    score, such as text_match, a non-zero weight; leaving it out would rank
+    differently from the orm engine
+    """
+    unsupported = sorted(
+        component.name for component in matching.SCORE_COMPONENTS.values()
+        if weights.get(component.weight) and component.name not in NUMPY_COMPONENTS
+    )
+    if unsupported:
+        raise ValueError(f"The numpy engine cannot score components: {', '.join(unsupported)}")
+
+
+def _bucket(values):
+    """
+    Map each value to a bucket code.
+
+    Returns:
+        (distinct values, code per input value)
+    """
+    buckets = {}
+    codes = np.fromiter(
+        (buckets.setdefault(value, len(buckets)) for value in values),
+        dtype=np.int32,
+        count=len(values)
+    )
+    return list(buckets), codes
+
+
+class CatalogMatrix:
+    """
+    Compact feature matrix of the active scholarship catalog.
+
+    Tags are kept as the (row, column) coordinates of the non-zero entries of
+    the one-hot scholarship x tag matrix. Education level, field of study and
+    location are single-valued, so each row stores the column of its one-hot
+    bucket.
+    """
+
+    def __init__(self, version, ids, tag_names, tag_rows, tag_cols,
+                 education_levels, education_codes, fields, field_codes,
+                 amounts=None, locations=None, location_codes=None, deadlines=None):
+        self.version = version
+        self.loaded_on = timezone.now().date()
+        self.ids = ids
+        self.tag_names = tag_names
+        self.tag_rows = tag_rows
+        self.tag_cols = tag_cols
+        self.education_levels = education_levels
+        self.education_codes = education_codes
+        self.fields = fields
+        self.field_codes = field_codes
+        self.amounts = amounts if amounts is not None else np.zeros(len(ids))
+        self.locations = locations if locations is not None else np.array([''], dtype=object)
+        self.location_codes = (
+            location_codes if location_codes is not None else np.zeros(len(ids), dtype=np.int32)
+        )
+        self.deadlines = deadlines
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, version: int = None, candidates: QuerySet = None) -> 'CatalogMatrix':
+        """
+        Read the active catalog, or the given candidate scholarships, into
+        memory
+        """
+        if candidates is None:
+            candidates = ScholarshipMatcher.get_candidate_queryset()
+        candidates = candidates.order_by('id')
+        rows = list(candidates.values_list(
+            'id', 'education_level', 'field_of_study', 'amount', 'location', 'deadline'
+        ))
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        education_levels, education_codes = _bucket([row[1] for row in rows])
+        fields, field_codes = _bucket([row[2] for row in rows])
+        amounts = np.fromiter((row[3] for row in rows), dtype=np.float64, count=len(rows))
+        locations, location_codes = _bucket([row[4].upper() for row in rows])
+        deadlines = np.array([row[5] for row in rows], dtype='datetime64[D]')
+
+        tag_pairs = list(
+            Scholarship.tags.through.objects.filter(
+                scholarship__in=candidates
+            ).values_list('scholarship_id', 'scholarshiptag__name')
+        )
+        tag_names, tag_cols = _bucket([name for _, name in tag_pairs])
+        tag_rows = np.searchsorted(
+            ids,
+            np.fromiter((pair[0] for pair in tag_pairs), dtype=np.int64, count=len(tag_pairs))
+        ).astype(np.int32)
+
+        return cls(
+            version=version,
+            ids=ids,
+            tag_names=np.array(tag_names, dtype=object),
+            tag_rows=tag_rows,
+            tag_cols=tag_cols,
+            education_levels=np.array(education_levels, dtype=object),
+            education_codes=education_codes,
+            fields=fields,
+            field_codes=field_codes,
+            amounts=amounts,
+            locations=np.array(locations, dtype=object),
+            location_codes=location_codes,
+            deadlines=deadlines
+        )
+
+    def column(self, name):
+        """
+        Per-row values of a Scholarship field the matrix holds, or None.
+        Every row was loaded as an active, unexpired scholarship, and
+        locations are held uppercased, so only case-insensitive lookups can
+        be answered from them.
+        """
+        if name == 'id':
+            return self.ids
+        if name == 'status':
+            return np.full(len(self), Scholarship.Status.ACTIVE, dtype=object)
+        if name == 'is_active':
+            return np.ones(len(self), dtype=bool)
+        if name == 'education_level':
+            return self.education_levels[self.education_codes]
+        if name == 'location':
+            return self.locations[self.location_codes]
+        if name == 'amount':
+            return self.amounts
+        if name == 'deadline':
+            return self.deadlines
+        return None
+
+    def eligible(self, education_level=None, location=None,
+                 min_amount=None, max_amount=None) -> np.ndarray:
+        """
+        Boolean mask of the scholarships passing the matcher's hard constraints,
+        mirroring ScholarshipMatcher.eligibility_filter
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if education_level:
+            allowed = (self.education_levels == '') | (self.education_levels == education_level)
+            mask &= allowed[self.education_codes]
+        if location:
+            allowed = (self.locations == '') | (self.locations == location.upper())
+            mask &= allowed[self.location_codes]
+        if min_amount is not None:
+            mask &= self.amounts >= float(min_amount)
+        if max_amount is not None:
+            mask &= self.amounts <= float(max_amount)
+        return mask
+
+    def tag_scores(self, interests) -> np.ndarray:
+        """
+        Fraction of the interests each scholarship carries as a tag
+        """
+        interests = set(interests or [])
+        if not interests:
+            return np.zeros(len(self))
+        interest_vector = np.isin(self.tag_names, list(interests)).astype(np.float64)
+        matched = np.bincount(
+            self.tag_rows,
+            weights=interest_vector[self.tag_cols],
+            minlength=len(self)
+        )
+        return matched / len(interests)
+
+    def education_scores(self, education_level) -> np.ndarray:
+        """
+        1.0 where the scholarship targets the user's education level
+        """
+        education_vector = (self.education_levels == education_level).astype(np.float64)
+        return education_vector[self.education_codes]
+
+    def field_scores(self, field_of_study, threshold=None) -> np.ndarray:
+        """
+        Trigram similarity, computed once per distinct field of study.
+        Similarities below threshold count as 0, like the pg_trgm % prefilter.
+        """
+        field_vector = np.array(
+            [trigram_similarity(field, field_of_study) or 0.0 for field in self.fields],
+            dtype=np.float64
+        )
+        if threshold is not None:
+            field_vector[field_vector < threshold] = 0.0
+        if not len(field_vector):
+            return np.zeros(len(self))
+        return field_vector[self.field_codes]
+
+    def amount_scores(self, max_amount) -> np.ndarray:
+        """
+        Award size as a share of the most the user is looking for
+        """
+        if not max_amount:
+            return np.zeros(len(self))
+        return np.minimum(self.amounts / float(max_amount), 1.0)
+
+    def location_scores(self, location) -> np.ndarray:
+        """
+        1.0 for scholarships aimed at the user's location
+        """
+        if not location:
+            return np.zeros(len(self))
+        location_vector = (self.locations == location.upper()).astype(np.float64)
+        return location_vector[self.location_codes]
+
+    def weighted_scores(self, interests, education_level, field_of_study, weights,
+                        threshold=None, location=None, max_amount=None) -> np.ndarray:
+        """
+        Weighted score of every scholarship, excluding the random factor
+        """
+        scores = (
+            self.tag_scores(interests) * weights['tag_match'] +
+            self.education_scores(education_level) * weights['education_match'] +
+            self.field_scores(field_of_study, threshold) * weights['field_match']
+        )
+        if weights.get('amount_match'):
+            scores += self.amount_scores(max_amount) * weights['amount_match']
+        if weights.get('location_match'):
+            scores += self.location_scores(location) * weights['location_match']
+        return scores
+
+    def top_n(self, scores: np.ndarray, top_n: int):
+        """
+        Indices of the top_n highest scores, best first (ties by id)
+        """
+        if top_n < len(scores):
+            candidates = np.argpartition(-scores, top_n - 1)[:top_n]
+        else:
+            candidates = np.arange(len(scores))
+        order = np.lexsort((self.ids[candidates], -scores[candidates]))
+        return candidates[order]
+
+
+# Lookups evaluated against CatalogMatrix columns
+_LOOKUPS = {
+    'exact': operator.eq,
+    'gt': operator.gt,
+    'gte': operator.ge,
+    'lt': operator.lt,
+    'lte': operator.le,
+    'in': lambda column, values: np.isin(column, values),
+}
+
+
+def _lookup_value(name, value):
+    if name == 'deadline':
+        return np.datetime64(value, 'D')
+    if name == 'amount':
+        return float(value)
+    return value
+
+
+def _lookup_mask(catalog, lookup):
+    lhs = getattr(lookup, 'lhs', None)
+    if not isinstance(lhs, Col) or lhs.alias != Scholarship._meta.db_table:
+        return None
+    name = lhs.target.name
+    column = catalog.column(name)
+    rhs = lookup.rhs
+    if column is None or hasattr(rhs, 'resolve_expression'):
+        return None
+    if name == 'location':
+        # The column is held uppercased, which answers iexact, and exact
+        # only for the blank "open to any location" value
+        if lookup.lookup_name == 'iexact' or (lookup.lookup_name == 'exact' and rhs == ''):
+            return np.asarray(column == rhs.upper(), dtype=bool)
+        return None
+    if lookup.lookup_name not in _LOOKUPS:
+        return None
+    if lookup.lookup_name == 'in':
+        value = [_lookup_value(name, item) for item in rhs]
+    else:
+        value = _lookup_value(name, rhs)
+    return np.asarray(_LOOKUPS[lookup.lookup_name](column, value), dtype=bool)
+
+
+def where_mask(catalog, node):
+    """
+    Boolean mask of the catalog rows matching a queryset's WHERE clause, or
+    None when it filters on anything the matrix doesn't hold
+    """
+    if not isinstance(node, WhereNode):
+        return _lookup_mask(catalog, node)
+    masks = []
+    for child in node.children:
+        mask = where_mask(catalog, child)
+        if mask is None:
+            return None
+        masks.append(mask)
+    if node.connector == OR:
+        mask = np.logical_or.reduce(masks) if masks else np.zeros(len(catalog), dtype=bool)
+    else:
+        mask = np.logical_and.reduce(masks) if masks else np.ones(len(catalog), dtype=bool)
+    return ~mask if node.negated else mask
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def _is_current(catalog, version) -> bool:
+    return (
+        catalog is not None
+        and catalog.version == version
+        and catalog.loaded_on == timezone.now().date()
+    )
+
+
+def get_catalog() -> CatalogMatrix:
+    """
+    This worker's copy of the catalog, reloaded when the catalog version
+    changes or the day rolls over (deadlines expire at midnight).
+    """
+    global _catalog
+    version = get_catalog_version()
+    catalog = _catalog
+    if not _is_current(catalog, version):
+        with _catalog_lock:
+            if not _is_current(_catalog, version):
+                _catalog = CatalogMatrix.load(version)
+            catalog = _catalog
+    return catalog
+
+
+class VectorizedMatcher(ScholarshipMatcher):
+    """
+    Scores a profile against the whole catalog with NumPy instead of Postgres.
+
+    Produces the same ranking as ScholarshipMatcher for the same weights.
+    Only the built-in score components are supported.
+    """
+    COMPONENTS = NUMPY_COMPONENTS
+
+    def __init__(self, user_profile: UserProfile, weights: dict = None, catalog: CatalogMatrix = None):
+        super().__init__(user_profile, weights)
+        check_components(self.weights)
+        self.catalog = catalog if catalog is not None else get_catalog()
+
+    def component_scores(self) -> dict:
+        """
+        Returns:
+            Mapping of stored component name to a score array aligned with catalog.ids
+        """
+        profile = self.user_profile
+        scorers = {
+            'tag': lambda: self.catalog.tag_scores(profile.interests),
+            'education': lambda: self.catalog.education_scores(profile.education_level),
+            'field': lambda: self.catalog.field_scores(profile.field_of_study, trigram_threshold()),
+            'amount': lambda: self.catalog.amount_scores(profile.max_amount),
+            'location': lambda: self.catalog.location_scores(profile.location),
+        }
+        return {component.name: scorers[component.name]() for component in self.stored_components()}
+
+    def tiebreak(self) -> np.ndarray:
+        """
+        Same seeded tie-break as the SQL expression in ScholarshipMatcher
+        """
+        multiplier, offset = daily_tiebreak_seed(self.user_profile.user_id)
+        return tiebreak_value(self.catalog.ids, multiplier, offset)
+
+    def rank(self, mask: np.ndarray = None):
+        """
+        Rank the catalog by weighted score.
+
+        Args:
+            mask: Optional boolean array selecting the rows to rank
+
+        Returns:
+            (scholarship ids, scores) ordered best first
+        """
+        tiebreak = self.tiebreak()
+        scores = self.catalog.weighted_scores(
+            self.user_profile.interests,
+            self.user_profile.education_level,
+            self.user_profile.field_of_study,
+            self.weights,
+            trigram_threshold(),
+            self.user_profile.location,
+            self.user_profile.max_amount
+        ) + tiebreak * self.weights['random_factor']
+        ids = self.catalog.ids
+        if mask is not None:
+            ids, scores, tiebreak = ids[mask], scores[mask], tiebreak[mask]
+        order = np.lexsort((ids, -tiebreak, -scores))
+        return ids[order], scores[order]
+
+    def get_matched_scholarships(
+        self,
+        queryset: QuerySet,
+        page: int = 1,
+        page_size: int = 10
+    ):
+        """
+        Rank the scholarships in queryset and return the requested page
+        """
+        ranked_ids, scores = self.rank(self._mask(queryset) & self.eligible())
+        paginator = Paginator(list(zip(ranked_ids.tolist(), scores.tolist())), page_size)
+        paginated_scholarships = paginator.get_page(page)
+
+        scholarships = queryset.in_bulk([sid for sid, _ in paginated_scholarships.object_list])
+        results = []
+        for scholarship_id, score in paginated_scholarships.object_list:
+            scholarship = scholarships[scholarship_id]
+            scholarship.match_score = score
+            results.append(scholarship)
+        paginated_scholarships.object_list = results
+        return paginated_scholarships
+
+    def eligible(self) -> np.ndarray:
+        return self.catalog.eligible(
+            self.user_profile.education_level,
+            self.user_profile.location,
+            self.user_profile.min_amount,
+            self.user_profile.max_amount
+        )
+
+    def _mask(self, queryset: QuerySet) -> np.ndarray:
+        """
+        Catalog rows in queryset. Filters on the status, deadline and
+        eligibility columns held by the matrix are evaluated in memory; only
+        querysets filtering on anything else read their ids from the database.
+        """
+        query = queryset.query
+        if query.model is Scholarship and not query.is_sliced and not query.combinator:
+            mask = where_mask(self.catalog, query.where)
+            if mask is not None:
+                return mask
+        allowed = np.fromiter(queryset.values_list('id', flat=True), dtype=np.int64)
+        return np.isin(self.catalog.ids, allowed)
+
+    def _score_components(self, candidates: QuerySet) -> dict:
+        mask = self._mask(candidates)
+        components = {name: scores[mask].tolist() for name, scores in self.component_scores().items()}
+        return {
+            scholarship_id: {name: scores[index] for name, scores in components.items()}
+            for index, scholarship_id in enumerate(self.catalog.ids[mask].tolist())
+        }
+
+
+_worker_catalog = None
+
+
+def _init_worker(catalog):
+    global _worker_catalog
+    _worker_catalog = catalog
+
+
+def _score_chunk(chunk, top_n, weights, catalog=None, threshold=None):
+    """
+    Score a chunk of (user_id, interests, education_level, field_of_study,
+    location, min_amount, max_amount) tuples and return the top_n eligible
+    rows of each
+    """
+    catalog = catalog if catalog is not None else _worker_catalog
+    rows = []
+    for user_id, interests, education_level, field_of_study, *constraints in chunk:
+        location, min_amount, max_amount = constraints
+        scores = catalog.weighted_scores(
+            interests, education_level, field_of_study, weights, threshold, location, max_amount
+        )
+        eligible = catalog.eligible(education_level, location, min_amount, max_amount)
+        for index in catalog.top_n(np.where(eligible, scores, -np.inf), top_n):
+            if eligible[index]:
+                rows.append((user_id, int(catalog.ids[index]), float(scores[index])))
+    return rows
+
+
+def _profile_chunks(profiles, chunk_size):
+    chunk = []
+    for profile in profiles:
+        chunk.append((
+            profile.user_id,
+            list(profile.interests or []),
+            profile.education_level,
+            profile.field_of_study,
+            profile.location,
+            profile.min_amount,
+            profile.max_amount
+        ))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def match_many(profiles, top_n=10, weights=None, chunk_size=500, workers=1, catalog=None):
+    """
+    Stream (user_id, scholarship_id, score) rows with each profile's top_n
+    scholarships.
+
+    Profiles are scored in chunks against one shared catalog. With workers > 1
+    chunks are farmed out to a process pool, keeping at most two chunks per
+    worker in flight so memory stays bounded however many profiles there are.
+    The random factor is left out so digests rank on relevance alone.
+
+    Raises:
+        ValueError: weights use a component the numpy engine can't score
+    """
+    weights = {**merge_weights(weights), 'random_factor': 0.0}
+    check_components(weights)
+    catalog = catalog if catalog is not None else get_catalog()
+    if not len(catalog) or top_n <= 0:
+        return iter(())
+    return _match_chunks(profiles, top_n, weights, chunk_size, workers, catalog, trigram_threshold())
+
+
+def _match_chunks(profiles, top_n, weights, chunk_size, workers, catalog, threshold):
+    chunks = _profile_chunks(profiles, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _score_chunk(chunk, top_n, weights, catalog, threshold)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(catalog,)
+    ) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_score_chunk, chunk, top_n, weights, None, threshold))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -1,6 +1,6 @@
 from django.shortcuts import render
-from rest_framework import viewsets, filters
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework import viewsets, filters, status
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Scholarship, ScholarshipTag
 from .serializers import (
@@ -8,52 +8,113 @@ from .serializers import (
     ScholarshipDetailSerializer,
     ScholarshipCreateSerializer,
     ScholarshipUpdateSerializer,
-    ScholarshipTagSerializer
+    ScholarshipTagSerializer,
+    ScholarshipBulkItemSerializer
 )
 from apps.applications.models import Application
-from .matching import ScholarshipMatcher
+from .catalog import get_catalog_modified, get_catalog_version
+from .conditional import ConditionalGetMixin
+from .explanations import explain_match
+from .fragments import FragmentCacheMixin
+from .ingest import ingest_scholarships
+from .instrumentation import MatchProfiler, debug_requested
+from .matching import get_matcher
+from .optimization import QuerysetOptimizationMixin
+from .pagination import KeysetPagination
+from .parsers import NDJSONParser
+from . import cards, swipes
+from .filters import ScholarshipSearchFilter
+from .renderers import FragmentJSONRenderer
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from apps.users.models import UserProfile
 
 # Create your views here.
 
-class ScholarshipViewSet(viewsets.ModelViewSet):
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+class ScholarshipViewSet(ConditionalGetMixin, FragmentCacheMixin, QuerysetOptimizationMixin,
+                         viewsets.ModelViewSet):
+    # Search runs last so it can rank results ahead of the default ordering
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, ScholarshipSearchFilter]
     filterset_fields = {
         'tags__name': ['exact', 'in'],
         'amount': ['gte', 'lte'],
         'deadline': ['gte', 'lte'],
         'is_active': ['exact'],
+        'status': ['exact'],
     }
     search_fields = ['title', 'description', 'eligibility_criteria']
     ordering_fields = ['created_at', 'deadline', 'amount']
     ordering = ['-created_at']
+    pagination_class = KeysetPagination
+    # Serves JSON from cached per-scholarship fragments when enabled
+    renderer_classes = [
+        FragmentJSONRenderer,
+        *(renderer for renderer in api_settings.DEFAULT_RENDERER_CLASSES if not issubclass(renderer, JSONRenderer))
+    ]
+    fragment_actions = ['list', 'retrieve', 'matched']
+    unoptimized_actions = ['match_explanation']
+    # Versions cached fragments
+    always_load = ['updated_at']
 
     def get_queryset(self):
         queryset = Scholarship.objects.all()
         
         # Filter out swiped scholarships if requested
-        exclude_swiped = self.request.query_params.get('exclude_swiped', 'false').lower() == 'true'
-        if exclude_swiped and self.request.user.is_authenticated:
-            swiped_ids = Application.objects.filter(
-                user=self.request.user,
-                swipe_status__in=['left', 'right']  # Exclude both left and right swipes
-            ).values_list('scholarship_id', flat=True)
-            queryset = queryset.exclude(id__in=swiped_ids)
+        if self.excludes_swiped():
+            queryset = swipes.exclude_swiped(queryset, self.request.user.pk)
 
         # Add custom filtering for expired scholarships
         show_expired = self.request.query_params.get('show_expired', 'false').lower()
         if show_expired != 'true':
-            from django.utils import timezone
-            queryset = queryset.filter(deadline__gte=timezone.now().date())
+            # The status reads the unexpired index; the deadline also hides
+            # rows that lapsed since expire_scholarships last ran
+            queryset = queryset.exclude(status=Scholarship.Status.EXPIRED).filter(
+                deadline__gte=timezone.now().date()
+            )
             
-        return queryset
+        return self.optimize_queryset(queryset)
+
+    def get_resource_version(self, request):
+        """
+        Scholarship reads are versioned by the row's updated_at together with
+        the catalog version, since renames and counts of its tags don't touch
+        the row; lists by the catalog version alone
+        """
+        if self.action == 'retrieve':
+            pk = self.kwargs[self.lookup_field]
+            try:
+                updated_at = Scholarship.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+            except (TypeError, ValueError):
+                updated_at = None
+            if updated_at is None:
+                # Let retrieve answer 404
+                return None, None
+            catalog_modified = get_catalog_modified()
+            if catalog_modified is not None:
+                updated_at = max(updated_at, catalog_modified)
+            return f'{pk}.{updated_at.timestamp()}.{get_catalog_version()}', updated_at
+        if self.excludes_swiped():
+            # Depends on the user's swipes, which don't bump the catalog
+            return None, None
+        return super().get_resource_version(request)
+
+    def excludes_swiped(self):
+        return (
+            self.request.query_params.get('exclude_swiped', 'false').lower() == 'true'
+            and self.request.user.is_authenticated
+        )
 
     def get_permissions(self):
-        """Allow anyone to list and retrieve scholarships"""
+        """Allow anyone to list and retrieve scholarships; partner ingest is staff only"""
         if self.action in ['list', 'retrieve']:
             permission_classes = [AllowAny]
+        elif self.action == 'bulk':
+            permission_classes = [IsAdminUser]
         else:
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
@@ -65,6 +126,8 @@ class ScholarshipViewSet(viewsets.ModelViewSet):
             return ScholarshipCreateSerializer
         elif self.action in ['update', 'partial_update']:
             return ScholarshipUpdateSerializer
+        elif self.action == 'bulk':
+            return ScholarshipBulkItemSerializer
         return ScholarshipDetailSerializer
 
     @action(detail=False)
@@ -72,27 +135,90 @@ class ScholarshipViewSet(viewsets.ModelViewSet):
         """
         Get scholarships matched to user profile
         """
-        queryset = self.get_queryset().filter(is_active=True, is_expired=False)
+        queryset = self.get_queryset().filter(
+            status=Scholarship.Status.ACTIVE,
+            deadline__gte=timezone.now().date()
+        )
         
+        # Serve the next cards from the prefetched queue while it has any
+        if cards.card_queue_enabled() and not self.paginator.is_requested(request):
+            card_ids = cards.pop_cards(request.user.pk, self.paginator.get_page_size(request))
+            scholarships = queryset.in_bulk(card_ids)
+            # Cards can expire or be swiped after they were queued
+            queued = [scholarships[card_id] for card_id in card_ids if card_id in scholarships]
+            if queued:
+                serializer = self.get_serializer(queued, many=True)
+                return Response({
+                    'results': serializer.data,
+                    'count': len(serializer.data)
+                })
+
         # Get user profile
         profile = request.user.profile
         
-        # Use matcher to sort scholarships
-        matcher = ScholarshipMatcher(profile)
-        matched_scholarships = matcher.get_matched_scholarships(queryset)
-        
-        page = self.paginate_queryset(matched_scholarships)
+        # Read the precomputed scores maintained by the matcher
+        matcher = get_matcher(profile)
+        # Staff can send X-Match-Debug: 1 to profile the request
+        profiler = MatchProfiler(matcher) if debug_requested(request) else None
+        matched_scholarships = matcher.get_stored_matches(queryset)
+
+        with matcher.stage('query'):
+            page = self.paginate_queryset(matched_scholarships)
+            if page is None:
+                # Without a cursor only the top of the feed is served
+                page_size = self.paginator.get_page_size(request)
+                rows = list(matched_scholarships[:page_size])
+            else:
+                rows = page
+        with matcher.stage('serialize'):
+            data = self.get_serializer(rows, many=True).data
+
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+            response = self.get_paginated_response(data)
+        else:
+            response = Response({
+                'results': data,
+                'count': len(data)
+            })
+
+        if profiler is not None:
+            profiler.profile_components(matcher.apply_eligibility(queryset))
+            profiler.emit()
+            response['Server-Timing'] = profiler.server_timing()
+        return response
+
+    @action(detail=True, url_path='match-explanation')
+    def match_explanation(self, request, pk=None):
+        """
+        Break the user's match score for this scholarship down by component.
+        Staff can pass ?user_id= to see another student's breakdown.
+        """
+        scholarship = self.get_object()
+        user_id = request.query_params.get('user_id')
+        if user_id and request.user.is_staff:
+            profile = get_object_or_404(UserProfile, user_id=user_id)
+        else:
+            profile = request.user.profile
+        return Response(explain_match(get_matcher(profile), scholarship))
 
-        serializer = self.get_serializer(matched_scholarships, many=True)
-        return Response({
-            'results': serializer.data,
-            'count': matched_scholarships.count()
-        })
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser, NDJSONParser])
+    def bulk(self, request):
+        """
+        Create or update scholarships keyed by external_id, from a JSON array
+        or an application/x-ndjson stream. Invalid items are reported by
+        index without failing the rest.
+        """
+        if not isinstance(request.data, list):
+            return Response(
+                {'detail': 'Expected a list of scholarships'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        summary = ingest_scholarships(request.data)
+        if summary['errors'] and not summary['results']:
+            return Response(summary, status=status.HTTP_400_BAD_REQUEST)
+        return Response(summary)
 
-class ScholarshipTagViewSet(viewsets.ModelViewSet):
+class ScholarshipTagViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = ScholarshipTag.objects.all()
     serializer_class = ScholarshipTagSerializer
     filter_backends = [filters.SearchFilter]
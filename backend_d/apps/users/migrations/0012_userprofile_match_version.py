@@ -0,0 +1,18 @@
+# Generated by Django 4.2.10 on 2026-10-18 20:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0011_userprofile_min_amount_userprofile_max_amount"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="match_version",
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+    ]
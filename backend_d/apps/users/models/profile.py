@@ -1,3 +1,5 @@
+import hashlib
+import json
 from django.db import models
 from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
@@ -142,11 +144,26 @@ class UserProfile(models.Model):
     # Credits
     credits = models.IntegerField(default=3)
 
+    # Scholarship amount range the student is looking for
+    min_amount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    max_amount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+
     # Additional fields
     location = models.CharField(max_length=200, blank=True)
     hear_about_us = models.CharField(max_length=100, blank=True)
     referral_code = models.CharField(max_length=50, blank=True)
 
+    # Fields the scholarship matcher scores or filters on, including the
+    # free text read by the text match component
+    MATCH_FIELDS = (
+        'interests', 'education_level', 'field_of_study',
+        'location', 'min_amount', 'max_amount',
+        'bio', 'career_goals', 'skills'
+    )
+    # Hash of MATCH_FIELDS; match caches are keyed by it so edits to
+    # other fields leave them warm
+    match_version = models.CharField(max_length=16, blank=True, editable=False)
+
     # Add the custom manager
     objects = UserProfileManager()
 
@@ -198,9 +215,25 @@ class UserProfile(models.Model):
         ]
         return all(getattr(self, field) for field in required_fields)
 
+    def compute_match_version(self):
+        """Hash of the matching-relevant fields"""
+        values = {field: getattr(self, field) for field in self.MATCH_FIELDS}
+        # Interest order and duplicates don't change the tag score
+        values['interests'] = sorted(set(values['interests'] or []))
+        payload = json.dumps(values, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
     def save(self, *args, **kwargs):
         if not self.firebase_uid and self.user:
             self.firebase_uid = self.user.firebase_uid
+        match_version = self.compute_match_version()
+        # Read by the post_save receivers that refresh stored matches
+        self.match_version_changed = match_version != self.match_version
+        if self.match_version_changed:
+            self.match_version = match_version
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'match_version'}
         super().save(*args, **kwargs)
 
 # Signal to create profile when user is created
@@ -23,5 +23,26 @@ app.conf.beat_schedule = {
                 'interval_max': 0.6,
             }
         }
+    },
+    'expire-scholarships-nightly': {
+        'task': 'scholarships.expire_scholarships',
+        'schedule': crontab(hour=0, minute=5),
+        'options': {
+            'queue': 'scheduled',
+        }
+    },
+    'reconcile-tag-counts-hourly': {
+        'task': 'scholarships.reconcile_tag_counts',
+        'schedule': crontab(minute=30),
+        'options': {
+            'queue': 'scheduled',
+        }
+    },
+    'build-scholarship-text-index-nightly': {
+        'task': 'scholarships.build_text_index',
+        'schedule': crontab(hour=3, minute=0),
+        'options': {
+            'queue': 'scheduled',
+        }
     }
 } 
\ No newline at end of file
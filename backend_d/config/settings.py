@@ -81,6 +81,7 @@ AUTH_USER_MODEL = 'users.User'
 # Update middleware order
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # Keep at top
+    'apps.scholarships.middleware.CompressionMiddleware',  # Before anything reading the body
     'django.middleware.common.CommonMiddleware',
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -258,7 +259,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',  # Temporarily allow all
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'apps.scholarships.renderers.ORJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -387,6 +388,39 @@ try:
 except Exception as e:
     print(f"Error initializing Firebase Admin SDK: {e}")
 
+# Scholarship matching engine: 'orm' scores in Postgres, 'numpy' scores
+# against an in-memory copy of the catalog held by each worker
+SCHOLARSHIP_MATCHING_ENGINE = os.getenv('SCHOLARSHIP_MATCHING_ENGINE', 'orm')
+
+# pg_trgm similarity threshold for field-of-study matching. When set, fields
+# below it score 0 and Postgres can answer the match from the trigram index.
+SCHOLARSHIP_TRIGRAM_THRESHOLD = (
+    float(os.getenv('SCHOLARSHIP_TRIGRAM_THRESHOLD'))
+    if os.getenv('SCHOLARSHIP_TRIGRAM_THRESHOLD') else None
+)
+
+# Dotted path to a callable receiving the profile of matched feed requests
+# made by staff with the X-Match-Debug header; profiles are logged when unset
+SCHOLARSHIP_MATCH_METRICS_HOOK = os.getenv('SCHOLARSHIP_MATCH_METRICS_HOOK')
+
+# Keep each user's swiped scholarship ids in a Redis set so the feed can
+# exclude them without querying the applications table
+SCHOLARSHIP_SWIPE_CACHE = os.getenv('SCHOLARSHIP_SWIPE_CACHE', 'False') == 'True'
+
+# Per-user Redis queue of the next ranked scholarship ids served by the
+# matched feed, refilled by Celery when it drops below the low-water mark
+SCHOLARSHIP_CARD_QUEUE = os.getenv('SCHOLARSHIP_CARD_QUEUE', 'False') == 'True'
+SCHOLARSHIP_CARD_QUEUE_SIZE = int(os.getenv('SCHOLARSHIP_CARD_QUEUE_SIZE', 50))
+SCHOLARSHIP_CARD_QUEUE_LOW_WATER = int(os.getenv('SCHOLARSHIP_CARD_QUEUE_LOW_WATER', 10))
+
+# Cache each scholarship's rendered JSON and splice list responses together
+# from the cached fragments instead of serializing every row
+SCHOLARSHIP_FRAGMENT_CACHE = os.getenv('SCHOLARSHIP_FRAGMENT_CACHE', 'False') == 'True'
+
+# Compress API responses of at least this many bytes, with brotli when the
+# package is installed and the client accepts it, otherwise gzip
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.getenv('RESPONSE_COMPRESSION_MIN_SIZE', '1024'))
+
 # Cache settings
 CACHES = {
     'default': {
@@ -398,7 +432,7 @@ CACHES = {
             'SOCKET_TIMEOUT': 5,
         }
     }
-} if not 'test' in sys.argv else {
+} if not ('test' in sys.argv or 'pytest' in sys.modules) else {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         'LOCATION': 'unique-snowflake',
@@ -3,6 +3,7 @@ import sys
 import pytest
 from pathlib import Path
 from django.conf import settings
+from django.db.backends.signals import connection_created
 
 # Add the project root to Python path
 project_root = Path(__file__).parent
@@ -12,6 +13,15 @@ sys.path.insert(0, str(project_root))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 os.environ['PYTEST_RUNNING'] = 'True'
 
+from apps.scholarships.trigram import trigram_similarity
+
+def register_sqlite_functions(sender, connection, **kwargs):
+    """The test database is SQLite, so provide SIMILARITY() for TrigramSimilarity"""
+    if connection.vendor == 'sqlite':
+        connection.connection.create_function('SIMILARITY', 2, trigram_similarity)
+
+connection_created.connect(register_sqlite_functions)
+
 @pytest.fixture(autouse=True)
 def enable_db_access_for_all_tests(db):
     pass
@@ -34,6 +44,34 @@ def disable_throttling(settings):
         if not m.endswith('.throttling.RequestRateThrottleMiddleware')
     ]
 
+@pytest.fixture
+def assert_constant_queries():
+    """
+    Assert that a request runs the same number of queries however many rows
+    it returns.
+
+    Call it with fetch, which makes the request, and grow, which adds rows
+    the request will return. Returns the query count.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    def check(fetch, grow, expected=None):
+        with CaptureQueriesContext(connection) as before:
+            fetch()
+        grow()
+        with CaptureQueriesContext(connection) as after:
+            fetch()
+        queries = '\n'.join(query['sql'] for query in after.captured_queries)
+        assert len(after) == len(before), (
+            f"{len(before)} queries became {len(after)} with more rows:\n{queries}"
+        )
+        if expected is not None:
+            assert len(after) == expected, f"Expected {expected} queries, ran {len(after)}:\n{queries}"
+        return len(after)
+
+    return check
+
 # Import your models here
 from apps.users.models import User, UserProfile
 from apps.scholarships.models import Scholarship, ScholarshipTag